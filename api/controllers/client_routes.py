@@ -1,40 +1,68 @@
-from fastapi import APIRouter, HTTPException
-from typing import List
+from fastapi import APIRouter, HTTPException, Query, Response
+from typing import List, Optional
 from api.schemas import ClientSchema
-from api.global_simulation import get as get_simulation
+from api.global_simulation import read_async as read_simulation
+from api.controllers.order_routes import order_to_schema
+from api.schemas import OrderSchema
+from api.pagination import check_format, parse_fields, page_headers, ndjson_response, json_page_response
 
 router = APIRouter()
 
+CLIENT_FIELDS = ["id", "name", "location", "total_orders"]
+
+def client_to_record(client):
+    """Convierte un Client del dominio en un dict con los campos de ClientSchema."""
+    return {
+        "id": client.id,
+        "name": client.name,
+        "location": str(client.vertex),
+        "total_orders": client.total_orders
+    }
+
 @router.get("/clients/", response_model=List[ClientSchema], summary="Obtener todos los clientes")
-def get_all_clients():
-    sim = get_simulation()
-    if sim is None or not sim.get_clients():
-        raise HTTPException(status_code=404, detail="No hay simulación activa. Genera una en el dashboard primero.")
-    
-    clients = sim.get_clients()  # Método de tu simulación para obtener clientes
-    return [
-        ClientSchema(
-            id=client.id,
-            name=client.name,
-            location=str(client.vertex),
-            total_orders=client.total_orders
-        ) for client in clients
-    ]
+async def get_all_clients(
+    response: Response,
+    offset: int = Query(0, ge=0, description="Posición inicial"),
+    limit: Optional[int] = Query(None, ge=1, description="Máximo de clientes (todos si se omite)"),
+    fields: Optional[str] = Query(None, description="Campos separados por coma, ej: id,total_orders"),
+    format: str = Query("json", description="json o ndjson (streaming)"),
+):
+    async with read_simulation() as sim:
+        if sim is None or not sim.clients:
+            raise HTTPException(status_code=404, detail="No hay simulación activa. Genera una en el dashboard primero.")
+
+        check_format(format)
+        selected = parse_fields(fields, CLIENT_FIELDS)
+        headers = page_headers(offset, limit, len(sim.clients))
+        clients = sim.iter_clients(offset, limit)  # Iterador perezoso sobre la página (no copia la lista)
+        if format == "ndjson":
+            return ndjson_response(clients, client_to_record, selected, headers, lock=sim.lock)
+        if selected is not None:
+            return json_page_response(clients, client_to_record, selected, headers)
+
+        response.headers.update(headers)
+        return [ClientSchema(**client_to_record(client)) for client in clients]
 
 @router.get("/clients/{client_id}", response_model=ClientSchema, summary="Obtener cliente")
-def get_client_by_id(client_id: str):
-    sim = get_simulation()
-    if sim is None or not sim.get_clients():
-        raise HTTPException(status_code=404, detail="No hay simulación activa. Genera una en el dashboard primero.")
-
-    # Busca el cliente por ID
-    client = next((c for c in sim.get_clients() if c.id == client_id), None)
-    if not client:
-        raise HTTPException(status_code=404, detail=f"Cliente con ID {client_id} no encontrado.")
-
-    return ClientSchema(
-        id=client.id,
-        name=client.name,
-        location=str(client.vertex),
-        total_orders=client.total_orders
-    )
\ No newline at end of file
+async def get_client_by_id(client_id: str):
+    async with read_simulation() as sim:
+        if sim is None or not sim.clients:
+            raise HTTPException(status_code=404, detail="No hay simulación activa. Genera una en el dashboard primero.")
+
+        # Busca el cliente por ID (índice O(1))
+        client = sim.get_client(client_id)
+        if not client:
+            raise HTTPException(status_code=404, detail=f"Cliente con ID {client_id} no encontrado.")
+
+        return ClientSchema(**client_to_record(client))
+
+@router.get("/clients/{client_id}/orders", response_model=List[OrderSchema], summary="Obtener órdenes de un cliente")
+async def get_client_orders(client_id: str, status: Optional[str] = None):
+    async with read_simulation() as sim:
+        if sim is None or not sim.clients:
+            raise HTTPException(status_code=404, detail="No hay simulación activa. Genera una en el dashboard primero.")
+
+        if not sim.get_client(client_id):
+            raise HTTPException(status_code=404, detail=f"Cliente con ID {client_id} no encontrado.")
+
+        return [order_to_schema(order) for order in sim.get_orders(status=status, client_id=client_id)]
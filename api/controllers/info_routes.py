@@ -1,94 +1,74 @@
 from fastapi import APIRouter, HTTPException
 from api.schemas import RankingListSchema, RankingItemSchema, SummarySchema
-from api.global_simulation import get as get_simulation
-from collections import Counter
+from api.global_simulation import read_async as read_simulation
 
 router = APIRouter()
 
 @router.get("/info/reports/visits/clients", response_model=RankingListSchema, summary="Ranking de clientes más visitados")
-def get_client_visits_ranking():
-    sim = get_simulation()
-    if sim is None or not sim.route_log:
-        raise HTTPException(status_code=404, detail="No hay simulación activa. Genera una en el dashboard primero.")
+async def get_client_visits_ranking():
+    async with read_simulation() as sim:
+        if sim is None or not sim.route_log:
+            raise HTTPException(status_code=404, detail="No hay simulación activa. Genera una en el dashboard primero.")
 
-    visits_counter = Counter()
-    for path in sim.route_log:
-        for node in path:
-            if "Cliente" in sim.vertex_roles[node]:
-                visits_counter[str(node)] += 1
+        # Conteo mantenido por la simulación al crear/cancelar órdenes
+        rankings = [
+            RankingItemSchema(name=node, visits=visits)
+            for node, visits in sim.get_visit_ranking("Cliente")
+        ]
 
-    rankings = [
-        RankingItemSchema(name=node, visits=visits)
-        for node, visits in visits_counter.most_common()
-    ]
-
-    return RankingListSchema(rankings=rankings)
+        return RankingListSchema(rankings=rankings)
 
 @router.get("/info/reports/visits/recharges", response_model=RankingListSchema, summary="Ranking de nodos de recarga más visitados")
-def get_recharge_visits_ranking():
-    sim = get_simulation()
-    if sim is None or not sim.route_log:
-        raise HTTPException(status_code=404, detail="No hay simulación activa. Genera una en el dashboard primero.")
-
-    # Contar cuántas veces se visitó cada nodo de recarga en las rutas realizadas
-    visits_counter = Counter()
-    for path in sim.route_log:
-        for node in path:
-            if "Recarga" in sim.vertex_roles[node]:
-                visits_counter[str(node)] += 1
+async def get_recharge_visits_ranking():
+    async with read_simulation() as sim:
+        if sim is None or not sim.route_log:
+            raise HTTPException(status_code=404, detail="No hay simulación activa. Genera una en el dashboard primero.")
 
-    rankings = [
-        RankingItemSchema(name=node, visits=visits)
-        for node, visits in visits_counter.most_common()
-    ]
+        # Conteo mantenido por la simulación al crear/cancelar órdenes
+        rankings = [
+            RankingItemSchema(name=node, visits=visits)
+            for node, visits in sim.get_visit_ranking("Recarga")
+        ]
 
-    return RankingListSchema(rankings=rankings)
+        return RankingListSchema(rankings=rankings)
 
 @router.get("/info/reports/visits/storages", response_model=RankingListSchema, summary="Ranking de nodos de almacenamiento más visitados")
-def get_storage_visits_ranking():
-    sim = get_simulation()
-    if sim is None or not sim.route_log:
-        raise HTTPException(status_code=404, detail="No hay simulación activa. Genera una en el dashboard primero.")
-
-    # Contar cuántas veces se visitó cada nodo de almacenamiento en las rutas realizadas
-    visits_counter = Counter()
-    for path in sim.route_log:
-        for node in path:
-            if "Almacenamiento" in sim.vertex_roles[node]:
-                visits_counter[str(node)] += 1
+async def get_storage_visits_ranking():
+    async with read_simulation() as sim:
+        if sim is None or not sim.route_log:
+            raise HTTPException(status_code=404, detail="No hay simulación activa. Genera una en el dashboard primero.")
 
-    rankings = [
-        RankingItemSchema(name=node, visits=visits)
-        for node, visits in visits_counter.most_common()
-    ]
-
-    return RankingListSchema(rankings=rankings)
+        # Conteo mantenido por la simulación al crear/cancelar órdenes
+        rankings = [
+            RankingItemSchema(name=node, visits=visits)
+            for node, visits in sim.get_visit_ranking("Almacenamiento")
+        ]
 
+        return RankingListSchema(rankings=rankings)
 
 @router.get("/info/reports/summary", response_model=SummarySchema, summary="Resumen general de la simulación")
-def get_simulation_summary():
-    sim = get_simulation()
-    if sim is None or not sim.get_all_orders():
-        raise HTTPException(status_code=404, detail="No hay simulación activa. Genera una en el dashboard primero.")
-
-    orders = sim.get_all_orders()
-    roles = sim.get_roles()
-    total_orders = len(orders)
-    total_clients = sum(1 for role in roles.values() if "Cliente" in role)
-    total_recharges = sum(1 for role in roles.values() if "Recarga" in role)
-    total_storages = sum(1 for role in roles.values() if "Almacenamiento" in role)
-    total_distance = sum(order.cost for order in orders)
-    avg_route_length = sum(len(order.path) for order in orders) / total_orders if total_orders else 0
-    max_order_cost = max((order.cost for order in orders), default=0)
-    min_order_cost = min((order.cost for order in orders), default=0)
-
-    return SummarySchema(
-    total_orders=total_orders,
-    total_clients=total_clients,
-    total_recharges=total_recharges,
-    total_storages=total_storages,
-    total_distance=total_distance,
-    avg_route_length=avg_route_length,
-    max_order_cost=max_order_cost,
-    min_order_cost=min_order_cost
-)
\ No newline at end of file
+async def get_simulation_summary():
+    async with read_simulation() as sim:
+        if sim is None or not sim.get_all_orders():
+            raise HTTPException(status_code=404, detail="No hay simulación activa. Genera una en el dashboard primero.")
+
+        # Agregados mantenidos por la simulación (O(1), sin recorrer las órdenes). OrderStats
+        # no cuenta las canceladas: total_orders usa esa misma población y las canceladas van aparte
+        stats = sim.stats
+        distribution = sim.get_node_distribution()
+        latency = {q: (v * 1000 if v is not None else None) for q, v in stats.latency_sketch.quantiles().items()}
+
+        return SummarySchema(
+            total_orders=stats.count,
+            cancelled_orders=sim.get_status_counts().get("Cancelada", 0),
+            total_clients=distribution["Clients"],
+            total_recharges=distribution["Recharge"],
+            total_storages=distribution["Storage"],
+            total_distance=stats.total_cost,
+            avg_route_length=stats.avg_path_length(),
+            max_order_cost=stats.max_cost(),
+            min_order_cost=stats.min_cost(),
+            cost_quantiles=stats.cost_sketch.quantiles(),
+            route_latency_ms=latency,
+            path_length_histogram=dict(stats.path_length_histogram)
+        )
@@ -1,89 +1,107 @@
-from fastapi import APIRouter, HTTPException
-from typing import List
+from fastapi import APIRouter, HTTPException, Query, Response
+from typing import List, Optional
 from api.schemas import OrderSchema
-from api.global_simulation import get as get_simulation
+from api.global_simulation import get as get_simulation, read_async as read_simulation
+from api.pagination import check_format, parse_fields, page_headers, ndjson_response, json_page_response
 from fastapi.responses import JSONResponse
-from typing import List
-from api.schemas import OrderSchema
-from api.global_simulation import get as get_simulation
-from datetime import datetime
+from starlette.concurrency import run_in_threadpool
 
 router = APIRouter()
 
+ORDER_FIELDS = ["id", "client_name", "client_id", "origin", "destination", "cost", "priority", "status", "created_at", "delivered_at"]
+
+def order_to_record(order):
+    """Convierte una Order del dominio en un dict con los campos de OrderSchema."""
+    return {
+        "id": str(order.id),
+        "client_name": order.client.name,
+        "client_id": order.client.id,
+        "origin": str(order.origin),
+        "destination": str(order.destination),
+        "cost": order.cost,
+        "priority": order.priority,
+        "status": order.status,
+        "created_at": order.created_at.strftime("%Y-%m-%d %H:%M:%S"),
+        "delivered_at": order.delivered_at.strftime("%Y-%m-%d %H:%M:%S") if order.delivered_at else None
+    }
+
+def order_to_schema(order):
+    """Convierte una Order del dominio al esquema de la API."""
+    return OrderSchema(**order_to_record(order))
+
 @router.get("/orders/", response_model=List[OrderSchema], summary="Obtener todas las órdenes")
-def get_all_orders():
-    sim = get_simulation()
-    if sim is None or not sim.get_all_orders():
-        raise HTTPException(status_code=404, detail="No hay simulación activa. Genera una en el dashboard primero.")
+async def get_all_orders(
+    response: Response,
+    offset: int = Query(0, ge=0, description="Posición inicial"),
+    limit: Optional[int] = Query(None, ge=1, description="Máximo de órdenes (todas si se omite)"),
+    fields: Optional[str] = Query(None, description="Campos separados por coma, ej: id,cost,status"),
+    format: str = Query("json", description="json o ndjson (streaming)"),
+):
+    async with read_simulation() as sim:
+        if sim is None or not sim.get_all_orders():
+            raise HTTPException(status_code=404, detail="No hay simulación activa. Genera una en el dashboard primero.")
+
+        check_format(format)
+        selected = parse_fields(fields, ORDER_FIELDS)
+        headers = page_headers(offset, limit, len(sim.get_all_orders()))
+        orders = sim.iter_orders(offset, limit)
+        if format == "ndjson":
+            return ndjson_response(orders, order_to_record, selected, headers, lock=sim.lock)
+        if selected is not None:
+            return json_page_response(orders, order_to_record, selected, headers)
 
-    orders = sim.get_all_orders()
-    return [
-        OrderSchema(
-            id=str(order.id),
-            client_name=order.client.name,
-            client_id=order.client.id,
-            origin=str(order.origin),
-            destination=str(order.destination),
-            cost=order.cost,
-            priority=order.priority,
-            status=order.status,
-            created_at=order.created_at.strftime("%Y-%m-%d %H:%M:%S"),
-            delivered_at=order.delivered_at.strftime("%Y-%m-%d %H:%M:%S") if order.delivered_at else None
-        ) for order in orders
-    ]
+        response.headers.update(headers)
+        return [order_to_schema(order) for order in orders]
+
+@router.get("/orders/filter", response_model=List[OrderSchema], summary="Filtrar órdenes por estado, cliente o destino")
+async def filter_orders(status: Optional[str] = None, client_id: Optional[str] = None, destination: Optional[str] = None):
+    async with read_simulation() as sim:
+        if sim is None or not sim.get_all_orders():
+            raise HTTPException(status_code=404, detail="No hay simulación activa. Genera una en el dashboard primero.")
+
+        orders = sim.get_orders(status=status, client_id=client_id, destination=destination)
+        return [order_to_schema(order) for order in orders]
 
 @router.get("/orders/orders/{order_id}", response_model=OrderSchema, summary="Obtener orden")
-def get_order_by_id(order_id: str):
-    sim = get_simulation()
-    if sim is None or not sim.get_all_orders():
-        raise HTTPException(status_code=404, detail="No hay simulación activa. Genera una en el dashboard primero.")
+async def get_order_by_id(order_id: str):
+    async with read_simulation() as sim:
+        if sim is None or not sim.get_all_orders():
+            raise HTTPException(status_code=404, detail="No hay simulación activa. Genera una en el dashboard primero.")
 
-    order = next((o for o in sim.get_all_orders() if str(o.id) == order_id), None)
-    if not order:
-        raise HTTPException(status_code=404, detail=f"Orden con ID {order_id} no encontrada.")
+        order = sim.get_order(order_id)
+        if not order:
+            raise HTTPException(status_code=404, detail=f"Orden con ID {order_id} no encontrada.")
 
-    return OrderSchema(
-        id=str(order.id),
-        client_name=order.client.name,
-        client_id=order.client.id,
-        origin=str(order.origin),
-        destination=str(order.destination),
-        cost=order.cost,
-        priority=order.priority,
-        status=order.status,
-        created_at=order.created_at.strftime("%Y-%m-%d %H:%M:%S"),
-        delivered_at=order.delivered_at.strftime("%Y-%m-%d %H:%M:%S") if order.delivered_at else None
-    )
+        return order_to_schema(order)
 
 @router.post("/orders/orders/{order_id}/cancel", summary="Cancelar una orden")
-def cancel_order(order_id: str):
+async def cancel_order(order_id: str):
     sim = get_simulation()
     if sim is None or not sim.get_all_orders():
         raise HTTPException(status_code=404, detail="No hay simulación activa. Genera una en el dashboard primero.")
 
-    order = next((o for o in sim.get_all_orders() if str(o.id) == order_id), None)
+    order = sim.get_order(order_id)
     if not order:
         raise HTTPException(status_code=404, detail=f"Orden con ID {order_id} no encontrada.")
 
-    if order.status != "Pendiente":
+    # Toma el lock de escritura: se espera en un hilo para no frenar el event loop
+    if not await run_in_threadpool(sim.cancel_order, order):
         raise HTTPException(status_code=400, detail=f"No se puede cancelar la orden con estado '{order.status}'.")
 
-    order.status = "Cancelada"
     return JSONResponse(content={"message": f"Orden {order_id} cancelada correctamente."})
 
 @router.post("/orders/orders/{order_id}/complete", summary="Completar una orden")
-def complete_order(order_id: str):
+async def complete_order(order_id: str):
     sim = get_simulation()
     if sim is None or not sim.get_all_orders():
         raise HTTPException(status_code=404, detail="No hay simulación activa. Genera una en el dashboard primero.")
 
-    order = next((o for o in sim.get_all_orders() if str(o.id) == order_id), None)
+    order = sim.get_order(order_id)
     if not order:
         raise HTTPException(status_code=404, detail=f"Orden con ID {order_id} no encontrada.")
 
-    if order.status != "Pendiente":
+    # Toma el lock de escritura: se espera en un hilo para no frenar el event loop
+    if not await run_in_threadpool(sim.complete_order, order):
         raise HTTPException(status_code=400, detail=f"No se puede completar la orden con estado '{order.status}'.")
 
-    order.status = "Entregado"
-    order.delivered_at = datetime.now()
-    return JSONResponse(content={"message": f"Orden {order_id} marcada como entregada correctamente."})
\ No newline at end of file
+    return JSONResponse(content={"message": f"Orden {order_id} marcada como entregada correctamente."})
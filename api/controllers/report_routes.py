@@ -1,15 +1,56 @@
-from fastapi import APIRouter, HTTPException
-from fastapi.responses import FileResponse
-from visual.report_generator import generate_report_pdf
+import os
+from typing import Optional
+from fastapi import APIRouter, HTTPException, Query
+from fastapi.responses import FileResponse, JSONResponse
 from api.global_simulation import get as get_simulation
+from api.report_jobs import REPORT_JOBS, DONE, FAILED
+from visual.report_generator import MAX_ORDER_ROWS, MAX_CLIENT_ROWS
 
 router = APIRouter()
 
-@router.get("/reports/reports/pdf")
-def get_pdf_report():
+MAX_ROWS_QUERY = Query(MAX_ORDER_ROWS, ge=0, le=100_000, description="Máximo de órdenes listadas (el resto va en agregados)")
+MAX_CLIENT_ROWS_QUERY = Query(MAX_CLIENT_ROWS, ge=0, le=100_000, description="Máximo de clientes listados")
+TIME_BUDGET_QUERY = Query(None, gt=0, description="Segundos para armar las tablas antes de resumir")
+
+def _submit_report(max_rows, time_budget, max_client_rows):
     sim = get_simulation()
     if sim is None:
         raise HTTPException(status_code=400, detail="No hay simulación activa. Genera una en el dashboard primero.")
+    return REPORT_JOBS.submit(sim, {"max_order_rows": max_rows, "time_budget": time_budget,
+                                    "max_client_rows": max_client_rows})
+
+def _report_file(job):
+    if job.status == FAILED:
+        raise HTTPException(status_code=500, detail=f"Falló la generación del reporte: {job.error}")
+    if job.status != DONE:
+        raise HTTPException(status_code=409, detail=f"El reporte aún no está listo (estado '{job.status}').")
+    if not os.path.exists(job.path):
+        raise HTTPException(status_code=410, detail="El reporte fue desalojado de la caché. Solicítalo nuevamente.")
+    return FileResponse(path=job.path, filename=job.filename(), media_type="application/pdf")
+
+@router.get("/reports/reports/pdf")
+async def get_pdf_report(max_rows: int = MAX_ROWS_QUERY, time_budget: Optional[float] = TIME_BUDGET_QUERY,
+                         max_client_rows: int = MAX_CLIENT_ROWS_QUERY):
+    # Equivale a crear un trabajo y esperarlo; si el PDF está en caché responde al instante
+    job = await REPORT_JOBS.wait(_submit_report(max_rows, time_budget, max_client_rows))
+    return _report_file(job)
+
+@router.post("/reports/jobs", status_code=202, summary="Solicitar un reporte PDF")
+async def submit_report_job(max_rows: int = MAX_ROWS_QUERY, time_budget: Optional[float] = TIME_BUDGET_QUERY,
+                            max_client_rows: int = MAX_CLIENT_ROWS_QUERY):
+    job = _submit_report(max_rows, time_budget, max_client_rows)
+    return JSONResponse(status_code=202, content=job.to_dict())
+
+@router.get("/reports/jobs/{job_id}", summary="Estado de un reporte")
+async def get_report_job(job_id: str):
+    job = REPORT_JOBS.get(job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail=f"Reporte con ID {job_id} no encontrado.")
+    return job.to_dict()
 
-    filename = generate_report_pdf(sim)
-    return FileResponse(path=filename, filename=filename, media_type="application/pdf")
+@router.get("/reports/jobs/{job_id}/pdf", summary="Descargar un reporte terminado")
+async def download_report_job(job_id: str):
+    job = REPORT_JOBS.get(job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail=f"Reporte con ID {job_id} no encontrado.")
+    return _report_file(job)
@@ -0,0 +1,55 @@
+# api/executor.py
+import asyncio
+import os
+from concurrent.futures import ProcessPoolExecutor
+from functools import partial
+from fastapi import HTTPException
+
+# Procesos para trabajo pesado (PDF, cálculo de rutas) y tamaño máximo de la cola
+MAX_WORKERS = int(os.environ.get("API_CPU_WORKERS", max(1, (os.cpu_count() or 2) // 2)))
+MAX_QUEUED = int(os.environ.get("API_CPU_QUEUE", 8))
+
+_executor = None
+_in_flight = 0  # Trabajos en ejecución + en cola (solo se modifica desde el event loop)
+
+def get_executor():
+    """Pool de procesos compartido por la API (se crea al primer uso)."""
+    global _executor
+    if _executor is None:
+        _executor = ProcessPoolExecutor(max_workers=MAX_WORKERS)
+    return _executor
+
+def is_saturated(pending=0):
+    """True si el pool ya tiene ocupados todos sus procesos y su cola.
+    pending: trabajos aceptados por quien llama que todavía no llegaron al pool.
+    """
+    return max(_in_flight, pending) >= MAX_WORKERS + MAX_QUEUED
+
+def reject_if_saturated(pending=0):
+    # Contrapresión: se rechaza con 503 en lugar de seguir encolando
+    if is_saturated(pending):
+        raise HTTPException(status_code=503, detail="Servidor ocupado generando reportes. Intenta nuevamente en unos segundos.",
+                            headers={"Retry-After": "5"})
+
+async def run_cpu_bound(fn, *args, **kwargs):
+    """Ejecuta fn(*args) en el pool de procesos sin bloquear el event loop.
+
+    Si ya hay MAX_WORKERS trabajos corriendo y MAX_QUEUED esperando, responde 503
+    (con Retry-After) en lugar de seguir encolando: las consultas livianas mantienen
+    baja latencia mientras se generan reportes.
+    """
+    global _in_flight
+    reject_if_saturated()
+    _in_flight += 1
+    try:
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(get_executor(), partial(fn, *args, **kwargs))
+    finally:
+        _in_flight -= 1
+
+def shutdown():
+    """Cierra el pool de procesos (al apagar la API)."""
+    global _executor
+    if _executor is not None:
+        _executor.shutdown(wait=False, cancel_futures=True)
+        _executor = None
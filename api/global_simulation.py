@@ -1,7 +1,36 @@
+from contextlib import contextmanager, asynccontextmanager
+
 SIMULATION = None
+GENERATION = 0  # Aumenta cada vez que el dashboard publica una simulación nueva
+
 def set(sim):
-    global SIMULATION
+    # El reemplazo de la referencia es atómico: los lectores ven la simulación anterior o la nueva completa
+    global SIMULATION, GENERATION
     SIMULATION = sim
+    GENERATION += 1
 
 def get():
     return SIMULATION
+
+@contextmanager
+def read():
+    """Entrega la simulación activa bajo su lock de lectura (None si no hay).
+    Muchos lectores pueden entrar a la vez; solo esperan mientras la simulación se modifica.
+    Bloquea el hilo que llama: en handlers async usar read_async().
+    """
+    sim = SIMULATION
+    if sim is None:
+        yield None
+        return
+    with sim.lock.read():
+        yield sim
+
+@asynccontextmanager
+async def read_async():
+    """Como read(), para handlers async: mientras espera a un escritor el event loop sigue libre."""
+    sim = SIMULATION
+    if sim is None:
+        yield None
+        return
+    async with sim.lock.read_async():
+        yield sim
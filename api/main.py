@@ -1,9 +1,27 @@
+import os
+from contextlib import asynccontextmanager
 from fastapi import FastAPI
 from api.controllers import client_routes, order_routes, report_routes
 #info_routes,  
 from api.controllers import client_routes, order_routes, info_routes, report_routes 
+from api import executor
+from api.global_simulation import set as set_simulation
 
-app = FastAPI()
+SNAPSHOT_PATH = os.environ.get("SIMULATION_SNAPSHOT")  # Snapshot a cargar al iniciar (ver Simulation.save)
+ROUTE_INDEX_PATH = os.environ.get("SIMULATION_ROUTE_INDEX")  # Índice CH del snapshot (se crea si no existe)
+
+@asynccontextmanager
+async def lifespan(app):
+    if SNAPSHOT_PATH and os.path.isdir(SNAPSHOT_PATH):
+        from sim.simulation import Simulation
+        sim = Simulation.load(SNAPSHOT_PATH)  # La API sobrevive reinicios sin esperar al dashboard
+        if ROUTE_INDEX_PATH:
+            sim.enable_contraction_hierarchy(ROUTE_INDEX_PATH)
+        set_simulation(sim)
+    yield
+    executor.shutdown()  # Cierra el pool de procesos de reportes
+
+app = FastAPI(lifespan=lifespan)
 
 app.include_router(client_routes.router)
 
@@ -0,0 +1,59 @@
+# api/pagination.py
+import json
+from contextlib import nullcontext
+from itertools import islice
+from fastapi import HTTPException
+from fastapi.responses import JSONResponse, StreamingResponse
+
+FORMATS = ("json", "ndjson")
+STREAM_CHUNK = 500  # Registros por bloque NDJSON (cada bloque se arma bajo el lock de lectura)
+
+def check_format(format):
+    """Valida el formato de salida pedido."""
+    if format not in FORMATS:
+        raise HTTPException(status_code=400, detail=f"Formato no válido: {format}. Disponibles: {', '.join(FORMATS)}.")
+
+def parse_fields(fields, allowed):
+    """Convierte 'id,cost' en una lista de campos válidos (None = todos)."""
+    if not fields:
+        return None
+    selected = [f.strip() for f in fields.split(",") if f.strip()]
+    invalid = [f for f in selected if f not in allowed]
+    if invalid:
+        raise HTTPException(status_code=400, detail=f"Campos no válidos: {', '.join(invalid)}. Disponibles: {', '.join(allowed)}.")
+    return selected
+
+def select_fields(record, fields):
+    """Deja en el registro solo los campos pedidos."""
+    if fields is None:
+        return record
+    return {f: record[f] for f in fields}
+
+def page_headers(offset, limit, total):
+    """Cabeceras de paginación: total de registros y siguiente offset (si hay más)."""
+    headers = {"X-Total-Count": str(total)}
+    if limit is not None and offset + limit < total:
+        headers["X-Next-Offset"] = str(offset + limit)
+    return headers
+
+def ndjson_response(items, to_record, fields, headers=None, lock=None):
+    """Respuesta NDJSON que serializa los registros de forma perezosa (memoria constante).
+    El cuerpo se envía después de que el handler soltó el lock: con 'lock' (el RWLock de la
+    simulación) cada bloque de STREAM_CHUNK registros se serializa bajo su lock de lectura,
+    así ningún escritor modifica un registro a medio escribir. Starlette recorre el
+    generador en un hilo del pool, donde esperar el lock no frena el event loop.
+    """
+    def generate():
+        iterator = iter(items)
+        while True:
+            with lock.read() if lock is not None else nullcontext():
+                lines = [json.dumps(select_fields(to_record(item), fields), ensure_ascii=False) + "\n"
+                         for item in islice(iterator, STREAM_CHUNK)]
+            if not lines:
+                break
+            yield "".join(lines)
+    return StreamingResponse(generate(), media_type="application/x-ndjson", headers=headers)
+
+def json_page_response(items, to_record, fields, headers=None):
+    """Respuesta JSON con solo los campos pedidos."""
+    return JSONResponse(content=[select_fields(to_record(item), fields) for item in items], headers=headers)
@@ -0,0 +1,205 @@
+# api/report_jobs.py
+import asyncio
+import hashlib
+import json
+import os
+import uuid
+from collections import OrderedDict
+from datetime import datetime
+from starlette.concurrency import run_in_threadpool
+from visual.report_generator import generate_report_pdf, ReportData, MAX_ORDER_ROWS, MAX_CLIENT_ROWS
+from api.global_simulation import read as read_simulation
+from api.executor import run_cpu_bound, reject_if_saturated
+
+CACHE_DIR = os.environ.get("REPORT_CACHE_DIR", "report_cache")
+CACHE_MAX_ENTRIES = int(os.environ.get("REPORT_CACHE_MAX", 16))
+MAX_JOBS = 100  # Trabajos terminados que se recuerdan para consultar estado/descargar
+
+PENDING, RUNNING, DONE, FAILED = "pendiente", "en_proceso", "listo", "error"
+
+def report_key(sim_uid, version, params):
+    """Clave de contenido: misma simulación, misma versión y mismos parámetros => mismo PDF."""
+    raw = json.dumps([sim_uid, version, params], sort_keys=True, default=str)
+    return hashlib.sha256(raw.encode()).hexdigest()[:32]
+
+
+# Caché en disco de PDFs terminados con desalojo LRU
+class ReportCache:
+    def __init__(self, directory=CACHE_DIR, max_entries=CACHE_MAX_ENTRIES):
+        """
+        Guarda cada PDF como <directory>/<clave>.pdf. El orden de uso se mantiene en memoria
+        y se reconstruye por fecha de modificación al iniciar, así la caché sobrevive reinicios.
+        """
+        self.directory = directory
+        self.max_entries = max_entries
+        self._entries = OrderedDict()  # clave -> ruta, del menos al más recientemente usado
+        os.makedirs(directory, exist_ok=True)
+        files = [f for f in os.listdir(directory) if f.endswith(".pdf") and not f.endswith(".tmp.pdf")]
+        files.sort(key=lambda f: os.path.getmtime(os.path.join(directory, f)))
+        for f in files:
+            self._entries[f[:-4]] = os.path.join(directory, f)
+
+    def path_for(self, key):
+        return os.path.join(self.directory, f"{key}.pdf")
+
+    def temp_path(self, key):
+        # Archivo de trabajo: solo pasa a la caché cuando el PDF está completo
+        return os.path.join(self.directory, f"{key}.{uuid.uuid4().hex[:8]}.tmp.pdf")
+
+    def get(self, key):
+        """Ruta del PDF cacheado (marcándolo como usado) o None."""
+        path = self._entries.get(key)
+        if path is None:
+            return None
+        if not os.path.exists(path):
+            del self._entries[key]
+            return None
+        self._entries.move_to_end(key)
+        os.utime(path)
+        return path
+
+    def put(self, key, temp_path):
+        """Mueve un PDF terminado a la caché y desaloja los menos usados."""
+        path = self.path_for(key)
+        os.replace(temp_path, path)
+        self._entries[key] = path
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            _, old = self._entries.popitem(last=False)
+            if os.path.exists(old):
+                os.remove(old)
+        return path
+
+    def __len__(self):
+        return len(self._entries)
+
+
+class ReportJob:
+    def __init__(self, key, params):
+        self.id = str(uuid.uuid4())
+        self.key = key
+        self.params = params
+        self.status = PENDING
+        self.error = None
+        self.path = None
+        self.created_at = datetime.now()
+        self.finished_at = None
+        self.task = None
+
+    def filename(self):
+        return f"Informe_{self.created_at.strftime('%Y%m%d_%H%M%S')}.pdf"
+
+    def to_dict(self):
+        return {
+            "job_id": self.id,
+            "status": self.status,
+            "error": self.error,
+            "created_at": self.created_at.strftime("%Y-%m-%d %H:%M:%S"),
+            "finished_at": self.finished_at.strftime("%Y-%m-%d %H:%M:%S") if self.finished_at else None,
+        }
+
+
+def _collect_report(params):
+    # Datos del informe bajo el lock de lectura: la versión corresponde exactamente al contenido.
+    # Solo se copian agregados, rankings y las filas que entran en el informe (no la simulación)
+    with read_simulation() as sim:
+        if sim is None:
+            return None
+        return sim.uid, sim.version, ReportData(sim, params.get("max_order_rows", MAX_ORDER_ROWS),
+                                                params.get("max_client_rows", MAX_CLIENT_ROWS))
+
+def _render_report(data, filename, params):
+    """Genera el PDF en un proceso del pool a partir de los datos extraídos."""
+    return generate_report_pdf(data, filename=filename, **params)
+
+
+# Cola de trabajos de reporte (se usa solo desde el event loop de la API)
+class ReportJobQueue:
+    def __init__(self, cache=None):
+        """
+        - submit(): devuelve un trabajo; si el PDF ya está en caché queda listo al instante y
+          si hay un trabajo en curso con la misma clave se reutiliza (no se genera dos veces)
+        - get(job_id): trabajo para consultar estado o descargar
+        """
+        self._cache = cache
+        self.jobs = OrderedDict()  # job_id -> ReportJob
+        self._running = {}         # clave -> trabajo en curso
+
+    @property
+    def cache(self):
+        if self._cache is None:
+            self._cache = ReportCache()
+        return self._cache
+
+    def submit(self, sim, params=None):
+        params = params or {}
+        key = report_key(sim.uid, sim.version, params)
+        job = self._running.get(key)
+        if job is not None:
+            return job
+
+        path = self.cache.get(key)
+        if path is None:
+            reject_if_saturated(len(self._running))  # Solo los reportes que hay que generar ocupan el pool
+        job = ReportJob(key, params)
+        self._remember(job)
+        if path is not None:
+            self._finish(job, path)
+            return job
+
+        self._running[key] = job
+        job.task = asyncio.get_running_loop().create_task(self._run(job))
+        return job
+
+    async def wait(self, job):
+        """Espera a que termine el trabajo y lo devuelve."""
+        if job.task is not None:
+            await asyncio.shield(job.task)
+        return job
+
+    def get(self, job_id):
+        return self.jobs.get(job_id)
+
+    async def _run(self, job):
+        try:
+            collected = await run_in_threadpool(_collect_report, job.params)
+            if collected is None:
+                raise RuntimeError("No hay simulación activa.")
+            sim_uid, version, data = collected
+            # Si la simulación cambió desde submit, el PDF se guarda con la clave de lo que realmente contiene
+            key = report_key(sim_uid, version, job.params)
+            path = self.cache.get(key)
+            if path is None:
+                job.status = RUNNING
+                temp = self.cache.temp_path(key)
+                try:
+                    await run_cpu_bound(_render_report, data, temp, job.params)
+                except BaseException:
+                    if os.path.exists(temp):
+                        os.remove(temp)
+                    raise
+                path = self.cache.put(key, temp)
+            self._finish(job, path)
+        except Exception as exc:
+            job.status = FAILED
+            job.error = getattr(exc, "detail", None) or str(exc)
+            job.finished_at = datetime.now()
+        finally:
+            self._running.pop(job.key, None)
+
+    def _finish(self, job, path):
+        job.path = path
+        job.status = DONE
+        job.finished_at = datetime.now()
+
+    def _remember(self, job):
+        self.jobs[job.id] = job
+        # Se olvidan los trabajos terminados más antiguos
+        for job_id in list(self.jobs):
+            if len(self.jobs) <= MAX_JOBS:
+                break
+            if self.jobs[job_id].status in (DONE, FAILED):
+                del self.jobs[job_id]
+
+
+REPORT_JOBS = ReportJobQueue()
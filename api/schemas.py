@@ -1,6 +1,6 @@
 # api/schemas.py
 from pydantic import BaseModel
-from typing import Optional, List
+from typing import Optional, List, Dict
 from datetime import datetime
 
 class ClientSchema(BaseModel):
@@ -35,7 +35,8 @@ class SummarySchema(BaseModel):
     avg_order_cost: float
 
 class SummarySchema(BaseModel):
-    total_orders: int
+    total_orders: int  # Órdenes activas (pendientes y entregadas), las mismas de los agregados
+    cancelled_orders: int = 0
     total_clients: int
     total_recharges: int
     total_storages: int
@@ -43,6 +44,9 @@ class SummarySchema(BaseModel):
     avg_route_length: float
     max_order_cost: float
     min_order_cost: float
+    cost_quantiles: Dict[str, Optional[float]] = {}
+    route_latency_ms: Dict[str, Optional[float]] = {}
+    path_length_histogram: Dict[int, int] = {}
 
 
 class RankingItemSchema(BaseModel):
@@ -0,0 +1,200 @@
+"""Benchmarks reproducibles de la simulación.
+
+Mide construcción del grafo, ruteo, caminos mínimos (Dijkstra, bidireccional, A*,
+jerarquías de contracción), lote de órdenes, armado del AVL, MST y reporte PDF para
+varios tamaños de red, siempre con la misma semilla. Guarda los tiempos en JSON y,
+si se indica una línea base, marca las regresiones (y termina con código 1).
+
+Uso:
+    python -m benchmarks.run_benchmarks --sizes small,medium --output bench.json
+    python -m benchmarks.run_benchmarks --baseline bench.json --tolerance 0.2
+"""
+import argparse
+import json
+import os
+import platform
+import sys
+import tempfile
+import time
+from datetime import datetime
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from sim.simulation import Simulation
+from sim.simulation_initializer import SimulationInitializer
+from domain.route import Route
+from tda.avl import AVLTree
+
+# Tamaños de red: nombre -> (nodos, aristas)
+SIZES = {
+    "small": (200, 400),
+    "medium": (2_000, 4_000),
+    "large": (20_000, 40_000),
+}
+ROUTE_QUERIES = 200   # Rutas por medición de ruteo
+ORDER_BATCH = 500     # Órdenes por lote
+AVL_ROUTES = 20_000   # Rutas insertadas en el AVL
+MIN_DELTA = 0.005     # Segundos: diferencias menores se consideran ruido
+
+
+### --- Casos --- ###
+# Cada caso recibe (n_nodes, m_edges, seed), prepara lo necesario fuera de la medición
+# y devuelve la función a cronometrar.
+
+def case_graph_build(n, m, seed):
+    return lambda: SimulationInitializer(n, m, seed=seed).generate_graph()
+
+def case_routing(n, m, seed):
+    sim = Simulation(n, m, seed=seed)
+    rng = np.random.default_rng(seed)
+    vertices = list(sim.graph.vertices())
+    pairs = [(vertices[a], vertices[b]) for a, b in rng.integers(len(vertices), size=(ROUTE_QUERIES, 2)).tolist()]
+
+    def run():
+        sim.router.invalidate()  # Sin tramos cacheados de una repetición anterior
+        for origin, destination in pairs:
+            sim.find_route(origin, destination)
+    return run
+
+def _shortest_path_case(method):
+    # Caminos mínimos punto a punto sin autonomía; la heurística o el índice CH se preparan fuera de la medición
+    def case(n, m, seed):
+        sim = Simulation(n, m, seed=seed)
+        rng = np.random.default_rng(seed)
+        vertices = list(sim.graph.vertices())
+        pairs = [(vertices[a], vertices[b]) for a, b in rng.integers(len(vertices), size=(ROUTE_QUERIES, 2)).tolist()]
+        if method == "astar":
+            sim.shortest_path(*pairs[0], method)
+        elif method == "ch":
+            sim.enable_contraction_hierarchy()
+
+        def run():
+            for origin, destination in pairs:
+                sim.shortest_path(origin, destination, method)
+        return run
+    return case
+
+def case_order_batch(n, m, seed):
+    sim = Simulation(n, m, seed=seed)
+    return lambda: sim.generate_orders(ORDER_BATCH, seed=seed)
+
+def case_avl_build(n, m, seed):
+    sim = Simulation(n, m, seed=seed)
+    sim.generate_orders(ORDER_BATCH, seed=seed)
+    paths = sim.route_log
+    routes = [(paths[i % len(paths)], float(i % 97)) for i in range(AVL_ROUTES)] if paths else []
+
+    def run():
+        tree = AVLTree()
+        for path, cost in routes:
+            route = Route(path, cost)
+            tree.insert(route, route)
+    return run
+
+def case_mst(n, m, seed):
+    sim = Simulation(n, m, seed=seed)
+    return sim.compute_mst
+
+def case_report_build(n, m, seed):
+    from visual.report_generator import generate_report_pdf
+    sim = Simulation(n, m, seed=seed)
+    sim.generate_orders(ORDER_BATCH, seed=seed)
+    filename = os.path.join(tempfile.mkdtemp(prefix="bench_"), "report.pdf")
+    return lambda: generate_report_pdf(sim, filename=filename)
+
+CASES = {
+    "graph_build": case_graph_build,
+    "routing": case_routing,
+    "sp_dijkstra": _shortest_path_case("dijkstra"),
+    "sp_bidirectional": _shortest_path_case("bidirectional"),
+    "sp_astar": _shortest_path_case("astar"),
+    "sp_ch": _shortest_path_case("ch"),
+    "order_batch": case_order_batch,
+    "avl_build": case_avl_build,
+    "mst": case_mst,
+    "report_build": case_report_build,
+}
+
+
+### --- Ejecución y comparación --- ###
+def measure(fn, repeat):
+    """Mejor tiempo (segundos) de 'repeat' ejecuciones."""
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+def run_benchmarks(sizes, cases, repeat=3, seed=0, log=print):
+    results = {}
+    for size in sizes:
+        n, m = SIZES[size]
+        for case in cases:
+            fn = CASES[case](n, m, seed)
+            seconds = measure(fn, repeat)
+            results[f"{size}/{case}"] = seconds
+            log(f"{size:>7} {case:<16} {seconds * 1000:10.1f} ms")
+    return results
+
+def compare(results, baseline, tolerance):
+    """Devuelve [(clave, antes, ahora, cambio)] de los casos más lentos que la línea base."""
+    regressions = []
+    for key, now in results.items():
+        before = baseline.get(key)
+        if before is None:
+            continue
+        if now > before * (1 + tolerance) and now - before > MIN_DELTA:
+            regressions.append((key, before, now, now / before - 1))
+    return regressions
+
+def metadata(seed, repeat):
+    return {
+        "date": datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
+        "python": platform.python_version(),
+        "numpy": np.__version__,
+        "machine": platform.machine(),
+        "seed": seed,
+        "repeat": repeat,
+    }
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmarks reproducibles de la simulación")
+    parser.add_argument("--sizes", default="small,medium", help=f"Tamaños separados por coma ({', '.join(SIZES)})")
+    parser.add_argument("--cases", default=",".join(CASES), help=f"Casos separados por coma ({', '.join(CASES)})")
+    parser.add_argument("--repeat", type=int, default=3, help="Repeticiones por caso (se informa la mejor)")
+    parser.add_argument("--seed", type=int, default=0, help="Semilla de grafo, roles y órdenes")
+    parser.add_argument("--output", help="Archivo JSON donde guardar los resultados")
+    parser.add_argument("--baseline", help="JSON de una corrida anterior para detectar regresiones")
+    parser.add_argument("--tolerance", type=float, default=0.2, help="Aumento relativo tolerado (0.2 = 20%%)")
+    args = parser.parse_args(argv)
+
+    sizes = [s for s in args.sizes.split(",") if s]
+    cases = [c for c in args.cases.split(",") if c]
+    unknown = [s for s in sizes if s not in SIZES] + [c for c in cases if c not in CASES]
+    if unknown:
+        parser.error(f"Valores desconocidos: {', '.join(unknown)}")
+
+    results = run_benchmarks(sizes, cases, args.repeat, args.seed)
+
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump({"meta": metadata(args.seed, args.repeat), "results": results}, f, indent=2)
+        print(f"\nResultados guardados en {args.output}")
+
+    if args.baseline:
+        with open(args.baseline) as f:
+            baseline = json.load(f)["results"]
+        regressions = compare(results, baseline, args.tolerance)
+        if regressions:
+            print(f"\n⚠️  Regresiones (más de {args.tolerance:.0%} sobre la línea base):")
+            for key, before, now, change in regressions:
+                print(f"  {key:<22} {before * 1000:10.1f} ms -> {now * 1000:10.1f} ms  (+{change:.0%})")
+            return 1
+        print("\nSin regresiones respecto de la línea base.")
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
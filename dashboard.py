@@ -8,7 +8,8 @@ import json
 from collections import Counter
 from datetime import datetime
 from sim.simulation import Simulation
-from visual.map.map_builder import draw_folium_map
+from sim.simulation_initializer import Role
+from visual.map.map_builder import draw_folium_map, ROLE_COLORS
 from visual.avl_visualizer import AVLVisualizer
 from domain.route import Route
 from tda.avl import AVLTree
@@ -50,6 +51,13 @@ with tabs[0]:
     with col3:
         n_orders = st.slider("📦 Número de órdenes", 10, 500, 10)
 
+    col4, col5 = st.columns(2)
+    with col4:
+        model = st.selectbox("🗺️ Modelo de red", ["random", "geometric", "grid"],
+                             format_func={"random": "Aleatorio", "geometric": "Geométrico", "grid": "Grilla con ruido"}.get)
+    with col5:
+        seed = st.number_input("🎲 Semilla (0 = aleatoria)", min_value=0, value=0, step=1)
+
     st.divider()
     st.markdown("### 📊 Iniciar Simulación")
     st.markdown("- 📦 **Almacenamiento**: 20%")
@@ -63,15 +71,13 @@ with tabs[0]:
             if key in st.session_state:
                 del st.session_state[key]
 
-        sim = Simulation(n_nodes, m_edges)
-        for _ in range(n_orders):
-            sim.generate_order()
+        sim = Simulation(n_nodes, m_edges, model=model, seed=int(seed) or None)
+        sim.enable_order_store()  # Tablas y estadísticas de órdenes vectorizadas
+        sim.generate_orders(n_orders)
 
-        roles = sim.get_roles()
-        total = len(roles)
-        storage = sum(1 for r in roles.values() if "Almacenamiento" in r)
-        recharge = sum(1 for r in roles.values() if "Recarga" in r)
-        client = sum(1 for r in roles.values() if "Cliente" in r)
+        distribution = sim.get_node_distribution()
+        storage, recharge, client = distribution["Storage"], distribution["Recharge"], distribution["Clients"]
+        total = storage + recharge + client
 
         st.success("✅ Simulación generada exitosamente.")
         col1, col2, col3 = st.columns(3)
@@ -85,6 +91,33 @@ with tabs[0]:
         st.session_state.mst_actual = None
         st.session_state.info_ruta = None
 
+    st.divider()
+    st.markdown("### 💾 Guardar / Cargar Simulación")
+    snapshot_path = st.text_input("📁 Directorio del snapshot", "snapshots/simulacion")
+    col1, col2 = st.columns(2)
+    with col1:
+        if st.button("💾 Guardar", use_container_width=True, disabled="simulation" not in st.session_state):
+            st.session_state.simulation.save(snapshot_path)
+            st.success(f"✅ Simulación guardada en {snapshot_path}")
+    with col2:
+        if st.button("📂 Cargar", use_container_width=True):
+            if not os.path.isdir(snapshot_path):
+                st.error("❌ No existe un snapshot en ese directorio.")
+            else:
+                for key in ["coords", "ruta_actual", "mst_actual", "info_ruta"]:
+                    if key in st.session_state:
+                        del st.session_state[key]
+                sim = Simulation.load(snapshot_path)
+                sim.enable_order_store()
+                st.session_state.simulation = sim
+                set_simulation(sim)
+                st.success(f"✅ Simulación cargada: {len(sim.orders)} órdenes, {len(sim.vertex_roles)} nodos.")
+    # Índice de jerarquías de contracción junto al snapshot: se reutiliza mientras la red no cambie
+    if st.button("⚡ Preparar índice de rutas", use_container_width=True, disabled="simulation" not in st.session_state):
+        with st.spinner("Construyendo (o abriendo) el índice de rutas..."):
+            hierarchy = st.session_state.simulation.enable_contraction_hierarchy(f"{snapshot_path}_ch")
+        st.success(f"✅ Índice de rutas activo: {hierarchy.shortcut_count()} atajos, guardado en {snapshot_path}_ch")
+
 # ----------------- Pestaña 1: Explore Network ------------------
 with tabs[1]:
     st.markdown("## 🌍 Exploración de Red y Rutas")
@@ -110,8 +143,7 @@ with tabs[1]:
         algorithm = st.radio("Algoritmo", options=["Dijkstra"], index=0)
 
         if st.button("✈ Calcular ruta", use_container_width=True):
-            destino_rol = sim.get_roles()[label_to_vertex[destino]]
-            if "Cliente" not in destino_rol:
+            if not sim.has_role(label_to_vertex[destino], Role.CLIENT):
                 st.warning("⚠️ El nodo destino debe ser un Cliente para calcular una ruta.")
             elif origen == destino:
                 st.warning("⚠️ El nodo origen y destino no pueden ser iguales.")
@@ -164,21 +196,18 @@ with tabs[1]:
             # Botón para completar la ruta
             if st.button("✅ Completar Ruta", use_container_width=True):
                 sim = st.session_state.simulation
-                # Encuentra la orden que coincide con el origen y destino actuales
-                for order in sim.get_all_orders():
-                    if str(order.origin) == origen and str(order.destination) == destino:
-                        order.status = "Entregado"
-                        order.delivered_at = datetime.now()
+                # Encuentra la orden pendiente que coincide con el origen y destino actuales
+                for order in sim.get_orders(status="Pendiente", destination=destino):
+                    if str(order.origin) == origen:
+                        sim.complete_order(order)
                         st.success(f"Orden {order.id} marcada como entregada.")
                         break
                 else:
                     st.warning("⚠️ No se encontró una orden que coincida con el origen y destino seleccionados.")
 
         # Mostrar cantidad de nodos por tipo debajo del mapa
-        roles = sim.get_roles()
-        storage = sum(1 for r in roles.values() if "Almacenamiento" in r)
-        recharge = sum(1 for r in roles.values() if "Recarga" in r)
-        client = sum(1 for r in roles.values() if "Cliente" in r)
+        distribution = sim.get_node_distribution()
+        storage, recharge, client = distribution["Storage"], distribution["Recharge"], distribution["Clients"]
         st.markdown("---")
         st.markdown(f"**Nodos:**  ")
         st.markdown(f"- 📦 Almacenamiento: {storage}")
@@ -226,27 +255,15 @@ with tabs[2]:
         else:
             st.info("ℹ️ No hay clientes registrados todavía.")
 
-        # Lista de órdenes realizadas en el sistema
+        # Lista de órdenes realizadas en el sistema (desde el almacén columnar, sin recorrer objetos)
         st.subheader("📦 Orders")
         if orders:
-            orders_json = []
-            for order in orders:
-                order_info = {
-                    "order_id": str(order.id),
-                    "client": order.client.name,
-                    "client_id": order.client.id,
-                    "origin": str(order.origin),
-                    "destination": str(order.destination),
-                    "status": order.status,
-                    "priority": order.priority,
-                    "created_at": order.created_at.isoformat(),
-                    "delivered_at": order.delivered_at.isoformat() if order.delivered_at else None,
-                    "created_at": order.created_at.strftime("%Y-%m-%d %H:%M:%S"),
-                    "delivered_at": order.delivered_at.strftime("%Y-%m-%d %H:%M:%S") if order.delivered_at else None,
-                    "route_cost": order.cost,
-                }
-                orders_json.append(order_info)
-            st.json(orders_json)
+            orders_df = sim.get_orders_frame()
+            status_filter = st.multiselect("Estado", list(orders_df["status"].cat.categories))
+            if status_filter:
+                orders_df = orders_df[orders_df["status"].isin(status_filter)]
+            st.dataframe(orders_df.drop(columns=["path_offset"]).rename(columns={"cost": "route_cost"}),
+                         use_container_width=True, hide_index=True)
         else:
             st.info("ℹ️ No hay órdenes registradas todavía.")
 
@@ -263,16 +280,16 @@ with tabs[3]:
         if not route_log:
             st.info("ℹ️ No hay rutas registradas todavía.")
         else:
-            # Inserta rutas en un árbol AVL
-            avl = AVLTree()
-            for path in route_log:
-                route = Route(path)
-                avl.insert(route, route)
+            # La simulación mantiene el AVL de rutas y su ranking al registrar cada orden
+            avl = sim.route_tree
+            ranking = sim.route_ranking
 
-            rutas_ordenadas = avl.get_in_order()
             st.subheader("📝 Rutas (ordenadas por frecuencia/costo)")
-            for ruta, obj in rutas_ordenadas:
-                st.code(ruta.to_label())
+            top_k = st.number_input("Cantidad de rutas a mostrar", min_value=1, max_value=len(ranking),
+                                    value=min(20, len(ranking)))
+            for ruta in ranking.top_k(top_k):
+                st.code(f"#{ranking.rank(ruta)} | {ruta.to_label()} | Costo: {ruta.cost} | "
+                        f"Percentil: {ranking.percentile(ruta):.1f}")
 
             # Visualiza rutas en orden y diagrama AVL
             st.subheader("🌳 Visualización del Árbol AVL")
@@ -313,21 +330,9 @@ with tabs[4]:
         st.warning("⚠️ Ejecuta una simulación primero.")
     else:
         sim = st.session_state.simulation
-        route_log = sim.route_log
-        roles = sim.get_roles()
-
-        # Conteo de visitas por tipo de nodo
-        visit_counter = Counter()
-        for path in route_log:
-            for node in path:
-                role = roles.get(node, "Desconocido")
-                visit_counter[(str(node), role)] += 1
 
-        tipo_visitas = {"Cliente": [], "Almacenamiento": [], "Recarga": []}
-        for (node, role), count in visit_counter.items():
-            for tipo in tipo_visitas:
-                if tipo in role:
-                    tipo_visitas[tipo].append((node, count))
+        # Conteo de visitas por tipo de nodo (mantenido por la simulación)
+        tipo_visitas = {tipo: sim.get_visit_ranking(tipo) for tipo in ["Cliente", "Almacenamiento", "Recarga"]}
 
         st.subheader("📊 Frecuencia de visitas por tipo de nodo")
 
@@ -343,22 +348,27 @@ with tabs[4]:
                 col.info(f"No hay visitas registradas para {tipo.lower()}s.")
 
         st.subheader("🥧 Proporción de Tipos de Nodos en la Red")
-        tipo_counts = Counter(roles.values())
-
-        etiquetas = list(tipo_counts.keys())
-        colores = []
-        for tipo in etiquetas:
-            if "Cliente" in tipo:
-                colores.append("blue")
-            elif "Almacenamiento" in tipo:
-                colores.append("orange")
-            elif "Recarga" in tipo:
-                colores.append("green")
-            else:
-                colores.append("gray")
+        tipo_counts = {role: len(sim.get_vertices_by_role(role)) for role in Role}
+        tipo_counts = {role: n for role, n in tipo_counts.items() if n}
+
+        etiquetas = [role.label for role in tipo_counts]
+        colores = [ROLE_COLORS[role] for role in tipo_counts]
 
         # Gráfico de pastel con proporción de tipos de nodo
         fig_pie, ax_pie = plt.subplots()
         ax_pie.pie(tipo_counts.values(), labels=etiquetas, autopct="%1.1f%%", colors=colores)
         ax_pie.axis("equal")
         st.pyplot(fig_pie)
+
+        # Distribución de órdenes (agrupaciones vectorizadas del almacén columnar)
+        store = sim.order_store
+        if store is not None and len(store):
+            st.subheader("📦 Órdenes por estado y costo")
+            col1, col2 = st.columns(2)
+            with col1:
+                por_estado = store.count_by("status")
+                interaccion_grafico("Órdenes por Estado", list(por_estado), list(por_estado.values()))
+            with col2:
+                conteos, bordes = store.histogram("cost", bins=10)
+                etiquetas = [f"{a:.0f}–{b:.0f}" for a, b in zip(bordes[:-1], bordes[1:])]
+                interaccion_grafico("Histograma de Costos", etiquetas, conteos.tolist())
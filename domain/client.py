@@ -1,5 +1,7 @@
 # Representa un cliente dentro del sistema logístico
 class Client:
+    __slots__ = ("id", "name", "vertex", "type", "total_orders")
+
     def __init__(self, client_id, name, vertex, client_type="normal"):
         """
         Representa un cliente en el sistema logístico.
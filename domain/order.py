@@ -1,33 +1,79 @@
-import uuid
+import time
 from datetime import datetime
+from itertools import count
 
 # Representa una orden de entrega en el sistema logístico
 class Order:
-    def __init__(self, order_id=None, client=None, origin=None, destination=None, path=None, cost=0.0, priority=1):
+    __slots__ = ("id", "client", "origin", "destination", "cost", "priority", "status",
+                 "_created", "_delivered", "_store", "_path")
+
+    _ids = count(1)  # Ids para órdenes creadas sin id explícito (fuera de una simulación)
+
+    def __init__(self, order_id=None, client=None, origin=None, destination=None, path=None, cost=0.0, priority=1,
+                 store=None):
         """
         Representa una orden de entrega.
 
-        - order_id: identificador único de la orden (UUID por defecto)
+        - order_id: identificador único de la orden (entero correlativo por defecto)
         - client: instancia de Client
         - origin: vértice de origen
         - destination: vértice de destino
         - path: lista de vértices que representa la ruta seguida
         - cost: costo total de la ruta (suma de pesos)
         - priority: prioridad de entrega (1 por defecto)
+        - store: PathStore compartido; si se indica, la ruta se guarda ahí (como ids) y
+          la orden solo recuerda su índice
         """
-        self.id = order_id or str(uuid.uuid4()) # ID único de la orden
+        self.id = order_id if order_id is not None else next(Order._ids) # ID único de la orden
         self.client = client                    # Cliente que solicitó la orden
         self.origin = origin                    # Nodo origen
         self.destination = destination          # Nodo destino
-        self.path = path                        # Ruta real, con nodos intermedios
         self.cost = cost                        # Costo de ruta
         self.priority = priority                # Prioridad de entrega
         self.status = "Pendiente"               # Estado Inicial
-        self.created_at = datetime.now()        # Fecha/hora de creación
-        self.delivered_at = None                # Fecha/hora de entrega
+        self._created = time.time()             # Fecha/hora de creación (timestamp)
+        self._delivered = None                  # Fecha/hora de entrega (timestamp)
+        self._store = store
+        self._path = store.append(path) if store is not None and path is not None else path  # Índice en store o lista
+
+    @property
+    def path(self):
+        """Ruta real, con nodos intermedios (lista de vértices)."""
+        if self._store is not None and self._path is not None:
+            return self._store.path(self._path)
+        return self._path
+
+    @property
+    def path_id(self):
+        """Índice de la ruta en el PathStore compartido (None si la orden guarda su propia lista)."""
+        return self._path if self._store is not None else None
+
+    @property
+    def path_length(self):
+        """Cantidad de nodos de la ruta, sin armar la lista."""
+        if self._store is not None and self._path is not None:
+            return self._store.length(self._path)
+        return len(self._path) if self._path is not None else 0
+
+    @property
+    def created_at(self):
+        return datetime.fromtimestamp(self._created)
+
+    @created_at.setter
+    def created_at(self, value):
+        self._created = value.timestamp()
+
+    @property
+    def delivered_at(self):
+        return datetime.fromtimestamp(self._delivered) if self._delivered is not None else None
+
+    @delivered_at.setter
+    def delivered_at(self, value):
+        self._delivered = value.timestamp() if value is not None else None
 
     def to_dict(self):
         """Devuelve una representación en formato diccionario (ideal para JSON o Streamlit)."""
+        delivered_at = self.delivered_at
         return {
             "id": self.id,
             "client_name": self.client.name,
@@ -38,7 +84,7 @@ class Order:
             "priority": self.priority,
             "status": self.status,
             "created_at": self.created_at.strftime("%Y-%m-%d %H:%M:%S"),
-            "delivered_at": self.delivered_at.strftime("%Y-%m-%d %H:%M:%S") if self.delivered_at else None
+            "delivered_at": delivered_at.strftime("%Y-%m-%d %H:%M:%S") if delivered_at else None
         }
 
     def __str__(self):
@@ -1,11 +1,14 @@
 # Representa una ruta tomada por el dron (lista de vértices)
 class Route:
-    def __init__(self, path):
+    def __init__(self, path, cost=0.0):
         """
         path: lista de vértices que representan el recorrido del dron.
+        cost: costo total del recorrido.
         """
         self.path = path # Lista ordenada de nodos recorridos
+        self.cost = cost # Costo total de la ruta
         self.freq = 1  # Frecuencia de uso de esta ruta
+        self.sort_key = tuple(str(v) for v in path)  # Clave de orden precalculada (por etiquetas)
 
     def increment(self):
         """Aumenta la frecuencia cuando se reutiliza la ruta."""
@@ -28,4 +31,4 @@ class Route:
 
     def __lt__(self, other):
         """Permite ordenar rutas lexicográficamente (por los nodos)."""
-        return tuple(str(v) for v in self.path) < tuple(str(v) for v in other.path)
+        return self.sort_key < other.sort_key
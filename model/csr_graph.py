@@ -0,0 +1,224 @@
+import numpy as np
+from .edge import Edge
+from . import shortest_paths
+
+# Representación compacta (CSR) e inmutable de un grafo
+class CSRGraph:
+    """Grafo congelado: vértices con ids enteros densos y adyacencia en arreglos CSR.
+
+    - offsets: arreglo de tamaño n+1; los vecinos del vértice i están en targets[offsets[i]:offsets[i+1]]
+    - targets: ids de los vecinos (ordenados dentro de cada fila)
+    - weights: peso de cada arista, alineado con targets (conserva el tipo de los pesos de
+      entrada: enteros siguen siendo enteros, así los costos no cambian de int a float)
+
+    Expone la misma API de solo lectura que Graph (vertices, edges, neighbors,
+    get_edge, degree, incident_edges, dijkstra_shortest_path, shortest_path). Construir con
+    Graph.freeze() o CSRGraph.from_graph(graph).
+    """
+    __slots__ = ('_directed', '_vertices', '_index',
+                 '_offsets', '_targets', '_weights',
+                 '_in_offsets', '_in_targets', '_in_weights')
+
+    def __init__(self, vertices, offsets, targets, weights, directed=False,
+                 in_offsets=None, in_targets=None, in_weights=None):
+        """No llamar directamente. Usa Graph.freeze() o CSRGraph.from_graph(graph)."""
+        self._directed = directed
+        self._vertices = list(vertices)                           # id -> Vertex
+        self._index = {v: i for i, v in enumerate(self._vertices)}  # Vertex -> id
+        self._offsets = offsets
+        self._targets = targets
+        self._weights = weights
+        if directed:
+            self._in_offsets = in_offsets
+            self._in_targets = in_targets
+            self._in_weights = in_weights
+        else:
+            # En grafos no dirigidos la adyacencia entrante es la misma
+            self._in_offsets = offsets
+            self._in_targets = targets
+            self._in_weights = weights
+
+    @classmethod
+    def from_graph(cls, graph):
+        """Congela un Graph mutable en su representación CSR."""
+        vertices = list(graph.vertices())
+        index = {v: i for i, v in enumerate(vertices)}
+        offsets, targets, weights = cls._build_rows(vertices, index, graph._outgoing)
+        if graph.is_directed():
+            in_offsets, in_targets, in_weights = cls._build_rows(vertices, index, graph._incoming)
+            return cls(vertices, offsets, targets, weights, True, in_offsets, in_targets, in_weights)
+        return cls(vertices, offsets, targets, weights, False)
+
+    @classmethod
+    def from_edges(cls, vertices, src, dst, weights, directed=False):
+        """Construye el grafo directamente desde arreglos de aristas (ids de 'vertices'),
+        sin pasar por un Graph mutable. Cada par debe aparecer una sola vez.
+        """
+        n = len(vertices)
+        src = np.asarray(src, dtype=np.int64)
+        dst = np.asarray(dst, dtype=np.int64)
+        weights = np.asarray(weights)
+        if directed:
+            offsets, targets, out_weights = cls._rows_from_arrays(n, src, dst, weights)
+            in_offsets, in_targets, in_weights = cls._rows_from_arrays(n, dst, src, weights)
+            return cls(vertices, offsets, targets, out_weights, True, in_offsets, in_targets, in_weights)
+        loops = src == dst
+        rows = np.concatenate([src, dst[~loops]])
+        cols = np.concatenate([dst, src[~loops]])
+        offsets, targets, out_weights = cls._rows_from_arrays(n, rows, cols, np.concatenate([weights, weights[~loops]]))
+        return cls(vertices, offsets, targets, out_weights, False)
+
+    @staticmethod
+    def _rows_from_arrays(n, rows, cols, weights):
+        # (offsets, targets, weights) con cada fila ordenada por vecino
+        order = np.argsort(rows * n + cols, kind="stable")
+        offsets = np.zeros(n + 1, dtype=np.int64)
+        np.cumsum(np.bincount(rows, minlength=n), out=offsets[1:])
+        return offsets, cols[order], weights[order]
+
+    @staticmethod
+    def _build_rows(vertices, index, adjacency):
+        # Construye (offsets, targets, weights) a partir de un mapa Vertex -> {Vertex: Edge}
+        offsets = np.zeros(len(vertices) + 1, dtype=np.int64)
+        targets = []
+        weights = []
+        for i, u in enumerate(vertices):
+            row = sorted((index[v], e.element()) for v, e in adjacency[u].items())
+            for j, w in row:
+                targets.append(j)
+                weights.append(w)
+            offsets[i + 1] = offsets[i] + len(row)
+        return (offsets,
+                np.asarray(targets, dtype=np.int64),
+                np.asarray(weights))
+
+    ### --- Acceso por id --- ###
+    def vertex_id(self, v):
+        """Devuelve el id entero denso del vértice v."""
+        return self._index[v]
+
+    def vertex(self, i):
+        """Devuelve el Vertex asociado al id i."""
+        return self._vertices[i]
+
+    def vertex_count(self):
+        return len(self._vertices)
+
+    def edge_count(self):
+        m = len(self._targets)
+        return m if self._directed else (m + self._self_loops()) // 2
+
+    def _self_loops(self):
+        rows = np.repeat(np.arange(len(self._vertices)), np.diff(self._offsets))
+        return int(np.count_nonzero(rows == self._targets))
+
+    def csr_arrays(self):
+        """Devuelve (offsets, targets, weights) de la adyacencia saliente."""
+        return self._offsets, self._targets, self._weights
+
+    def edge_arrays(self):
+        """Devuelve (src, dst, weights) con cada arista una sola vez."""
+        src = np.repeat(np.arange(len(self._vertices), dtype=np.int64), np.diff(self._offsets))
+        if self._directed:
+            return src, self._targets, self._weights
+        mask = src <= self._targets
+        return src[mask], self._targets[mask], self._weights[mask]
+
+    ### --- API compatible con Graph --- ###
+    def is_directed(self):
+        return self._directed
+
+    def vertices(self):
+        return self._vertices
+
+    def edges(self):
+        src, dst, weights = self.edge_arrays()
+        vertices = self._vertices
+        return [Edge(vertices[u], vertices[v], w)
+                for u, v, w in zip(src.tolist(), dst.tolist(), weights.tolist())]
+
+    def neighbors(self, v):
+        i = self._index[v]
+        vertices = self._vertices
+        return [vertices[j] for j in self._targets[self._offsets[i]:self._offsets[i + 1]].tolist()]
+
+    def get_edge(self, u, v):
+        i = self._index.get(u)
+        j = self._index.get(v)
+        if i is None or j is None:
+            return None
+        start, end = self._offsets[i], self._offsets[i + 1]
+        k = start + np.searchsorted(self._targets[start:end], j)
+        if k < end and self._targets[k] == j:
+            return Edge(u, v, self._weights[k].item())
+        return None
+
+    def degree(self, v, outgoing=True):
+        offsets = self._offsets if outgoing else self._in_offsets
+        i = self._index[v]
+        return int(offsets[i + 1] - offsets[i])
+
+    def incident_edges(self, v, outgoing=True):
+        if outgoing:
+            offsets, targets, weights = self._offsets, self._targets, self._weights
+        else:
+            offsets, targets, weights = self._in_offsets, self._in_targets, self._in_weights
+        i = self._index[v]
+        start, end = offsets[i], offsets[i + 1]
+        vertices = self._vertices
+        if outgoing:
+            return [Edge(v, vertices[j], w)
+                    for j, w in zip(targets[start:end].tolist(), weights[start:end].tolist())]
+        return [Edge(vertices[j], v, w)
+                for j, w in zip(targets[start:end].tolist(), weights[start:end].tolist())]
+
+    def dijkstra_shortest_path(self, start, end):
+        """Calcula el camino más corto de start a end usando Dijkstra sobre los arreglos CSR.
+        Devuelve (ruta, costo) o (None, inf) si no existe camino.
+        """
+        return self.shortest_path(start, end, method="dijkstra")
+
+    def _forward(self, i):
+        a, b = self._offsets[i], self._offsets[i + 1]
+        return zip(self._targets[a:b].tolist(), self._weights[a:b].tolist())
+
+    def _backward(self, i):
+        a, b = self._in_offsets[i], self._in_offsets[i + 1]
+        return zip(self._in_targets[a:b].tolist(), self._in_weights[a:b].tolist())
+
+    def shortest_path(self, start, end, method="bidirectional", heuristic=None):
+        """Camino más corto punto a punto sobre los ids: (ruta, costo) o (None, inf).
+        Mismos métodos que Graph.shortest_path ("dijkstra", "bidirectional", "astar").
+        """
+        s, t = self._index[start], self._index[end]
+        if method == "dijkstra":
+            ids, cost = shortest_paths.dijkstra(self._forward, s, t)
+        elif method == "bidirectional":
+            ids, cost = shortest_paths.bidirectional_dijkstra(self._forward, self._backward, s, t)
+        elif method == "astar":
+            if heuristic is None:
+                raise ValueError("A* requiere una heurística")
+            h = heuristic.bind(end) if hasattr(heuristic, "bind") else heuristic
+            vertices = self._vertices
+            ids, cost = shortest_paths.astar(self._forward, s, t, lambda i: h(vertices[i]))
+        else:
+            raise ValueError(f"Método de camino mínimo desconocido: {method}")
+        if ids is None:
+            return None, cost
+        return [self._vertices[i] for i in ids], cost
+
+    def dijkstra_nearest(self, start, predicate):
+        """Dijkstra multi-destino: se detiene al fijar el primer vértice que cumple predicate(v).
+        Devuelve (vertice, ruta, costo) o (None, None, inf) si ninguno es alcanzable.
+        """
+        vertices = self._vertices
+        i, ids, cost = shortest_paths.nearest(self._forward, self._index[start], lambda i: predicate(vertices[i]))
+        if i is None:
+            return None, None, cost
+        return vertices[i], [vertices[j] for j in ids], cost
+
+    def __len__(self):
+        return len(self._vertices)
+
+    def __repr__(self):
+        return f"CSRGraph(vertices={len(self._vertices)}, edges={self.edge_count()}, directed={self._directed})"
@@ -1,42 +1,68 @@
 from .vertex import Vertex
 from .edge import Edge
-import heapq
+from .csr_graph import CSRGraph
+from . import shortest_paths
 
 class Graph:
     def __init__(self, directed=False):
         self._outgoing = {}
         self._incoming = {} if directed else self._outgoing
         self._directed = directed
+        self._listeners = []  # Callbacks notificados ante cambios de topología
 
     def is_directed(self):
         return self._directed
 
+    def add_listener(self, callback):
+        """Registra callback(event, *args), llamado después de cada cambio de topología.
+        Eventos: ("insert_vertex", v), ("insert_edge", u, v, e), ("replace_edge", u, v, anterior, e)
+        (insert_edge sobre un par que ya tenía arista), ("remove_edge", u, v, e), ("remove_vertex", v).
+        """
+        self._listeners.append(callback)
+
+    def remove_listener(self, callback):
+        if callback in self._listeners:
+            self._listeners.remove(callback)
+
+    def _notify(self, event, *args):
+        for callback in self._listeners:
+            callback(event, *args)
+
     def insert_vertex(self, element):
         v = Vertex(element)
         self._outgoing[v] = {}
         if self._directed:
             self._incoming[v] = {}
+        self._notify("insert_vertex", v)
         return v
 
     def insert_edge(self, u, v, element):
+        old = self._outgoing[u].get(v)
         e = Edge(u, v, element)
         self._outgoing[u][v] = e
         self._incoming[v][u] = e
+        if old is None:
+            self._notify("insert_edge", u, v, e)
+        else:
+            self._notify("replace_edge", u, v, old, e)
         return e
 
     def remove_edge(self, u, v):
         if u in self._outgoing and v in self._outgoing[u]:
-            del self._outgoing[u][v]
+            e = self._outgoing[u].pop(v)
             del self._incoming[v][u]
+            self._notify("remove_edge", u, v, e)
 
     def remove_vertex(self, v):
         for u in list(self._outgoing.get(v, {})):
             self.remove_edge(v, u)
         for u in list(self._incoming.get(v, {})):
             self.remove_edge(u, v)
-        self._outgoing.pop(v, None)
+        existed = self._outgoing.pop(v, None) is not None
         if self._directed:
             self._incoming.pop(v, None)
+        if existed:
+            self._notify("remove_vertex", v)
 
     def get_edge(self, u, v):
         return self._outgoing.get(u, {}).get(v)
@@ -61,45 +87,42 @@ class Graph:
         adj = self._outgoing if outgoing else self._incoming
         return adj[v].values()
 
+    def freeze(self):
+        """Devuelve una copia compacta e inmutable (CSRGraph) con ids enteros y arreglos CSR."""
+        return CSRGraph.from_graph(self)
+
+    def _forward(self, v):
+        return ((u, e.element()) for u, e in self._outgoing[v].items())
+
+    def _backward(self, v):
+        return ((u, e.element()) for u, e in self._incoming[v].items())
+
     def dijkstra_shortest_path(self, start, end):
         """Calcula el camino más corto de start a end usando Dijkstra.
         Devuelve (ruta, costo) o (None, inf) si no existe camino.
         """
-        distances = {vertex: float('inf') for vertex in self.vertices()}
-        previous = {vertex: None for vertex in self.vertices()}
-        distances[start] = 0
-        visited = set()
-        heap = [(0, start)]
-
-        while heap:
-            current_distance, current_vertex = heapq.heappop(heap)
-            if current_vertex in visited:
-                continue
-            visited.add(current_vertex)
-
-            if current_vertex == end:
-                break
-
-            for neighbor in self.neighbors(current_vertex):
-                edge = self.get_edge(current_vertex, neighbor)
-                if edge is None:
-                    continue
-                weight = edge.element()
-                distance = current_distance + weight
-                if distance < distances[neighbor]:
-                    distances[neighbor] = distance
-                    previous[neighbor] = current_vertex
-                    heapq.heappush(heap, (distance, neighbor))
-
-        # Reconstruir ruta
-        path = []
-        current = end
-        if previous[current] is None and current != start:
-            return None, float('inf')  # no hay ruta
-
-        while current is not None:
-            path.append(current)
-            current = previous[current]
-        path.reverse()
-
-        return path, distances[end]
+        return shortest_paths.dijkstra(self._forward, start, end)
+
+    def shortest_path(self, start, end, method="bidirectional", heuristic=None):
+        """Camino más corto punto a punto: (ruta, costo) o (None, inf).
+
+        - method: "dijkstra", "bidirectional" o "astar"
+        - heuristic: para "astar", un EuclideanHeuristic / LandmarkHeuristic (se usa
+          heuristic.bind(end)) o directamente una función v -> cota inferior
+        """
+        if method == "dijkstra":
+            return shortest_paths.dijkstra(self._forward, start, end)
+        if method == "bidirectional":
+            return shortest_paths.bidirectional_dijkstra(self._forward, self._backward, start, end)
+        if method == "astar":
+            if heuristic is None:
+                raise ValueError("A* requiere una heurística")
+            h = heuristic.bind(end) if hasattr(heuristic, "bind") else heuristic
+            return shortest_paths.astar(self._forward, start, end, h)
+        raise ValueError(f"Método de camino mínimo desconocido: {method}")
+
+    def dijkstra_nearest(self, start, predicate):
+        """Dijkstra multi-destino: se detiene al fijar el primer vértice que cumple predicate(v).
+        Devuelve (vertice, ruta, costo) o (None, None, inf) si ninguno es alcanzable.
+        """
+        return shortest_paths.nearest(self._forward, start, predicate)
@@ -0,0 +1,290 @@
+"""Búsquedas de camino mínimo punto a punto.
+
+Las funciones reciben la adyacencia como funciones nodo -> iterable de (vecino, peso),
+así sirven tanto para Graph (nodos Vertex) como para CSRGraph (ids enteros). Todas
+guardan distancias y predecesores en diccionarios que se llenan a medida que se
+visitan nodos: una consulta solo paga por los nodos que toca, no O(V). Los nodos
+deben ser comparables (Vertex se ordena por etiqueta) para desempatar en el heap.
+
+- dijkstra: búsqueda unidireccional clásica
+- bidirectional_dijkstra: avanza desde ambos extremos y se detiene cuando los frentes
+  ya no pueden mejorar el mejor encuentro
+- astar: Dijkstra guiado por una cota inferior h(v) de la distancia restante
+- nearest: Dijkstra multi-destino que se detiene en el primer nodo que cumple un predicado
+
+Heurísticas para A* (ambas admisibles y consistentes):
+- EuclideanHeuristic: distancia en el plano por el menor costo por unidad de distancia
+- LandmarkHeuristic (ALT): desigualdad triangular con distancias precalculadas a landmarks
+"""
+import heapq
+import math
+import numpy as np
+
+INF = float('inf')
+UNREACHABLE = 1e300  # Distancia finita que representa "sin camino" en las filas de ALT
+
+
+def _unwind(previous, node):
+    # [origen, ..., node] siguiendo los predecesores
+    path = []
+    while node is not None:
+        path.append(node)
+        node = previous[node]
+    path.reverse()
+    return path
+
+
+### --- Búsquedas --- ###
+def dijkstra(forward, start, end):
+    """Dijkstra de start a end. Devuelve (ruta, costo) o (None, inf)."""
+    distances = {start: 0}
+    previous = {start: None}
+    done = set()
+    heap = [(0, start)]
+    while heap:
+        d, x = heapq.heappop(heap)
+        if x in done:
+            continue
+        if x == end:
+            return _unwind(previous, x), d
+        done.add(x)
+        for y, w in forward(x):
+            nd = d + w
+            if nd < distances.get(y, INF):
+                distances[y] = nd
+                previous[y] = x
+                heapq.heappush(heap, (nd, y))
+    return None, INF
+
+def bidirectional_dijkstra(forward, backward, start, end):
+    """Dijkstra simultáneo desde start (aristas salientes) y desde end (aristas entrantes).
+    Se expande siempre el frente de menor radio y se termina cuando la suma de ambos
+    radios alcanza el mejor camino encontrado. Devuelve (ruta, costo) o (None, inf).
+    """
+    if start == end:
+        return [start], 0
+    distances = ({start: 0}, {end: 0})
+    previous = ({start: None}, {end: None})
+    done = (set(), set())
+    heaps = ([(0, start)], [(0, end)])
+    expand = (forward, backward)
+    best, meeting = INF, None
+
+    while heaps[0] and heaps[1]:
+        if heaps[0][0][0] + heaps[1][0][0] >= best:
+            break
+        side = 0 if heaps[0][0][0] <= heaps[1][0][0] else 1
+        d, x = heapq.heappop(heaps[side])
+        if x in done[side]:
+            continue
+        done[side].add(x)
+        mine, other = distances[side], distances[1 - side]
+        for y, w in expand[side](x):
+            nd = d + w
+            if nd < mine.get(y, INF):
+                mine[y] = nd
+                previous[side][y] = x
+                heapq.heappush(heaps[side], (nd, y))
+            if y in other and nd + other[y] < best:
+                best, meeting = nd + other[y], y
+
+    if meeting is None:
+        return None, INF
+    # start -> ... -> encuentro (frente directo) + encuentro -> ... -> end (frente inverso)
+    path = _unwind(previous[0], meeting)
+    node = previous[1][meeting]
+    while node is not None:
+        path.append(node)
+        node = previous[1][node]
+    return path, best
+
+def astar(forward, start, end, h):
+    """A* de start a end con cota inferior h(v) de la distancia de v a end.
+    Con h admisible la ruta es óptima; si h no es consistente los nodos se reabren.
+    Devuelve (ruta, costo) o (None, inf).
+    """
+    g = {start: 0}
+    previous = {start: None}
+    heap = [(h(start), 0, start)]
+    while heap:
+        _, gx, x = heapq.heappop(heap)
+        if gx > g[x]:
+            continue  # Entrada vieja: x ya se alcanzó con menor costo
+        if x == end:
+            return _unwind(previous, x), gx
+        for y, w in forward(x):
+            ng = gx + w
+            if ng < g.get(y, INF):
+                g[y] = ng
+                previous[y] = x
+                heapq.heappush(heap, (ng + h(y), ng, y))
+    return None, INF
+
+def nearest(forward, start, predicate):
+    """Dijkstra desde start que se detiene al fijar el primer nodo x con predicate(x).
+    Devuelve (x, ruta, costo) o (None, None, inf) si ninguno es alcanzable.
+    """
+    distances = {start: 0}
+    previous = {start: None}
+    done = set()
+    heap = [(0, start)]
+    while heap:
+        d, x = heapq.heappop(heap)
+        if x in done:
+            continue
+        if predicate(x):
+            return x, _unwind(previous, x), d
+        done.add(x)
+        for y, w in forward(x):
+            nd = d + w
+            if nd < distances.get(y, INF):
+                distances[y] = nd
+                previous[y] = x
+                heapq.heappush(heap, (nd, y))
+    return None, None, INF
+
+
+### --- Heurísticas --- ###
+class EuclideanHeuristic:
+    def __init__(self, graph, positions, scale=None):
+        """
+        Cota h(v) = scale * |pos(v) - pos(destino)|.
+
+        - positions: vértice -> (x, y), por ejemplo las del generador espacial
+        - scale: costo mínimo por unidad de distancia; por defecto se calcula como el
+          menor peso/longitud entre las aristas del grafo, lo que garantiza que la cota
+          nunca supere el costo real (si las posiciones no se relacionan con los pesos,
+          la cota queda cerca de 0 y A* se comporta como Dijkstra)
+        """
+        self.graph = graph
+        self.positions = positions
+        self.scale = self._min_cost_per_unit() if scale is None else scale
+        self.valid = True
+        if hasattr(graph, "add_listener"):
+            graph.add_listener(self._on_graph_change)
+
+    def _on_graph_change(self, event, *args):
+        self.valid = False
+
+    def _min_cost_per_unit(self):
+        vertices = list(self.graph.vertices())
+        xy = np.array([self.positions[v] for v in vertices], dtype=np.float64).reshape(-1, 2)
+        if hasattr(self.graph, "edge_arrays"):
+            src, dst, weights = self.graph.edge_arrays()
+        else:
+            index = {v: i for i, v in enumerate(vertices)}
+            triples = [(index[e.endpoints()[0]], index[e.endpoints()[1]], e.element()) for e in self.graph.edges()]
+            src, dst, weights = (np.array(c, dtype=np.float64) for c in zip(*triples)) if triples else ([], [], [])
+        src = np.asarray(src, dtype=np.int64)
+        dst = np.asarray(dst, dtype=np.int64)
+        length = np.hypot(*(xy[src] - xy[dst]).T) if len(src) else np.empty(0)
+        ratio = np.asarray(weights, dtype=np.float64)[length > 0] / length[length > 0]
+        return float(ratio.min()) if len(ratio) else 0.0
+
+    def bind(self, target):
+        """Función v -> cota inferior de la distancia de v a target."""
+        tx, ty = self.positions[target]
+        positions, scale, hypot = self.positions, self.scale, math.hypot
+
+        def h(v):
+            x, y = positions[v]
+            return scale * hypot(x - tx, y - ty)
+        return h
+
+
+class LandmarkHeuristic:
+    def __init__(self, graph, landmarks=None, k=8, seed=None):
+        """
+        Heurística ALT: con d(L, ·) y d(·, L) precalculadas para cada landmark L,
+        d(v, t) >= max(d(L, t) - d(L, v), d(v, L) - d(t, L)).
+
+        - landmarks: vértices a usar; por defecto se eligen k por el método del más
+          lejano (cada uno maximiza la distancia a los ya elegidos), que tiende a
+          dejarlos en la periferia donde la cota es más ajustada
+        - seed: semilla para el primer landmark
+
+        El preprocesamiento son 1 o 2 Dijkstra completos por landmark sobre los
+        arreglos CSR del grafo.
+        """
+        from .csr_graph import CSRGraph
+        self.graph = graph
+        csr = graph if isinstance(graph, CSRGraph) else CSRGraph.from_graph(graph)
+        self.vertices = list(csr.vertices())
+        self.index = {v: i for i, v in enumerate(self.vertices)}
+        offsets, targets, weights = csr.csr_arrays()
+        self._forward = (offsets.tolist(), targets.tolist(), weights.tolist())
+        if csr.is_directed():
+            self._backward = (csr._in_offsets.tolist(), csr._in_targets.tolist(), csr._in_weights.tolist())
+        else:
+            self._backward = self._forward
+
+        if landmarks is None:
+            ids, rows = self._farthest_landmarks(k, np.random.default_rng(seed))
+        else:
+            ids = [self.index[v] for v in landmarks]
+            rows = [self._distances(self._forward, i) for i in ids]
+        self.landmarks = [self.vertices[i] for i in ids]
+        self.from_landmark = np.array(rows, dtype=np.float64).reshape(len(ids), -1)
+        self.to_landmark = (self.from_landmark if self._backward is self._forward else
+                            np.array([self._distances(self._backward, i) for i in ids]).reshape(len(ids), -1))
+        # Fila por vértice [d(L, v)..., -d(v, L)...] (n, 2k): la cota de v es un max sobre
+        # (fila del destino - fila de v), una sola resta vectorizada por evaluación.
+        # Los infinitos pasan a ±UNREACHABLE para que la resta nunca dé inf - inf
+        self._rows = np.nan_to_num(np.hstack([self.from_landmark.T, -self.to_landmark.T]),
+                                   posinf=UNREACHABLE, neginf=-UNREACHABLE)
+        self.valid = True
+        if hasattr(graph, "add_listener"):
+            graph.add_listener(self._on_graph_change)
+
+    def _on_graph_change(self, event, *args):
+        self.valid = False
+
+    def _distances(self, adjacency, source):
+        # Dijkstra completo desde el id source; inf para los no alcanzables
+        offsets, targets, weights = adjacency
+        distances = [INF] * (len(offsets) - 1)
+        distances[source] = 0
+        heap = [(0, source)]
+        while heap:
+            d, i = heapq.heappop(heap)
+            if d > distances[i]:
+                continue
+            for k in range(offsets[i], offsets[i + 1]):
+                nd = d + weights[k]
+                j = targets[k]
+                if nd < distances[j]:
+                    distances[j] = nd
+                    heapq.heappush(heap, (nd, j))
+        return distances
+
+    def _farthest_landmarks(self, k, rng):
+        # Devuelve (ids, distancias desde cada uno) reutilizando los Dijkstra de la selección
+        n = len(self.vertices)
+        if n == 0:
+            return [], []
+        chosen = [int(rng.integers(n))]
+        rows = [self._distances(self._forward, chosen[0])]
+        nearest = np.array(rows[0])
+        while len(chosen) < min(k, n):
+            nearest[chosen] = -1
+            # Los no alcanzables (inf) se eligen primero: así cada componente recibe un landmark
+            candidate = int(np.argmax(nearest))
+            if nearest[candidate] < 0:
+                break
+            chosen.append(candidate)
+            rows.append(self._distances(self._forward, candidate))
+            nearest = np.minimum(nearest, rows[-1])
+        return chosen, rows
+
+    def bind(self, target):
+        """Función v -> cota inferior de la distancia de v a target."""
+        t = self.index[target]
+        # [d(L, t)..., -d(t, L)...]; los landmarks que no conectan con t no acotan (-inf)
+        reference = np.concatenate([self.from_landmark[:, t], -self.to_landmark[:, t]])
+        reference[np.isinf(reference)] = -INF
+        rows, index = self._rows, self.index
+
+        def h(v):
+            bound = (reference - rows[index[v]]).max()
+            return float(bound) if bound > 0 else 0.0
+        return h
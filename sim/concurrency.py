@@ -0,0 +1,94 @@
+import asyncio
+import threading
+from contextlib import contextmanager, asynccontextmanager
+
+# Lock lectores/escritor: muchos lectores en paralelo, un escritor exclusivo
+class RWLock:
+    def __init__(self):
+        """
+        - read(): varios hilos pueden leer a la vez; espera solo si hay un escritor activo o esperando
+        - write(): acceso exclusivo; reentrante para el hilo que ya escribe (y puede leer dentro)
+        - read_async(): como read() para corrutinas (API): la espera ocurre en un hilo del
+          executor por defecto, así el event loop sigue atendiendo mientras hay un escritor.
+          read() y write() bloquean el hilo que llama: desde el event loop solo se toman
+          dentro de run_in_threadpool / run_in_executor
+
+        Se alternan fases: un escritor que espera bloquea a los lectores nuevos (el flujo
+        continuo de lecturas de la API no deja esperando al dashboard), pero los lectores que
+        ya esperaban entran apenas termina la escritura en curso, antes del siguiente escritor.
+        """
+        self._cond = threading.Condition(threading.Lock())
+        self._readers = 0
+        self._writer = None          # ident del hilo escritor actual
+        self._write_depth = 0
+        self._waiting_writers = 0
+        self._waiting_readers = 0
+        self._reader_phase = 0       # Lectores que deben entrar antes del próximo escritor
+
+    def _acquire_read(self):
+        # Devuelve True si el hilo ya es el escritor (lectura dentro de su escritura, sin contar)
+        me = threading.get_ident()
+        with self._cond:
+            if self._writer == me:
+                return True
+            self._waiting_readers += 1
+            while self._writer is not None or (self._waiting_writers and not self._reader_phase):
+                self._cond.wait()
+            self._waiting_readers -= 1
+            if self._reader_phase:
+                self._reader_phase -= 1
+            self._readers += 1
+            return False
+
+    def _release_read(self):
+        with self._cond:
+            self._readers -= 1
+            if not self._readers:
+                self._cond.notify_all()
+
+    @contextmanager
+    def read(self):
+        owner = self._acquire_read()
+        try:
+            yield
+        finally:
+            if not owner:
+                self._release_read()
+
+    @asynccontextmanager
+    async def read_async(self):
+        # Se adquiere en un hilo (nunca como escritor: no es reentrante con write())
+        future = asyncio.get_running_loop().run_in_executor(None, self._acquire_read)
+        try:
+            await asyncio.shield(future)
+        except asyncio.CancelledError:
+            # Cancelada mientras esperaba: el hilo igual obtiene el lock, que se suelta al llegar
+            future.add_done_callback(lambda f: f.cancelled() or f.exception() or self._release_read())
+            raise
+        try:
+            yield
+        finally:
+            self._release_read()
+
+    @contextmanager
+    def write(self):
+        me = threading.get_ident()
+        with self._cond:
+            if self._writer == me:
+                self._write_depth += 1
+            else:
+                self._waiting_writers += 1
+                while self._writer is not None or self._readers or self._reader_phase:
+                    self._cond.wait()
+                self._waiting_writers -= 1
+                self._writer = me
+                self._write_depth = 1
+        try:
+            yield
+        finally:
+            with self._cond:
+                self._write_depth -= 1
+                if not self._write_depth:
+                    self._writer = None
+                    self._reader_phase = self._waiting_readers
+                    self._cond.notify_all()
@@ -0,0 +1,423 @@
+"""Índice de jerarquías de contracción (CH) para caminos mínimos punto a punto.
+
+Preprocesamiento (una vez por red): los vértices se contraen de a uno, en orden de
+importancia creciente. Al contraer v, para cada par de vecinos u -> v -> w aún no
+contraídos se agrega el atajo u -> w (peso w(u,v) + w(v,w)) salvo que una búsqueda
+local encuentre un camino testigo igual o más corto que no pase por v. El orden de
+contracción es el rango de cada vértice.
+
+Consulta: Dijkstra bidireccional que solo sube de rango (hacia adelante desde el origen
+por arcos a vértices de mayor rango y hacia atrás desde el destino igual). Ambos frentes
+se encuentran en el vértice de mayor rango de la ruta y exploran unos cientos de nodos
+aun en redes de millones. Si la red no tiene jerarquía, la contracción se detiene en un
+núcleo denso que se recorre con un Dijkstra bidireccional común (ver core_degree).
+
+Cada atajo recuerda sus dos arcos hijos, así la ruta se despliega a la secuencia
+completa de vértices del grafo original (compatible con Simulation.compute_total_cost).
+Los pesos conservan el tipo de los del grafo: con pesos enteros los costos son enteros,
+igual que en Graph/CSRGraph.
+
+El índice se guarda como un directorio de .npy (ver sim.snapshot.write_arrays) y se
+abre con mmap: cargar un índice ya calculado no repite el preprocesamiento.
+"""
+import hashlib
+import heapq
+import json
+import math
+import os
+import numpy as np
+from model.csr_graph import CSRGraph
+from sim.snapshot import write_arrays, META_FILE
+
+FORMAT_VERSION = 1
+INF = float('inf')
+ARRAYS = ("rank", "arc_tail", "arc_head", "arc_weight", "arc_children",
+          "up_offsets", "up_heads", "up_weights", "up_arcs",
+          "down_offsets", "down_tails", "down_weights", "down_arcs")
+
+
+class ContractionHierarchy:
+    def __init__(self, graph, settle_limit=64, core_degree=16):
+        """
+        Construye el índice para 'graph' (Graph o CSRGraph). Es el paso costoso: hacerlo
+        fuera de línea y reutilizarlo con save() / load().
+
+        - settle_limit: nodos que puede fijar cada búsqueda de testigos; más alto agrega
+          menos atajos (consultas más rápidas) a cambio de un preprocesamiento más lento
+        - core_degree: si el grado medio (arcos por vértice) del grafo que queda sin
+          contraer supera este valor, la contracción se detiene y los vértices restantes
+          forman el núcleo (mismo rango, el más alto), que la consulta recorre como un
+          Dijkstra bidireccional común. Evita la explosión de atajos en redes sin jerarquía
+          (p. ej. el modelo "random"); en redes tipo calles ("geometric") no se alcanza
+
+        Los arcos (originales y atajos) se guardan en arreglos paralelos arc_*;
+        arc_children[a] son los dos arcos que reemplaza el atajo a ((-1, -1) si es original).
+        up_* es la adyacencia CSR de arcos hacia vértices de mayor rango (búsqueda desde
+        el origen) y down_* la de arcos que llegan desde vértices de mayor rango (búsqueda
+        desde el destino). Cualquier cambio de topología marca el índice como inválido.
+        """
+        self.graph = graph
+        self.settle_limit = settle_limit
+        self.core_degree = core_degree
+        self.vertices = list(graph.vertices())
+        self.index = {v: i for i, v in enumerate(self.vertices)}
+        self._set_arrays(self._contract(graph))
+        self.valid = True
+        if hasattr(graph, "add_listener"):
+            graph.add_listener(self._on_graph_change)
+
+    def _on_graph_change(self, event, *args):
+        self.valid = False
+
+    ### --- Preprocesamiento --- ###
+    def _contract(self, graph):
+        csr = graph if isinstance(graph, CSRGraph) else CSRGraph.from_graph(graph)
+        offsets, targets, weights = csr.csr_arrays()
+        n = len(self.vertices)
+        src = np.repeat(np.arange(n), np.diff(offsets))
+        keep = src != targets  # Los lazos no forman parte de ningún camino mínimo
+        # Arcos dirigidos (un grafo no dirigido aporta los dos sentidos de cada arista)
+        tail = src[keep].tolist()
+        head = targets[keep].tolist()
+        weight = weights[keep].tolist()
+        children = [-1] * (2 * len(tail))  # Pares (hijo1, hijo2) aplanados
+        alive = [True] * len(tail)
+
+        out = [{} for _ in range(n)]  # u -> {w: arco} entre vértices sin contraer
+        inn = [{} for _ in range(n)]  # w -> {u: arco}
+        for a, (u, w) in enumerate(zip(tail, head)):
+            out[u][w] = a
+            inn[w][u] = a
+
+        deleted = [0] * n  # Vecinos ya contraídos (reparte la contracción por el grafo)
+        remaining_arcs = len(tail)  # Arcos entre vértices sin contraer
+        rank = np.empty(n, dtype=np.int64)
+
+        def priority(v, shortcuts):
+            # Diferencia de aristas (pesa doble) + vecinos contraídos
+            return 2 * (len(shortcuts) - len(inn[v]) - len(out[v])) + deleted[v]
+
+        heap = []
+        for v in range(n):
+            heap.append((priority(v, self._shortcuts(v, out, inn, weight)), v))
+        heapq.heapify(heap)
+
+        order = 0
+        while heap:
+            _, v = heapq.heappop(heap)
+            shortcuts = self._shortcuts(v, out, inn, weight)
+            p = priority(v, shortcuts)
+            if heap and p > heap[0][0]:
+                heapq.heappush(heap, (p, v))  # Actualización perezosa: su prioridad empeoró
+                continue
+            if remaining_arcs > self.core_degree * (len(heap) + 1):
+                # Núcleo denso: el resto queda sin contraer, con el rango más alto
+                for _, u in heap:
+                    rank[u] = order
+                rank[v] = order
+                break
+
+            remaining_arcs -= len(inn[v]) + len(out[v])
+            for u, w, a_in, a_out in shortcuts:
+                cost = weight[a_in] + weight[a_out]
+                existing = out[u].get(w)
+                if existing is not None:
+                    if weight[existing] <= cost:
+                        continue
+                    alive[existing] = False  # Reemplazado por un atajo más corto
+                else:
+                    remaining_arcs += 1
+                a = len(tail)
+                tail.append(u)
+                head.append(w)
+                weight.append(cost)
+                children.extend((a_in, a_out))
+                alive.append(True)
+                out[u][w] = a
+                inn[w][u] = a
+
+            for u in inn[v]:
+                del out[u][v]
+                deleted[u] += 1
+            for w in out[v]:
+                del inn[w][v]
+                deleted[w] += 1
+            out[v] = inn[v] = None
+            rank[v] = order
+            order += 1
+
+        return {
+            "rank": rank,
+            "arc_tail": np.array(tail, dtype=np.int64),
+            "arc_head": np.array(head, dtype=np.int64),
+            "arc_weight": np.array(weight, dtype=weights.dtype),
+            "arc_children": np.array(children, dtype=np.int64).reshape(-1, 2),
+            "alive": np.array(alive, dtype=bool),
+        }
+
+    def _shortcuts(self, v, out, inn, weight):
+        # Atajos (u, w, arco u->v, arco v->w) necesarios si se contrae v ahora
+        outs = list(out[v].items())
+        if not outs:
+            return []
+        max_out = max(weight[a] for _, a in outs)
+        shortcuts = []
+        for u, a_in in inn[v].items():
+            w_in = weight[a_in]
+            targets = {w for w, _ in outs if w != u}
+            if not targets:
+                continue
+            distances = self._witness_search(u, v, w_in + max_out, targets, out, weight)
+            for w, a_out in outs:
+                if w != u and distances.get(w, INF) > w_in + weight[a_out]:
+                    shortcuts.append((u, w, a_in, a_out))
+        return shortcuts
+
+    def _witness_search(self, source, excluded, limit, targets, out, weight):
+        # Dijkstra local desde source sin pasar por 'excluded', hasta 'limit' o settle_limit nodos.
+        # Las distancias tentativas ya son caminos reales: sirven como testigos
+        distances = {source: 0}
+        heap = [(0, source)]
+        settled = 0
+        pending = len(targets)
+        while heap and settled < self.settle_limit:
+            d, x = heapq.heappop(heap)
+            if d > distances[x]:
+                continue
+            settled += 1
+            if x in targets:
+                pending -= 1
+                if pending == 0:
+                    break
+            for y, a in out[x].items():
+                if y == excluded:
+                    continue
+                nd = d + weight[a]
+                if nd <= limit and nd < distances.get(y, INF):
+                    distances[y] = nd
+                    heapq.heappush(heap, (nd, y))
+        return distances
+
+    def _set_arrays(self, arrays):
+        # Adyacencias CSR de la búsqueda ascendente a partir de los arcos vigentes
+        rank = arrays["rank"]
+        tail, head = arrays["arc_tail"], arrays["arc_head"]
+        alive = arrays.pop("alive")
+        ids = np.flatnonzero(alive)
+        rank_tail, rank_head = rank[tail[ids]], rank[head[ids]]
+        n = len(rank)
+        # Los arcos dentro del núcleo (mismo rango) se recorren desde ambos extremos
+        for prefix, owner, other, selected in (("up", tail, head, ids[rank_head >= rank_tail]),
+                                               ("down", head, tail, ids[rank_tail >= rank_head])):
+            selected = selected[np.argsort(owner[selected], kind="stable")]
+            arrays[f"{prefix}_offsets"] = np.concatenate(
+                [[0], np.cumsum(np.bincount(owner[selected], minlength=n))]).astype(np.int64)
+            arrays[f"{prefix}_{'heads' if prefix == 'up' else 'tails'}"] = other[selected]
+            arrays[f"{prefix}_weights"] = arrays["arc_weight"][selected]
+            arrays[f"{prefix}_arcs"] = selected.astype(np.int64)
+        self._load_arrays(arrays)
+
+    def _load_arrays(self, arrays):
+        for name in ARRAYS:
+            setattr(self, name, arrays[name])
+        # (offsets, vecinos, pesos, arcos) de cada sentido
+        self._up = (self.up_offsets, self.up_heads, self.up_weights, self.up_arcs)
+        self._down = (self.down_offsets, self.down_tails, self.down_weights, self.down_arcs)
+        # Rango compartido por los vértices del núcleo (None si la contracción fue completa)
+        top = int(self.rank.max()) if len(self.rank) else 0
+        self._core_rank = top if np.count_nonzero(self.rank == top) > 1 else None
+
+    def shortcut_count(self):
+        """Cantidad de atajos agregados por el preprocesamiento."""
+        return int(np.count_nonzero(self.arc_children[:, 0] >= 0))
+
+    ### --- Consultas --- ###
+    def distance(self, start, end, max_cost=INF):
+        """Costo del camino mínimo de start a end (inf si no hay camino), sin desplegar la ruta."""
+        return self._search(self.index[start], self.index[end], max_cost)[0]
+
+    def shortest_path(self, start, end, max_cost=INF):
+        """Camino mínimo de start a end: (ruta de vértices del grafo original, costo) o (None, inf).
+        Con max_cost ambos frentes se cortan en ese radio (mucho más barato cuando solo
+        interesan caminos cortos): si el camino mínimo cuesta más, devuelve (None, inf).
+        """
+        s, t = self.index[start], self.index[end]
+        cost, meeting, previous = self._search(s, t, max_cost)
+        if meeting == -1:
+            return None, INF
+        vertices = self.vertices
+        return [vertices[i] for i in self._unpack(s, meeting, previous)], cost
+
+    def _search(self, s, t, max_cost=INF):
+        # Devuelve (costo, vértice de encuentro, (previos hacia adelante, previos hacia atrás));
+        # encuentro -1 y costo inf si no hay camino de costo <= max_cost
+        if s == t:
+            return (0, s, ({s: -1}, {t: -1})) if max_cost >= 0 else (INF, -1, ({s: -1}, {t: -1}))
+        distances = ({s: 0}, {t: 0})
+        previous = ({s: -1}, {t: -1})  # nodo -> arco por el que se llegó
+        bound = math.nextafter(max_cost, INF)  # "Mejor encuentro" inicial: acepta costo == max_cost
+        best, meeting = self._upward_search(distances, previous, bound)
+        if self._core_rank is not None:
+            best, meeting = self._core_search(distances, previous, best, meeting)
+        return (best if meeting != -1 else INF), meeting, previous
+
+    def _upward_search(self, distances, previous, best):
+        # Dijkstra bidireccional ascendente con "stall-on-demand": un nodo no se expande si
+        # un vecino de mayor rango ya ofrece un camino más corto hasta él. Los vértices del
+        # núcleo quedan con su distancia pero no se expanden (ver _core_search)
+        graphs = (self._up, self._down)
+        rank, core = self.rank, self._core_rank
+        heaps = tuple([(0, next(iter(mine)))] for mine in distances)
+        meeting = -1
+
+        while True:
+            forward = heaps[0][0][0] if heaps[0] else INF
+            backward = heaps[1][0][0] if heaps[1] else INF
+            if min(forward, backward) >= best:
+                break  # Ningún frente puede mejorar el mejor encuentro (o ambos se agotaron)
+            side = 0 if forward <= backward else 1
+            d, x = heapq.heappop(heaps[side])
+            mine = distances[side]
+            if d > mine[x]:
+                continue
+            total = d + distances[1 - side].get(x, INF)
+            if total < best:
+                best, meeting = total, x
+            if core is not None and rank[x] == core:
+                continue
+
+            offsets, neighbors, weights, _ = graphs[1 - side]
+            a, b = offsets[x], offsets[x + 1]
+            if any(mine.get(y, INF) + w < d for y, w in zip(neighbors[a:b].tolist(), weights[a:b].tolist())):
+                continue
+
+            offsets, neighbors, weights, arcs = graphs[side]
+            a, b = offsets[x], offsets[x + 1]
+            predecessors, heap = previous[side], heaps[side]
+            for y, w, arc in zip(neighbors[a:b].tolist(), weights[a:b].tolist(), arcs[a:b].tolist()):
+                nd = d + w
+                if nd < mine.get(y, INF):
+                    mine[y] = nd
+                    predecessors[y] = arc
+                    heapq.heappush(heap, (nd, y))
+        return best, meeting
+
+    def _core_search(self, distances, previous, best, meeting):
+        # Dijkstra bidireccional común dentro del núcleo, desde los vértices del núcleo que
+        # alcanzó cada búsqueda ascendente (con esas distancias como punto de partida).
+        # Como ambos frentes recorren el mismo grafo, se corta cuando la suma de radios
+        # alcanza el mejor encuentro, en lugar de explorar el núcleo entero
+        graphs = (self._up, self._down)
+        rank, core = self.rank, self._core_rank
+        heaps = tuple([(d, x) for x, d in mine.items() if rank[x] == core] for mine in distances)
+        for heap in heaps:
+            heapq.heapify(heap)
+
+        while heaps[0] and heaps[1] and heaps[0][0][0] + heaps[1][0][0] < best:
+            side = 0 if heaps[0][0][0] <= heaps[1][0][0] else 1
+            d, x = heapq.heappop(heaps[side])
+            mine, other = distances[side], distances[1 - side]
+            if d > mine[x]:
+                continue
+            offsets, neighbors, weights, arcs = graphs[side]
+            a, b = offsets[x], offsets[x + 1]
+            predecessors, heap = previous[side], heaps[side]
+            for y, w, arc in zip(neighbors[a:b].tolist(), weights[a:b].tolist(), arcs[a:b].tolist()):
+                nd = d + w
+                if nd < mine.get(y, INF):
+                    mine[y] = nd
+                    predecessors[y] = arc
+                    heapq.heappush(heap, (nd, y))
+                    total = nd + other.get(y, INF)
+                    if total < best:
+                        best, meeting = total, y
+        return best, meeting
+
+    def _unpack(self, s, meeting, previous):
+        # Arcos origen -> encuentro -> destino, y cada atajo reemplazado por sus hijos
+        arcs = []
+        x = meeting
+        while previous[0][x] != -1:
+            arcs.append(previous[0][x])
+            x = int(self.arc_tail[arcs[-1]])
+        arcs.reverse()
+        x = meeting
+        while previous[1][x] != -1:
+            arcs.append(previous[1][x])
+            x = int(self.arc_head[arcs[-1]])
+
+        # Despliegue por niveles, vectorizado: cada pasada reemplaza todos los atajos por sus hijos
+        arcs = np.array(arcs, dtype=np.int64)
+        children = self.arc_children
+        while len(arcs):
+            first = children[arcs, 0]
+            shortcut = first >= 0
+            if not shortcut.any():
+                break
+            counts = 1 + shortcut
+            starts = np.cumsum(counts) - counts
+            expanded = np.empty(int(counts.sum()), dtype=np.int64)
+            expanded[starts] = np.where(shortcut, first, arcs)
+            expanded[starts[shortcut] + 1] = children[arcs[shortcut], 1]
+            arcs = expanded
+        return [s] + self.arc_head[arcs].tolist()
+
+    ### --- Persistencia --- ###
+    def save(self, directory):
+        """Guarda el índice en 'directory' (se reemplaza si ya existe) y devuelve la ruta."""
+        if not self.valid:
+            raise ValueError("El grafo cambió desde que se construyó el índice")
+        arrays = {name: getattr(self, name) for name in ARRAYS}
+        arrays["labels"] = np.array([str(v) for v in self.vertices], dtype=str)
+        meta = {
+            "version": FORMAT_VERSION,
+            "n_vertices": len(self.vertices),
+            "fingerprint": self.fingerprint(self.graph),
+            "directed": self.graph.is_directed(),
+            "settle_limit": self.settle_limit,
+            "core_degree": self.core_degree,
+        }
+        return write_arrays(directory, arrays, meta)
+
+    @classmethod
+    def load(cls, directory, graph, mmap=True):
+        """Abre un índice guardado con save() para 'graph', que debe ser la misma red
+        (mismas etiquetas en el mismo orden y misma huella de aristas); si no, ValueError.
+        """
+        with open(os.path.join(directory, META_FILE)) as f:
+            meta = json.load(f)
+        if meta.get("version") != FORMAT_VERSION:
+            raise ValueError(f"Versión de índice no soportada: {meta.get('version')}")
+        mode = "r" if mmap else None
+        arrays = {name: np.load(os.path.join(directory, f"{name}.npy"), mmap_mode=mode)
+                  for name in ARRAYS + ("labels",)}
+        vertices = list(graph.vertices())
+        if (meta["n_vertices"] != len(vertices) or meta["directed"] != graph.is_directed()
+                or arrays["labels"].tolist() != [str(v) for v in vertices]
+                or meta["fingerprint"] != cls.fingerprint(graph)):
+            raise ValueError("El índice guardado no corresponde a este grafo")
+
+        hierarchy = cls.__new__(cls)
+        hierarchy.graph = graph
+        hierarchy.settle_limit = meta["settle_limit"]
+        hierarchy.core_degree = meta["core_degree"]
+        hierarchy.vertices = vertices
+        hierarchy.index = {v: i for i, v in enumerate(vertices)}
+        hierarchy._load_arrays(arrays)
+        hierarchy.valid = True
+        if hasattr(graph, "add_listener"):
+            graph.add_listener(hierarchy._on_graph_change)
+        return hierarchy
+
+    @staticmethod
+    def fingerprint(graph):
+        """Huella (sha256) de la adyacencia CSR del grafo: cambia con cualquier arista o peso."""
+        csr = graph if isinstance(graph, CSRGraph) else CSRGraph.from_graph(graph)
+        digest = hashlib.sha256()
+        for array, dtype in zip(csr.csr_arrays(), (np.int64, np.int64, np.float64)):
+            digest.update(np.ascontiguousarray(array, dtype=dtype).tobytes())
+        return digest.hexdigest()
+
+    def __repr__(self):
+        return (f"ContractionHierarchy(vertices={len(self.vertices)}, arcs={len(self.arc_tail)}, "
+                f"shortcuts={self.shortcut_count()}, valid={self.valid})")
@@ -0,0 +1,157 @@
+import heapq
+import numpy as np
+
+
+def integer_weights(graph):
+    # True si todos los pesos del grafo son enteros (Graph o CSRGraph)
+    if hasattr(graph, "csr_arrays"):
+        return np.issubdtype(graph.csr_arrays()[2].dtype, np.integer)
+    return all(isinstance(e.element(), (int, np.integer)) for e in graph.edges())
+
+# Caché de distancias desde nodos fijos (almacenamiento y recarga) hacia todo el grafo
+class DistanceCache:
+    def __init__(self, graph, sources, path=None):
+        """
+        Ejecuta un Dijkstra completo por cada vértice de 'sources' y guarda los resultados.
+
+        - graph: Graph o CSRGraph
+        - sources: vértices origen (almacenamientos y recargas)
+        - path: prefijo de archivo opcional; si se indica, las matrices se guardan como
+          .npy mapeados en memoria (<path>_dist.npy y <path>_pred.npy)
+
+        distances[k, j] es la distancia desde sources[k] al vértice de id j y
+        predecessors[k, j] el id del vértice anterior en ese camino (-1 si no hay).
+        La matriz es float64 (inf = sin camino); las consultas devuelven los costos en el
+        tipo de los pesos del grafo (enteros si los pesos lo son, igual que Dijkstra).
+        Cualquier cambio de topología marca la caché como inválida; rebuild() la recalcula.
+        """
+        self.graph = graph
+        self.sources = list(sources)
+        self.filename = path
+        self.valid = False
+        self._recharge_trees = {}
+        self.rebuild()
+        if hasattr(graph, "add_listener"):
+            graph.add_listener(self._on_graph_change)
+
+    def _on_graph_change(self, event, *args):
+        self.valid = False
+        self._recharge_trees.clear()
+
+    ### --- Construcción --- ###
+    def rebuild(self):
+        """Recalcula las matrices de distancias y predecesores."""
+        self.vertices = list(self.graph.vertices())
+        self.index = {v: i for i, v in enumerate(self.vertices)}
+        self.sources = [v for v in self.sources if v in self.index]
+        self.rows = {v: k for k, v in enumerate(self.sources)}
+        self._cost_type = int if integer_weights(self.graph) else float
+        shape = (len(self.sources), len(self.vertices))
+
+        if self.filename:
+            self.distances = np.lib.format.open_memmap(f"{self.filename}_dist.npy", mode="w+", dtype=np.float64, shape=shape)
+            self.predecessors = np.lib.format.open_memmap(f"{self.filename}_pred.npy", mode="w+", dtype=np.int32, shape=shape)
+        else:
+            self.distances = np.empty(shape, dtype=np.float64)
+            self.predecessors = np.empty(shape, dtype=np.int32)
+
+        for k, source in enumerate(self.sources):
+            self._single_source(k, source)
+
+        if self.filename:
+            self.distances.flush()
+            self.predecessors.flush()
+        self._recharge_trees.clear()
+        self.valid = True
+
+    def _single_source(self, k, source):
+        # Dijkstra completo desde source, escribiendo en la fila k
+        distances = {source: 0}
+        previous = {source: None}
+        visited = set()
+        heap = [(0, self.index[source], source)]
+
+        while heap:
+            current_distance, _, current_vertex = heapq.heappop(heap)
+            if current_vertex in visited:
+                continue
+            visited.add(current_vertex)
+            for edge in self.graph.incident_edges(current_vertex):
+                neighbor = edge.opposite(current_vertex)
+                distance = current_distance + edge.element()
+                if distance < distances.get(neighbor, float('inf')):
+                    distances[neighbor] = distance
+                    previous[neighbor] = current_vertex
+                    heapq.heappush(heap, (distance, self.index[neighbor], neighbor))
+
+        dist_row = self.distances[k]
+        pred_row = self.predecessors[k]
+        dist_row[:] = np.inf
+        pred_row[:] = -1
+        for v, d in distances.items():
+            j = self.index[v]
+            dist_row[j] = d
+            prev = previous[v]
+            if prev is not None:
+                pred_row[j] = self.index[prev]
+
+    ### --- Consultas --- ###
+    def has_source(self, v):
+        return v in self.rows
+
+    def distance(self, source, target):
+        """Distancia cacheada entre source (debe ser un origen de la caché) y target."""
+        return self.to_cost(self.distances[self.rows[source], self.index[target]])
+
+    def to_cost(self, value):
+        """Valor de la matriz como costo en el tipo de los pesos del grafo (inf si no hay camino)."""
+        return self._cost_type(value) if np.isfinite(value) else float('inf')
+
+    def path(self, source, target):
+        """Reconstruye la ruta source -> target en O(largo de la ruta), o None."""
+        return self._path_row(self.rows[source], self.index[target])
+
+    def _path_row(self, k, j):
+        pred_row = self.predecessors[k]
+        if not np.isfinite(self.distances[k, j]):
+            return None
+        ids = [j]
+        while pred_row[ids[-1]] != -1:
+            ids.append(int(pred_row[ids[-1]]))
+        ids.reverse()
+        return [self.vertices[i] for i in ids]
+
+    def recharge_tree(self, origin, stations, autonomy):
+        """Dijkstra denso sobre estaciones desde origin (tramos <= autonomy).
+        Devuelve (best, parent) alineados con 'stations'; parent == -1 indica que se llega
+        directo desde origin. Se memoriza por (origin, autonomy).
+        """
+        key = (origin, autonomy)
+        tree = self._recharge_trees.get(key)
+        if tree is not None:
+            return tree
+
+        station_rows = np.array([self.rows[s] for s in stations], dtype=np.int64)
+        station_cols = np.array([self.index[s] for s in stations], dtype=np.int64)
+        legs = self.distances[np.ix_(station_rows, station_cols)]
+        legs = np.where(legs <= autonomy, legs, np.inf)
+
+        best = self.distances[self.rows[origin], station_cols].copy()
+        best[best > autonomy] = np.inf
+        parent = np.full(len(stations), -1, dtype=np.int64)
+        settled = np.zeros(len(stations), dtype=bool)
+
+        for _ in range(len(stations)):
+            pending = np.where(settled, np.inf, best)
+            r = int(np.argmin(pending))
+            if not np.isfinite(pending[r]):
+                break
+            settled[r] = True
+            candidate = best[r] + legs[r]
+            improve = (candidate < best) & ~settled
+            best[improve] = candidate[improve]
+            parent[improve] = r
+
+        tree = (best, parent)
+        self._recharge_trees[key] = tree
+        return tree
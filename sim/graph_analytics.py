@@ -0,0 +1,317 @@
+import heapq
+import numpy as np
+from model.csr_graph import CSRGraph
+
+### --- Union-find vectorizado (ids enteros) --- ###
+def compress(parent):
+    """Salto de punteros hasta que cada vértice apunte directo a su raíz (en el lugar)."""
+    while True:
+        grand = parent[parent]
+        if np.array_equal(grand, parent):
+            return parent
+        parent[:] = grand
+
+def connected_components(n, src, dst):
+    """Etiqueta cada vértice con la menor id de su componente (grafo tratado como no dirigido).
+
+    Cada ronda engancha la raíz mayor de cada arista que cruza componentes a la menor y
+    comprime; todo son operaciones sobre arreglos, O((V + E) log V) en el peor caso.
+    """
+    parent = np.arange(n, dtype=np.int64)
+    while True:
+        ru, rv = parent[src], parent[dst]
+        cross = ru != rv
+        if not cross.any():
+            return parent
+        lo = np.minimum(ru[cross], rv[cross])
+        hi = np.maximum(ru[cross], rv[cross])
+        np.minimum.at(parent, hi, lo)
+        compress(parent)
+
+
+### --- Árbol (bosque) de expansión mínima --- ###
+def boruvka_mst(n, src, dst, weights):
+    """Índices de las aristas del bosque de expansión mínima (Borůvka vectorizado).
+
+    En cada ronda toda componente elige su arista de salida más liviana (empates por
+    índice de arista, para un orden total) y se une a la otra punta. La cantidad de
+    componentes al menos se reduce a la mitad por ronda: O(E log V) con operaciones NumPy.
+    """
+    m = len(src)
+    order = np.lexsort((np.arange(m), weights))
+    rank = np.empty(m, dtype=np.int64)
+    rank[order] = np.arange(m)
+    parent = np.arange(n, dtype=np.int64)
+    selected = np.zeros(m, dtype=bool)
+    active = np.arange(m)
+
+    while True:
+        ru, rv = parent[src[active]], parent[dst[active]]
+        cross = ru != rv
+        active, ru, rv = active[cross], ru[cross], rv[cross]
+        if not active.size:
+            break
+
+        # Arista más liviana que sale de cada componente
+        best = np.full(n, m, dtype=np.int64)
+        r = rank[active]
+        np.minimum.at(best, ru, r)
+        np.minimum.at(best, rv, r)
+        roots = np.nonzero(best < m)[0]
+        chosen = order[best[roots]]
+        selected[chosen] = True
+
+        # Cada raíz apunta a la componente del otro extremo; en pares mutuos (misma arista
+        # elegida por ambos lados) queda como raíz la de menor id
+        a, b = parent[src[chosen]], parent[dst[chosen]]
+        other = np.where(a == roots, b, a)
+        parent[roots] = other
+        keep = (parent[other] == roots) & (roots < other)
+        parent[roots[keep]] = roots[keep]
+        compress(parent)
+
+    return np.nonzero(selected)[0]
+
+def kruskal_mst(n, src, dst, weights, batch=None):
+    """Índices de las aristas del bosque de expansión mínima (Kruskal por bloques).
+
+    Las aristas se recorren ordenadas por peso en bloques: con el union-find comprimido se
+    descartan de una vez (vectorizado) las que ya quedaron dentro de una componente y solo
+    las restantes se unen una por una.
+    """
+    m = len(src)
+    order = np.argsort(weights, kind="stable")
+    parent = np.arange(n, dtype=np.int64)
+    batch = batch or max(n, 1024)
+    selected = []
+    needed = n - 1
+
+    for start in range(0, m, batch):
+        idx = order[start:start + batch]
+        ru, rv = parent[src[idx]], parent[dst[idx]]
+        keep = ru != rv
+        merged = {}  # raíz -> nueva raíz dentro del bloque
+        rank = {}    # unión por rango dentro del bloque
+
+        def find(x):
+            while x in merged:
+                x = merged[x]
+            return x
+
+        for e, a, b in zip(idx[keep].tolist(), ru[keep].tolist(), rv[keep].tolist()):
+            a, b = find(a), find(b)
+            if a != b:
+                ra, rb = rank.get(a, 0), rank.get(b, 0)
+                if ra < rb:
+                    a, b = b, a
+                elif ra == rb:
+                    rank[a] = ra + 1
+                merged[b] = a
+                selected.append(e)
+        if merged:
+            keys = np.fromiter(merged, dtype=np.int64, count=len(merged))
+            parent[keys] = np.fromiter(merged.values(), dtype=np.int64, count=len(merged))
+            compress(parent)
+        if len(selected) >= needed:
+            break
+
+    return np.array(sorted(selected), dtype=np.int64)
+
+def prim_mst(n, src, dst, weights):
+    """Índices de las aristas del bosque de expansión mínima (Prim con heap sobre CSR)."""
+    offsets, adj_vertex, adj_edge = undirected_adjacency(n, src, dst)
+    offsets, adj_vertex, adj_edge = offsets.tolist(), adj_vertex.tolist(), adj_edge.tolist()
+    w = weights.tolist()
+    in_tree = [False] * n
+    selected = []
+
+    for root in range(n):
+        if in_tree[root]:
+            continue
+        in_tree[root] = True
+        heap = [(w[adj_edge[k]], adj_edge[k], adj_vertex[k]) for k in range(offsets[root], offsets[root + 1])]
+        heapq.heapify(heap)
+        while heap:
+            _, e, v = heapq.heappop(heap)
+            if in_tree[v]:
+                continue
+            in_tree[v] = True
+            selected.append(e)
+            for k in range(offsets[v], offsets[v + 1]):
+                if not in_tree[adj_vertex[k]]:
+                    heapq.heappush(heap, (w[adj_edge[k]], adj_edge[k], adj_vertex[k]))
+
+    return np.array(sorted(selected), dtype=np.int64)
+
+MST_METHODS = {"boruvka": boruvka_mst, "kruskal": kruskal_mst, "prim": prim_mst}
+
+
+### --- Puentes y puntos de articulación --- ###
+def undirected_adjacency(n, src, dst):
+    """CSR no dirigido: (offsets, vecino, índice de arista) con cada arista en ambos extremos."""
+    m = len(src)
+    ends = np.concatenate([src, dst])
+    others = np.concatenate([dst, src])
+    edge_ids = np.concatenate([np.arange(m), np.arange(m)])
+    order = np.argsort(ends, kind="stable")
+    offsets = np.zeros(n + 1, dtype=np.int64)
+    np.cumsum(np.bincount(ends, minlength=n), out=offsets[1:])
+    return offsets, others[order], edge_ids[order]
+
+def lowlink(n, src, dst, stations=None):
+    """DFS iterativo de Tarjan sobre el grafo no dirigido, en O(V + E).
+
+    Devuelve un dict con:
+    - bridges: máscara por arista (True si quitarla desconecta el grafo)
+    - articulation: máscara por vértice (True si quitarlo desconecta el grafo)
+    - parent_edge, size, stations: arista al padre en el árbol DFS (-1 en raíces),
+      tamaño del subárbol y estaciones en el subárbol (si se pasa la máscara 'stations')
+    - root: raíz DFS de la componente de cada vértice
+    """
+    offsets, adj_vertex, adj_edge = undirected_adjacency(n, src, dst)
+    offsets, adj_vertex, adj_edge = offsets.tolist(), adj_vertex.tolist(), adj_edge.tolist()
+    disc = [-1] * n
+    low = [0] * n
+    parent_edge = [-1] * n
+    root_of = [-1] * n
+    size = [1] * n
+    sub_stations = [int(s) for s in stations] if stations is not None else [0] * n
+    bridges = np.zeros(len(src), dtype=bool)
+    articulation = np.zeros(n, dtype=bool)
+    clock = 0
+
+    for root in range(n):
+        if disc[root] != -1:
+            continue
+        disc[root] = low[root] = clock
+        clock += 1
+        root_of[root] = root
+        children = 0
+        stack = [[root, offsets[root]]]
+        while stack:
+            frame = stack[-1]
+            v, k = frame
+            if k < offsets[v + 1]:
+                frame[1] = k + 1
+                w, e = adj_vertex[k], adj_edge[k]
+                if e == parent_edge[v]:
+                    continue
+                if disc[w] == -1:
+                    disc[w] = low[w] = clock
+                    clock += 1
+                    parent_edge[w] = e
+                    root_of[w] = root
+                    if v == root:
+                        children += 1
+                    stack.append([w, offsets[w]])
+                elif disc[w] < low[v]:
+                    low[v] = disc[w]
+            else:
+                stack.pop()
+                if stack:
+                    p = stack[-1][0]
+                    size[p] += size[v]
+                    sub_stations[p] += sub_stations[v]
+                    if low[v] < low[p]:
+                        low[p] = low[v]
+                    if low[v] > disc[p]:
+                        bridges[parent_edge[v]] = True
+                    if p != root and low[v] >= disc[p]:
+                        articulation[p] = True
+        if children > 1:
+            articulation[root] = True
+
+    return {
+        "bridges": bridges,
+        "articulation": articulation,
+        "parent_edge": np.array(parent_edge, dtype=np.int64),
+        "size": np.array(size, dtype=np.int64),
+        "stations": np.array(sub_stations, dtype=np.int64),
+        "root": np.array(root_of, dtype=np.int64),
+    }
+
+
+# Análisis de conectividad sobre un Graph o CSRGraph
+class GraphAnalytics:
+    def __init__(self, graph):
+        """
+        Trabaja sobre arreglos de aristas (src, dst, weights) con ids enteros en lugar de
+        objetos Edge. Un Graph mutable se congela una vez (O(V + E)); un CSRGraph se usa
+        directamente. Los grafos dirigidos se analizan como no dirigidos (cada par una vez,
+        con el menor peso).
+        """
+        csr = graph if isinstance(graph, CSRGraph) else CSRGraph.from_graph(graph)
+        self.vertices = csr.vertices()
+        self.index = {v: i for i, v in enumerate(self.vertices)}
+        self.n = len(self.vertices)
+        src, dst, weights = csr.edge_arrays()
+        if csr.is_directed() and len(src):
+            lo, hi = np.minimum(src, dst), np.maximum(src, dst)
+            order = np.lexsort((weights, hi, lo))
+            lo, hi, weights = lo[order], hi[order], weights[order]
+            first = np.ones(len(lo), dtype=bool)
+            first[1:] = (lo[1:] != lo[:-1]) | (hi[1:] != hi[:-1])
+            src, dst, weights = lo[first], hi[first], weights[first]
+        self.src, self.dst, self.weights = src, dst, weights
+        self._lowlink = None
+
+    def _edge_pairs(self, edge_ids):
+        vertices = self.vertices
+        return [(vertices[u], vertices[v]) for u, v in zip(self.src[edge_ids].tolist(), self.dst[edge_ids].tolist())]
+
+    def minimum_spanning_tree(self, method="boruvka"):
+        """Aristas (u, v) del bosque de expansión mínima: 'boruvka', 'kruskal' o 'prim'."""
+        if method not in MST_METHODS:
+            raise ValueError(f"Método de MST desconocido: {method}")
+        return self._edge_pairs(MST_METHODS[method](self.n, self.src, self.dst, self.weights))
+
+    def mst_weight(self, method="boruvka"):
+        return float(self.weights[MST_METHODS[method](self.n, self.src, self.dst, self.weights)].sum())
+
+    def connected_components(self):
+        """Lista de componentes conexas (cada una, lista de vértices), de mayor a menor."""
+        labels = connected_components(self.n, self.src, self.dst)
+        order = np.argsort(labels, kind="stable")
+        cuts = np.nonzero(np.diff(labels[order]))[0] + 1
+        groups = np.split(order, cuts) if self.n else []
+        components = [[self.vertices[i] for i in group.tolist()] for group in groups]
+        components.sort(key=len, reverse=True)
+        return components
+
+    def _analysis(self):
+        if self._lowlink is None:
+            self._lowlink = lowlink(self.n, self.src, self.dst)
+        return self._lowlink
+
+    def bridges(self):
+        """Aristas (u, v) cuya eliminación desconecta su componente."""
+        return self._edge_pairs(np.nonzero(self._analysis()["bridges"])[0])
+
+    def articulation_points(self):
+        """Vértices cuya eliminación desconecta su componente."""
+        return [self.vertices[i] for i in np.nonzero(self._analysis()["articulation"])[0].tolist()]
+
+    def critical_recharge_links(self, is_recharge):
+        """Puentes que dejan vértices sin ninguna estación de recarga alcanzable si se cortan.
+
+        Devuelve [(u, v, varados)] ordenado por cantidad de vértices varados (mayor primero).
+        """
+        stations = np.fromiter((bool(is_recharge(v)) for v in self.vertices), dtype=bool, count=self.n)
+        info = lowlink(self.n, self.src, self.dst, stations)
+        bridge_ids = np.nonzero(info["bridges"])[0]
+        # El hijo en el árbol DFS de cada puente es la punta cuyo parent_edge es el puente
+        children = np.full(len(self.src), -1, dtype=np.int64)
+        has_parent = info["parent_edge"] >= 0
+        children[info["parent_edge"][has_parent]] = np.nonzero(has_parent)[0]
+        child = children[bridge_ids]
+        root = info["root"][child]
+        below_size, below_st = info["size"][child], info["stations"][child]
+        total_size, total_st = info["size"][root], info["stations"][root]
+        # Varados: el lado del corte que se queda sin estaciones (si el otro lado tiene alguna)
+        stranded = np.where(below_st == 0, below_size, 0) + np.where(total_st - below_st == 0, total_size - below_size, 0)
+        stranded[total_st == 0] = 0
+        keep = stranded > 0
+        pairs = self._edge_pairs(bridge_ids[keep])
+        result = [(u, v, int(s)) for (u, v), s in zip(pairs, stranded[keep].tolist())]
+        result.sort(key=lambda item: -item[2])
+        return result
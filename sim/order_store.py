@@ -0,0 +1,181 @@
+from datetime import datetime
+import numpy as np
+
+STATUSES = ("Pendiente", "Entregado", "Cancelada")  # Código de estado = posición en esta tupla
+GROUP_KEYS = ("origin", "destination", "client", "status", "priority")
+
+# Columnas: nombre -> dtype
+COLUMNS = {
+    "order_id": np.int64,
+    "origin": np.int32,        # id de vértice (tabla de internado del PathStore)
+    "destination": np.int32,
+    "client": np.int32,        # índice en client_ids()
+    "cost": np.float64,
+    "priority": np.int16,
+    "status": np.int8,         # índice en STATUSES
+    "created_at": np.float64,  # timestamp
+    "delivered_at": np.float64,  # timestamp (NaN si no se entregó)
+    "path_offset": np.int64,   # inicio de la ruta en el búfer del PathStore
+    "path_length": np.int32,
+}
+
+
+# Almacén columnar de órdenes (opcional, ver Simulation.enable_order_store)
+class OrderStore:
+    def __init__(self, paths, capacity=1024):
+        """
+        Guarda una fila por orden en arreglos de NumPy, en el mismo orden que sim.orders.
+        Filtros, conteos, agrupaciones e histogramas se resuelven con operaciones
+        vectorizadas sobre las columnas en lugar de recorrer objetos Order.
+
+        - paths: PathStore de la simulación (ids de vértice compartidos con las rutas)
+        - capacity: filas reservadas al inicio; se duplica al llenarse
+        """
+        self.paths = paths
+        self._size = 0
+        self._data = {name: np.empty(capacity, dtype=dtype) for name, dtype in COLUMNS.items()}
+        self._client_ids = []      # índice -> client_id
+        self._client_index = {}    # client_id -> índice
+
+    ### --- Escritura --- ###
+    def append(self, order):
+        """Agrega la fila de una orden (con store=paths) y devuelve su índice."""
+        if self._size == len(self._data["order_id"]):
+            self._grow()
+        client = self._client_index.get(order.client.id)
+        if client is None:
+            client = self._client_index[order.client.id] = len(self._client_ids)
+            self._client_ids.append(order.client.id)
+        i = self._size
+        row = (order.id, self.paths.intern(order.origin), self.paths.intern(order.destination), client,
+               order.cost, order.priority, STATUSES.index(order.status), order.created_at.timestamp(),
+               order.delivered_at.timestamp() if order.delivered_at else np.nan,
+               self.paths._offsets[order.path_id], order.path_length)
+        for column, value in zip(self._data.values(), row):
+            column[i] = value
+        self._size += 1
+        return i
+
+    def set_status(self, order):
+        """Actualiza estado y fecha de entrega de la fila de 'order'."""
+        i = self.row(order.id)
+        self._data["status"][i] = STATUSES.index(order.status)
+        self._data["delivered_at"][i] = order.delivered_at.timestamp() if order.delivered_at else np.nan
+
+    def _grow(self):
+        for name, column in self._data.items():
+            grown = np.empty(max(2 * len(column), 1), dtype=column.dtype)
+            grown[:self._size] = column[:self._size]
+            self._data[name] = grown
+
+    ### --- Acceso --- ###
+    def __len__(self):
+        return self._size
+
+    def row(self, order_id):
+        """Fila de la orden (los ids de una simulación son crecientes: búsqueda binaria)."""
+        ids = self.column("order_id")
+        i = int(np.searchsorted(ids, order_id))
+        if i == len(ids) or ids[i] != order_id:
+            raise KeyError(order_id)
+        return i
+
+    def column(self, name):
+        """Vista (sin copia) de la columna 'name' con las filas actuales."""
+        return self._data[name][:self._size]
+
+    def columns(self):
+        return {name: self.column(name) for name in self._data}
+
+    def client_ids(self):
+        return self._client_ids
+
+    def labels(self, key):
+        """Etiquetas de los códigos de la columna 'key' (índice -> nombre)."""
+        if key in ("origin", "destination"):
+            return [str(v) for v in self.paths.vertices()]
+        if key == "client":
+            return self._client_ids
+        if key == "status":
+            return list(STATUSES)
+        return None
+
+    ### --- Consultas vectorizadas --- ###
+    def mask(self, status=None, client_id=None, destination=None, min_cost=None, max_cost=None):
+        """Máscara booleana de las filas que cumplen todos los filtros indicados."""
+        keep = np.ones(self._size, dtype=bool)
+        if status is not None:
+            keep &= self.column("status") == (STATUSES.index(status) if status in STATUSES else -1)
+        if client_id is not None:
+            keep &= self.column("client") == self._client_index.get(client_id, -1)
+        if destination is not None:
+            keep &= self.column("destination") == self._vertex_code(destination)
+        if min_cost is not None:
+            keep &= self.column("cost") >= min_cost
+        if max_cost is not None:
+            keep &= self.column("cost") <= max_cost
+        return keep
+
+    def _vertex_code(self, v):
+        # Id interno de un vértice (o de su etiqueta, O(1)); -1 si no aparece en ninguna orden
+        i = self.paths.vertex_id(v)
+        return -1 if i is None else i
+
+    def rows(self, **filters):
+        """Índices de fila (posiciones en sim.orders) que cumplen los filtros de mask()."""
+        return np.flatnonzero(self.mask(**filters))
+
+    def count_by(self, key, mask=None):
+        """Cantidad de órdenes por valor de 'key' ("origin", "destination", "client", "status", "priority")."""
+        return self.aggregate_by(key, None, mask)
+
+    def sum_by(self, key, column="cost", mask=None):
+        """Suma de 'column' por valor de 'key'."""
+        return self.aggregate_by(key, column, mask)
+
+    def aggregate_by(self, key, column=None, mask=None):
+        # Agrupación con bincount: O(filas) sin objetos Python por orden
+        if key not in GROUP_KEYS:
+            raise ValueError(f"Clave de agrupación desconocida: {key}")
+        codes = self.column(key)
+        weights = self.column(column) if column is not None else None
+        if mask is not None:
+            codes = codes[mask]
+            weights = weights[mask] if weights is not None else None
+        if len(codes) == 0:
+            return {}
+        offset = int(codes.min()) if key == "priority" else 0  # Prioridades: códigos desde el mínimo
+        codes = codes.astype(np.int64) - offset
+        counts = np.bincount(codes)
+        totals = np.bincount(codes, weights=weights) if weights is not None else counts
+        present = np.flatnonzero(counts)
+        names = self.labels(key)
+        return {(names[i] if names is not None else int(i) + offset): totals[i].item() for i in present}
+
+    def top_by(self, key, k=10, column=None, mask=None):
+        """Las k entradas con mayor conteo (o suma de 'column') por 'key': [(etiqueta, valor)]."""
+        totals = self.aggregate_by(key, column, mask)
+        return sorted(totals.items(), key=lambda item: item[1], reverse=True)[:k]
+
+    def histogram(self, column="cost", bins=10, mask=None):
+        """Histograma de una columna numérica: (conteos, bordes)."""
+        values = self.column(column)
+        if mask is not None:
+            values = values[mask]
+        return np.histogram(values, bins=bins)
+
+    def to_dataframe(self, decode=False):
+        """DataFrame de pandas sobre las columnas actuales, sin copiarlas. Los cambios de
+        estado posteriores se ven reflejados mientras el almacén no crezca.
+        Con decode=True los códigos pasan a categorías con etiquetas (los códigos se
+        reutilizan) y los timestamps a fechas.
+        """
+        import pandas as pd
+        data = self.columns()
+        if decode:
+            for key in ("origin", "destination", "client", "status"):
+                data[key] = pd.Categorical.from_codes(data[key], categories=self.labels(key))
+            local = datetime.now().astimezone().tzinfo  # Mismas fechas locales que Order.created_at
+            for key in ("created_at", "delivered_at"):
+                data[key] = pd.to_datetime(data[key], unit="s", utc=True).tz_convert(local).tz_localize(None)
+        return pd.DataFrame(data, copy=False)
@@ -0,0 +1,216 @@
+import heapq
+from itertools import count
+import numpy as np
+from sim.distance_cache import integer_weights
+
+# Índice de Voronoi de estaciones de recarga sobre el grafo
+class RechargeIndex:
+    def __init__(self, graph, is_station):
+        """
+        Precalcula, para cada vértice, su estación de recarga más cercana.
+
+        - graph: Graph (o CSRGraph) sobre el que se calculan las distancias
+        - is_station: función v -> bool que indica si v es una estación de recarga
+
+        Se ejecuta un único Dijkstra multi-origen desde todas las estaciones y se guarda
+        por vértice: estación más cercana, distancia y siguiente salto hacia ella.
+        Si el grafo admite listeners, el índice se actualiza de forma incremental ante
+        insert_edge, remove_edge y remove_vertex (sin recalcular todo).
+        """
+        self.graph = graph
+        self._is_station = is_station
+        self.station = {}   # v -> estación más cercana (None si no alcanza ninguna)
+        self.distance = {}  # v -> distancia a esa estación
+        self.next_hop = {}  # v -> siguiente vértice en el camino hacia la estación
+        self._children = {} # v -> vértices cuyo next_hop es v (árbol de caminos mínimos)
+        self._tie = count() # Desempate estable en el heap
+        self.rebuild()
+        if hasattr(graph, "add_listener"):
+            graph.add_listener(self._on_graph_change)
+
+    @classmethod
+    def from_arrays(cls, graph, is_station, station, distance, next_hop):
+        """Reconstruye el índice desde arreglos por id de vértice (ver to_arrays), sin
+        repetir el Dijkstra. station y next_hop usan -1 para None.
+        """
+        index = cls.__new__(cls)
+        index.graph = graph
+        index._is_station = is_station
+        index._tie = count()
+        vertices = list(graph.vertices())
+        stations = [vertices[i] if i >= 0 else None for i in np.asarray(station).tolist()]
+        hops = [vertices[i] if i >= 0 else None for i in np.asarray(next_hop).tolist()]
+        index.station = dict(zip(vertices, stations))
+        distances = np.asarray(distance).tolist()
+        if integer_weights(graph):
+            # Los arreglos guardan float64 (inf = sin estación); con pesos enteros vuelven a int
+            distances = [int(d) if d != float('inf') else d for d in distances]
+        index.distance = dict(zip(vertices, distances))
+        index.next_hop = dict(zip(vertices, hops))
+        index._children = {v: set() for v in vertices}
+        for v, hop in zip(vertices, hops):
+            if hop is not None:
+                index._children[hop].add(v)
+        if hasattr(graph, "add_listener"):
+            graph.add_listener(index._on_graph_change)
+        return index
+
+    def to_arrays(self, vertices):
+        """Devuelve (station, distance, next_hop) como arreglos alineados con 'vertices'."""
+        ids = {v: i for i, v in enumerate(vertices)}
+        ids[None] = -1
+        station = np.array([ids[self.station.get(v)] for v in vertices], dtype=np.int64)
+        distance = np.array([self.distance.get(v, float('inf')) for v in vertices], dtype=np.float64)
+        next_hop = np.array([ids[self.next_hop.get(v)] for v in vertices], dtype=np.int64)
+        return station, distance, next_hop
+
+    ### --- API pública --- ###
+    def rebuild(self):
+        """Recalcula el índice completo con un Dijkstra multi-origen."""
+        self.station.clear()
+        self.distance.clear()
+        self.next_hop.clear()
+        self._children.clear()
+        heap = []
+        for v in self.graph.vertices():
+            self._reset(v)
+            if self._is_station(v):
+                self._set(v, 0, v, None)
+                heapq.heappush(heap, (0, next(self._tie), v))
+        self._propagate(heap)
+
+    def nearest(self, v):
+        """Devuelve (estación, distancia) más cercana a v, o (None, inf)."""
+        return self.station.get(v), self.distance.get(v, float('inf'))
+
+    def path_to_station(self, v):
+        """Devuelve la ruta [v, ..., estación] siguiendo los siguientes saltos, o None."""
+        if self.station.get(v) is None:
+            return None
+        path = [v]
+        while self.next_hop[path[-1]] is not None:
+            path.append(self.next_hop[path[-1]])
+        return path
+
+    def add_station(self, v):
+        """Marca v como estación (por ejemplo tras cambiar su rol) y propaga la mejora."""
+        self._detach(v)
+        self._set(v, 0, v, None)
+        self._propagate([(0, next(self._tie), v)])
+
+    def remove_station(self, v):
+        """Quita v como estación y reubica los vértices que dependían de ella."""
+        self._invalidate(self._subtree(v))
+
+    ### --- Mantenimiento incremental --- ###
+    def _on_graph_change(self, event, *args):
+        if event == "insert_vertex":
+            v = args[0]
+            self._reset(v)
+            if self._is_station(v):
+                self._set(v, 0, v, None)
+        elif event == "insert_edge":
+            u, v, e = args
+            self._edge_inserted(u, v, e.element())
+        elif event == "replace_edge":
+            # Cambio de peso: los que usaban la arista se reubican y luego se prueba la nueva
+            u, v, _, e = args
+            self._edge_removed(u, v)
+            self._edge_inserted(u, v, e.element())
+        elif event == "remove_edge":
+            u, v, _ = args
+            self._edge_removed(u, v)
+        elif event == "remove_vertex":
+            v = args[0]
+            # Sus aristas ya fueron removidas (y notificadas); solo queda olvidar el vértice
+            for child in self._children.pop(v, ()):
+                self.next_hop[child] = None
+            self._detach(v)
+            self.station.pop(v, None)
+            self.distance.pop(v, None)
+            self.next_hop.pop(v, None)
+
+    def _edge_inserted(self, u, v, weight):
+        heap = []
+        self._try_improve(u, v, weight, heap)
+        if not self.graph.is_directed():
+            self._try_improve(v, u, weight, heap)
+        self._propagate(heap)
+
+    def _edge_removed(self, u, v):
+        affected = set()
+        if self.next_hop.get(u) is v:
+            affected |= self._subtree(u)
+        if not self.graph.is_directed() and self.next_hop.get(v) is u:
+            affected |= self._subtree(v)
+        if affected:
+            self._invalidate(affected)
+
+    def _reset(self, v):
+        self.station[v] = None
+        self.distance[v] = float('inf')
+        self.next_hop[v] = None
+        self._children.setdefault(v, set())
+
+    def _set(self, v, distance, station, hop):
+        self.distance[v] = distance
+        self.station[v] = station
+        self.next_hop[v] = hop
+        if hop is not None:
+            self._children.setdefault(hop, set()).add(v)
+
+    def _detach(self, v):
+        # Quita v de la lista de hijos de su siguiente salto actual
+        hop = self.next_hop.get(v)
+        if hop is not None:
+            self._children.get(hop, set()).discard(v)
+        self.next_hop[v] = None
+
+    def _try_improve(self, u, v, weight, heap):
+        # u puede llegar a una estación pasando por v (arista u -> v)
+        candidate = self.distance.get(v, float('inf')) + weight
+        if candidate < self.distance.get(u, float('inf')):
+            self._detach(u)
+            self._set(u, candidate, self.station[v], v)
+            heapq.heappush(heap, (candidate, next(self._tie), u))
+
+    def _propagate(self, heap):
+        # Dijkstra sobre aristas entrantes: quien llega a x puede seguir su camino a la estación
+        while heap:
+            dist, _, x = heapq.heappop(heap)
+            if dist > self.distance.get(x, float('inf')):
+                continue
+            for edge in self.graph.incident_edges(x, outgoing=False):
+                u = edge.opposite(x)
+                self._try_improve(u, x, edge.element(), heap)
+
+    def _subtree(self, root):
+        # Vértices cuyo camino a la estación pasa por root (incluido root)
+        result = {root}
+        stack = [root]
+        while stack:
+            for child in self._children.get(stack.pop(), ()):
+                if child not in result:
+                    result.add(child)
+                    stack.append(child)
+        return result
+
+    def _invalidate(self, affected):
+        # Reinicia los vértices afectados y los reconecta desde la frontera no afectada
+        for v in affected:
+            self._detach(v)
+        for v in affected:
+            self._reset(v)
+            if self._is_station(v):
+                self._set(v, 0, v, None)
+
+        heap = []
+        for v in affected:
+            if self.distance[v] == 0:
+                heapq.heappush(heap, (0, next(self._tie), v))
+                continue
+            for edge in self.graph.incident_edges(v):
+                y = edge.opposite(v)
+                if y not in affected:
+                    self._try_improve(v, y, edge.element(), heap)
+        self._propagate(heap)
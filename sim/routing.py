@@ -0,0 +1,211 @@
+import heapq
+from itertools import count
+import numpy as np
+
+def bounded_dijkstra(graph, source, limit):
+    """Dijkstra desde source que no expande más allá de 'limit'.
+    Devuelve (distances, previous) solo con los vértices alcanzables con costo <= limit.
+    """
+    distances = {source: 0}
+    previous = {source: None}
+    visited = set()
+    heap = [(0, 0, source)]
+    tie = count(1)
+
+    while heap:
+        current_distance, _, current_vertex = heapq.heappop(heap)
+        if current_vertex in visited:
+            continue
+        visited.add(current_vertex)
+
+        for edge in graph.incident_edges(current_vertex):
+            neighbor = edge.opposite(current_vertex)
+            distance = current_distance + edge.element()
+            if distance <= limit and distance < distances.get(neighbor, float('inf')):
+                distances[neighbor] = distance
+                previous[neighbor] = current_vertex
+                heapq.heappush(heap, (distance, next(tie), neighbor))
+
+    return distances, previous
+
+
+def unpack_leg(previous, target):
+    """Reconstruye la ruta [origen, ..., target] a partir del árbol de predecesores."""
+    path = []
+    current = target
+    while current is not None:
+        path.append(current)
+        current = previous[current]
+    path.reverse()
+    return path
+
+
+# Motor de rutas con restricción de autonomía (recargas en estaciones)
+class EnergyAwareRouter:
+    def __init__(self, graph, is_recharge, autonomy, recharge_index=None):
+        """
+        Calcula la ruta óptima considerando autonomía en una sola búsqueda.
+
+        - graph: Graph o CSRGraph
+        - is_recharge: función v -> bool para estaciones de recarga
+        - autonomy: distancia máxima entre recargas
+        - recharge_index: RechargeIndex opcional: descarta sin buscar los pares sin recarga
+          alcanzable (ver route) y da el tramo origen -> recarga más cercana. El resto de los
+          tramos sale de búsquedas acotadas: la primera parada óptima no siempre es la recarga
+          más cercana, así que el índice no puede reemplazar la búsqueda desde el origen
+        - Con use_contraction_hierarchy() el caso sin recarga (la ruta directa cabe en la
+          autonomía) se resuelve con una consulta al índice CH acotada a la autonomía
+
+        Se trabaja sobre un grafo reducido {origen, estaciones, destino}: existe un tramo
+        x -> y si el camino mínimo entre ambos cabe en la autonomía. Como el dron recarga
+        por completo en cada estación, el camino mínimo en ese grafo reducido (desplegando
+        cada tramo) es la ruta óptima con recargas.
+        """
+        self.graph = graph
+        self.is_recharge = is_recharge
+        self.autonomy = autonomy
+        self.recharge_index = recharge_index
+        self._legs = {}  # estación -> (distances, previous) acotados por la autonomía
+        self.distance_cache = None  # DistanceCache opcional (ver use_distance_cache)
+        self._cached_stations = None
+        self.contraction_hierarchy = None  # ContractionHierarchy opcional (ver use_contraction_hierarchy)
+        if hasattr(graph, "add_listener"):
+            graph.add_listener(self._on_graph_change)
+
+    def _on_graph_change(self, event, *args):
+        # Cualquier cambio de topología invalida los tramos entre estaciones
+        self._legs.clear()
+
+    def invalidate(self):
+        """Descarta los tramos cacheados (por ejemplo tras cambiar roles)."""
+        self._legs.clear()
+
+    def use_distance_cache(self, cache):
+        """Activa (o desactiva con None) la caché de distancias para orígenes cacheados."""
+        self.distance_cache = cache
+        self._cached_stations = None
+
+    def use_contraction_hierarchy(self, hierarchy):
+        """Activa (o desactiva con None) el índice CH para rutas que no necesitan recargar."""
+        self.contraction_hierarchy = hierarchy
+
+    def legs_from(self, vertex):
+        """Devuelve (distances, previous) acotados desde una estación (cacheado)."""
+        legs = self._legs.get(vertex)
+        if legs is None:
+            legs = bounded_dijkstra(self.graph, vertex, self.autonomy)
+            self._legs[vertex] = legs
+        return legs
+
+    def route(self, origin, destination):
+        """Devuelve (ruta, costo) óptimos respetando la autonomía, o (None, None)."""
+        if origin is destination:
+            return [origin], 0
+
+        cache = self.distance_cache
+        if cache is not None:
+            if not cache.valid:
+                cache.rebuild()
+                self._cached_stations = None
+            if cache.has_source(origin) and destination in cache.index:
+                return self._route_cached(cache, origin, destination)
+
+        hierarchy = self.contraction_hierarchy
+        if hierarchy is not None and hierarchy.valid:
+            # Consulta acotada a la autonomía: si el camino mínimo cabe, es la ruta óptima
+            path, cost = hierarchy.shortest_path(origin, destination, max_cost=self.autonomy)
+            if path is not None:
+                return path, cost
+
+        origin_legs = bounded_dijkstra(self.graph, origin, self.autonomy)
+        if destination in origin_legs[0]:
+            # Alcanza sin recargar: el camino mínimo es directamente la ruta óptima
+            return unpack_leg(origin_legs[1], destination), origin_legs[0][destination]
+
+        index = self.recharge_index
+        if index is not None:
+            # El índice de recarga responde sin buscar los casos imposibles: si la recarga más
+            # cercana al origen no está al alcance, o (grafo no dirigido, d(s, destino) = d(destino, s))
+            # si ninguna estación llega al destino con la autonomía, no hay ruta con recargas
+            if index.distance.get(origin, float('inf')) > self.autonomy:
+                return None, None
+            if not self.graph.is_directed() and index.distance.get(destination, float('inf')) > self.autonomy:
+                return None, None
+
+        # Dijkstra sobre el grafo reducido de estaciones
+        best = {origin: 0}
+        parent = {origin: None}
+        settled = set()
+        tie = count(1)
+        heap = [(0, 0, origin)]
+
+        while heap:
+            cost, _, node = heapq.heappop(heap)
+            if node in settled:
+                continue
+            settled.add(node)
+            if node is destination:
+                break
+
+            distances, _ = origin_legs if node is origin else self.legs_from(node)
+            for target, leg_cost in distances.items():
+                if target is node or not (target is destination or self.is_recharge(target)):
+                    continue
+                candidate = cost + leg_cost
+                if candidate < best.get(target, float('inf')):
+                    best[target] = candidate
+                    parent[target] = node
+                    heapq.heappush(heap, (candidate, next(tie), target))
+
+        if destination not in settled:
+            return None, None
+
+        # Desplegar los tramos: origen -> recarga -> ... -> destino
+        stops = []
+        node = destination
+        while node is not None:
+            stops.append(node)
+            node = parent[node]
+        stops.reverse()
+
+        path = [origin]
+        for a, b in zip(stops[:-1], stops[1:]):
+            if a is origin and index is not None and index.station.get(origin) is b:
+                path.extend(index.path_to_station(origin)[1:])  # Tramo a la recarga más cercana: saltos del índice
+                continue
+            previous = origin_legs[1] if a is origin else self.legs_from(a)[1]
+            path.extend(unpack_leg(previous, b)[1:])
+        return path, best[destination]
+
+    def _route_cached(self, cache, origin, destination):
+        # Ruta usando las matrices precalculadas: O(R) vectorizado + O(largo de la ruta)
+        direct = cache.distance(origin, destination)
+        if direct <= self.autonomy:
+            return cache.path(origin, destination), direct
+
+        if self._cached_stations is None:
+            self._cached_stations = [s for s in cache.sources if self.is_recharge(s)]
+        stations = self._cached_stations
+        if not stations:
+            return None, None
+
+        best, parent = cache.recharge_tree(origin, stations, self.autonomy)
+        station_rows = [cache.rows[s] for s in stations]
+        last_leg = cache.distances[station_rows, cache.index[destination]]
+        total = best + np.where(last_leg <= self.autonomy, last_leg, np.inf)
+        r = int(np.argmin(total))
+        if not np.isfinite(total[r]):
+            return None, None
+
+        # Cadena de estaciones: origin -> ... -> stations[r]
+        chain = []
+        while r != -1:
+            chain.append(stations[r])
+            r = int(parent[r])
+        chain.reverse()
+
+        stops = [origin] + chain + [destination]
+        path = [origin]
+        for a, b in zip(stops[:-1], stops[1:]):
+            path.extend(cache.path(a, b)[1:])
+        return path, cache.to_cost(total.min())
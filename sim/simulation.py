@@ -1,103 +1,352 @@
-import random
-from sim.simulation_initializer import SimulationInitializer
+import os
+import time
+import uuid
+from collections import Counter, defaultdict
+from datetime import datetime
+from concurrent.futures import ProcessPoolExecutor
+import numpy as np
+from model.csr_graph import CSRGraph
+from model.shortest_paths import EuclideanHeuristic, LandmarkHeuristic
+from sim.simulation_initializer import SimulationInitializer, Role, ROLE_KINDS
+from sim.recharge_index import RechargeIndex
+from sim.routing import EnergyAwareRouter
+from sim.distance_cache import DistanceCache
+from sim.contraction_hierarchy import ContractionHierarchy
+from sim.graph_analytics import GraphAnalytics
+from sim.order_store import OrderStore
+from sim.stats import OrderStats
+from sim.concurrency import RWLock
 from domain.client import Client
 from domain.order import Order
+from domain.route import Route
+from tda.avl import AVLTree
+from tda.ranking import RouteRanking
+from tda.path_store import PathStore
 
 AUTONOMY_LIMIT = 50  # Máxima distancia que un dron puede recorrer sin recarga
 
 class Simulation:
-    def __init__(self, n_nodes=15, m_edges=20):
-        self.initializer = SimulationInitializer(n_nodes, m_edges)
-        self.graph, self.vertex_roles = self.initializer.generate_graph()
+    def __init__(self, n_nodes=15, m_edges=20, model="random", frozen=False, seed=None):
+        # model: "random", "geometric" o "grid"; frozen=True genera directamente un CSRGraph
+        # seed: entero o np.random.Generator; con la misma semilla la corrida es reproducible
+        self.rng = np.random.default_rng(seed)  # Único generador: grafo, roles, órdenes y coordenadas
+        self.initializer = SimulationInitializer(n_nodes, m_edges, model=model, seed=self.rng)
+        self.graph, self.vertex_roles = self.initializer.generate_graph(frozen=frozen)
+        self._init_state()
+
+    def _init_state(self, recharge_index=None):
+        # Estado derivado del grafo y los roles (órdenes, índices, rutas, estadísticas).
+        # recharge_index: índice ya calculado (p. ej. leído de un snapshot) para no recalcularlo
         self.orders = []
-        self.route_log = []
+        self.paths = PathStore()  # Rutas de todas las órdenes en un búfer compartido (route_log es una vista)
+        self._next_order_id = 1   # Ids de orden correlativos por simulación
         self.clients = {}
+        self._client_list = []    # Clientes en orden de registro (paginación por posición)
+        # Índices de órdenes (consistentes ante creación, cancelación y entrega)
+        self._orders_by_id = {}
+        self._orders_by_status = defaultdict(dict)       # estado -> {id: orden}
+        self._orders_by_client = defaultdict(list)       # client_id -> [ordenes]
+        self._orders_by_destination = defaultdict(list)  # str(destino) -> [ordenes]
+        self.route_tree = AVLTree()          # Rutas únicas (orden por etiquetas) con su frecuencia
+        self.route_ranking = RouteRanking()  # Rutas ordenadas por (frecuencia, costo)
+        # Visitas por tipo de nodo, actualizadas al crear/cancelar órdenes (no se recorre route_log)
+        self.visit_counts = {kind: Counter() for kind in ROLE_KINDS}
+        self._visit_counters = [self.visit_counts[role.kind] for role in Role]  # Role -> contador
+        self.lock = RWLock()  # Lectores (API) en paralelo; escrituras exclusivas
+        self.version = 0      # Aumenta con cada cambio de órdenes (caché de reportes, snapshots)
+        self.uid = uuid.uuid4().hex  # Identifica la simulación (junto a version forma la clave de caché)
+        self.stats = OrderStats()  # Agregados de costo/largo/latencia para el resumen O(1)
+        # Roles precalculados por el inicializador: vértice -> Role y vértices de cada rol
+        self.role_of = self.initializer.vertex_role
+        self._role_vertices = {role: self.initializer.vertices_with_role(role) for role in Role}
+        if hasattr(self.graph, "add_listener"):
+            self.graph.add_listener(self._on_graph_change)  # Mantiene los roles ante remove_vertex
+        # Índice de recarga más cercana (se mantiene solo ante cambios del grafo)
+        self.recharge_index = recharge_index or RechargeIndex(self.graph, self.is_recharge)
+        # Motor de rutas con autonomía: ruta óptima con recargas en una sola búsqueda
+        self.router = EnergyAwareRouter(self.graph, self.is_recharge, AUTONOMY_LIMIT, self.recharge_index)
+        self.distance_cache = None  # Opcional: ver enable_distance_cache()
+        self.contraction_hierarchy = None  # Opcional: ver enable_contraction_hierarchy()
+        self.order_store = None     # Opcional: ver enable_order_store()
+        self.path_heuristics = {}   # Heurísticas de A* por tipo (se construyen en la primera consulta)
+        self.layout_seed = int(self.rng.integers(2**63))  # Coordenadas del mapa (ver get_coordinates)
+
+    def _on_graph_change(self, event, *args):
+        # Un vértice quitado del grafo pierde su rol: deja de sortearse en órdenes y de
+        # contarse en get_node_distribution (las órdenes que ya lo usaron no cambian)
+        if event == "remove_vertex":
+            v = args[0]
+            role, pos = self.initializer.remove_vertex_role(v)
+            if role is not None:
+                del self._role_vertices[role][pos]
+
+    @property
+    def route_log(self):
+        """Rutas de las órdenes en orden de creación (vista de solo lectura sobre self.paths)."""
+        return self.paths
+
+    def __getstate__(self):
+        # El lock no se puede serializar: la copia (p. ej. enviada a otro proceso) crea uno propio
+        state = self.__dict__.copy()
+        del state["lock"]
+        return state
+
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+        self.lock = RWLock()
 
     def generate_order(self):
-        origins = [v for v in self.graph.vertices() if "Almacenamiento" in self.vertex_roles[v]]
-        destinations = [v for v in self.graph.vertices() if "Cliente" in self.vertex_roles[v]]
+        origins = self._role_vertices[Role.STORAGE]
+        destinations = self._role_vertices[Role.CLIENT]
 
         if not origins or not destinations:
             return None
 
-        origin = random.choice(origins)
-        destination = random.choice(destinations)
+        origin = origins[self.rng.integers(len(origins))]
+        destination = destinations[self.rng.integers(len(destinations))]
 
+        start = time.perf_counter()
         adjusted_path, adjusted_cost = self.find_route(origin, destination)
+        latency = time.perf_counter() - start
         if not adjusted_path:
             return None
 
-        client_id = str(destination)
-        if client_id not in self.clients:
-            self.clients[client_id] = Client(client_id, f"Cliente {client_id}", destination)
-        client = self.clients[client_id]
-        client.register_order()
-
-        order = Order(
-            client=client,
-            origin=origin,
-            destination=destination,
-            path=adjusted_path,
-            cost=adjusted_cost
-        )
+        return self._register_order(origin, destination, adjusted_path, adjusted_cost, latency)
+
+    def generate_orders(self, n, workers=None, seed=None):
+        """Genera n órdenes en lote y devuelve la lista de órdenes creadas.
+
+        - workers: procesos para calcular rutas en paralelo (None o 1 = en serie)
+        - seed: semilla propia para muestrear los pares (origen, destino); por defecto se usa
+          el generador de la simulación
+
+        Los pares se muestrean al inicio; las rutas se calculan (en paralelo si se pide)
+        sobre una copia de solo lectura del grafo y las órdenes se registran en el orden
+        del muestreo, por lo que el resultado es determinista para una misma semilla.
+        """
+        origins = self._role_vertices[Role.STORAGE]
+        destinations = self._role_vertices[Role.CLIENT]
+        if not origins or not destinations:
+            return []
+
+        rng = np.random.default_rng(seed) if seed is not None else self.rng
+        pairs = list(zip([origins[i] for i in rng.integers(len(origins), size=n).tolist()],
+                         [destinations[i] for i in rng.integers(len(destinations), size=n).tolist()]))
+
+        if workers and workers > 1 and n > 1:
+            routes = self._find_routes_parallel(pairs, workers)
+        else:
+            routes = []
+            for origin, destination in pairs:
+                start = time.perf_counter()
+                path, cost = self.find_route(origin, destination)
+                routes.append((path, cost, time.perf_counter() - start))
+
+        orders = []
+        with self.lock.write():  # El lote completo se publica de una sola vez a los lectores
+            for (origin, destination), (path, cost, latency) in zip(pairs, routes):
+                if path:
+                    orders.append(self._register_order(origin, destination, path, cost, latency))
+        return orders
+
+    def _find_routes_parallel(self, pairs, workers):
+        # Copia compacta del grafo: se envía una vez a cada proceso y se trabaja con ids
+        snapshot = self.graph if isinstance(self.graph, CSRGraph) else self.graph.freeze()
+        recharge_ids = [snapshot.vertex_id(v) for v in snapshot.vertices() if self.is_recharge(v)]
+        tasks = [(snapshot.vertex_id(o), snapshot.vertex_id(d)) for o, d in pairs]
+        chunk = max(1, len(tasks) // (workers * 4))
+        chunks = [tasks[i:i + chunk] for i in range(0, len(tasks), chunk)]
 
+        routes = []
+        with ProcessPoolExecutor(max_workers=workers, initializer=_init_route_worker,
+                                 initargs=(snapshot, recharge_ids, AUTONOMY_LIMIT)) as executor:
+            for results in executor.map(_route_chunk, chunks):
+                for path_ids, cost, latency in results:
+                    if path_ids is None:
+                        routes.append((None, None, latency))
+                    else:
+                        routes.append(([snapshot.vertex(i) for i in path_ids], cost, latency))
+        return routes
+
+    def _register_order(self, origin, destination, path, cost, latency=None):
+        # Registra cliente, orden y ruta de una entrega ya calculada
+        with self.lock.write():
+            client_id = str(destination)
+            if client_id not in self.clients:
+                self.clients[client_id] = Client(client_id, f"Cliente {client_id}", destination)
+                self._client_list.append(self.clients[client_id])
+            client = self.clients[client_id]
+            client.register_order()
+
+            order = Order(
+                order_id=self._next_order_id,
+                client=client,
+                origin=origin,
+                destination=destination,
+                path=path,
+                cost=cost,
+                store=self.paths
+            )
+            self._next_order_id += 1
+            self._add_order(order, path)
+            if latency is not None:
+                self.stats.add_latency(latency)
+            return order
+
+    def _add_order(self, order, path=None):
+        # Agrega una orden ya construida (con store=self.paths) a la lista, los índices, las
+        # estadísticas y el ranking (llamar con el lock de escritura). Las canceladas no cuentan
+        # en visitas ni estadísticas. 'path' evita volver a armar la lista desde el PathStore.
+        path = path if path is not None else order.path
+        self.version += 1
         self.orders.append(order)
-        self.route_log.append(adjusted_path)
+        self._index_order(order)
+        if self.order_store is not None:
+            self.order_store.append(order)
+        if order.status != "Cancelada":
+            self.stats.add(order)
+            self._count_visits(path, 1)
+        route = Route(path, order.cost)
+        self.route_ranking.update(self.route_tree.insert(route, route))
+
+    def _index_order(self, order):
+        # Agrega la orden a los índices por id, estado, cliente y destino
+        self._orders_by_id[order.id] = order
+        self._orders_by_status[order.status][order.id] = order
+        self._orders_by_client[order.client.id].append(order)
+        self._orders_by_destination[str(order.destination)].append(order)
+
+    def _set_status(self, order, status):
+        # Cambia el estado manteniendo el índice por estado (llamar con el lock de escritura)
+        self.version += 1
+        self._orders_by_status[order.status].pop(order.id, None)
+        order.status = status
+        self._orders_by_status[status][order.id] = order
+        if self.order_store is not None:
+            self.order_store.set_status(order)
+
+    def cancel_order(self, order):
+        """Cancela una orden pendiente y descuenta sus visitas. Devuelve True si se canceló."""
+        with self.lock.write():
+            if order.status != "Pendiente":
+                return False
+            self._set_status(order, "Cancelada")
+            self._count_visits(order.path, -1)
+            self.stats.remove(order)
+            return True
+
+    def complete_order(self, order):
+        """Marca una orden pendiente como entregada. Devuelve True si se completó."""
+        with self.lock.write():
+            if order.status != "Pendiente":
+                return False
+            order.delivered_at = datetime.now()
+            self._set_status(order, "Entregado")
+            return True
+
+    def get_order(self, order_id):
+        """Devuelve la orden con ese id (O(1)) o None. Acepta el id como texto (p. ej. desde la API)."""
+        order = self._orders_by_id.get(order_id)
+        if order is None and isinstance(order_id, str) and order_id.isdigit():
+            order = self._orders_by_id.get(int(order_id))
         return order
 
+    def get_orders(self, status=None, client_id=None, destination=None):
+        """Devuelve las órdenes que cumplen todos los filtros indicados, usando el índice más selectivo."""
+        candidates = []
+        if status is not None:
+            candidates.append(list(self._orders_by_status.get(status, {}).values()))
+        if client_id is not None:
+            candidates.append(self._orders_by_client.get(client_id, []))
+        if destination is not None:
+            candidates.append(self._orders_by_destination.get(str(destination), []))
+        if not candidates:
+            return list(self.orders)
+
+        base = min(candidates, key=len)
+        return [
+            order for order in base
+            if (status is None or order.status == status)
+            and (client_id is None or order.client.id == client_id)
+            and (destination is None or str(order.destination) == str(destination))
+        ]
+
+    def get_status_counts(self):
+        """Cantidad de órdenes por estado (O(estados), desde el índice)."""
+        return {status: len(orders) for status, orders in self._orders_by_status.items() if orders}
+
+    def _count_visits(self, path, delta):
+        # Suma (o resta) una visita por cada nodo de la ruta en el contador de su tipo
+        role_of = self.role_of
+        for node in path:
+            role = role_of.get(node)
+            if role is None:
+                continue
+            counter = self._visit_counters[role]
+            counter[node] += delta
+            if counter[node] <= 0:
+                del counter[node]
+
     def find_route(self, origin, destination):
-        """Busca ruta usando Dijkstra como base, insertando recargas si se excede la autonomía, recalculando desde recargas."""
-        current_node = origin
-        adjusted_path = [current_node]
-        current_cost = 0
-
-        while True:
-            # Calcular ruta actual hasta destino
-            path, total_cost = self.graph.dijkstra_shortest_path(current_node, destination)
-            if not path:
-                return None, None
-
-            for i in range(1, len(path)):
-                u, v = path[i-1], path[i]
-                edge_cost = self.graph.get_edge(u, v).element()
-                current_cost += edge_cost
-
-                if current_cost > AUTONOMY_LIMIT:
-                    # Buscar recarga más cercana desde el nodo actual
-                    recharge, _ = self.find_nearest_recharge(u, self.vertex_roles)
-                    if recharge:
-                        # Calcular ruta desde nodo actual a recarga
-                        subpath, _ = self.graph.dijkstra_shortest_path(u, recharge)
-                        if subpath is None or len(subpath) < 2:
-                            return None, None
-                        adjusted_path.extend(subpath[1:])
-                        current_cost = 0
-                        current_node = recharge  # reinicia cálculo desde recarga
-                        break  # recalcula ruta desde recarga hacia destino
-                    else:
-                        return None, None  # No hay recarga accesible
-                else:
-                    adjusted_path.append(v)
-                    current_node = v
+        """Busca la ruta de menor costo que respeta AUTONOMY_LIMIT, recargando en estaciones cuando hace falta.
+        Devuelve (ruta, costo) o (None, None) si no existe ruta factible.
+        """
+        return self.router.route(origin, destination)
 
-            if current_node == destination:
-                break  # destino alcanzado
+    def shortest_path(self, origin, destination, method="bidirectional", heuristic="landmarks"):
+        """Camino más corto sin restricción de autonomía: (ruta, costo) o (None, inf).
+        method: "dijkstra", "bidirectional", "astar" o "ch". Para A*, heuristic elige la cota:
+        "landmarks" (ALT) o "euclidean" (posiciones de los modelos espaciales). "ch" usa el
+        índice de enable_contraction_hierarchy(); si no está activo o el grafo cambió desde
+        que se construyó, se resuelve con "bidirectional".
+        """
+        if method == "ch":
+            hierarchy = self.contraction_hierarchy
+            if hierarchy is not None and hierarchy.valid:
+                return hierarchy.shortest_path(origin, destination)
+            method = "bidirectional"
+        if method != "astar":
+            return self.graph.shortest_path(origin, destination, method)
+        return self.graph.shortest_path(origin, destination, method, self._path_heuristic(heuristic))
 
-        adjusted_cost = self.compute_total_cost(adjusted_path)
-        return adjusted_path, adjusted_cost
+    def _path_heuristic(self, kind):
+        # Se construye en la primera consulta y se rehace si el grafo cambió (flag valid del listener)
+        current = self.path_heuristics.get(kind)
+        if current is None or not current.valid:
+            if current is not None and hasattr(self.graph, "remove_listener"):
+                self.graph.remove_listener(current._on_graph_change)
+            if kind == "landmarks":
+                current = LandmarkHeuristic(self.graph, seed=self.layout_seed)
+            elif kind == "euclidean":
+                if self.initializer.positions is None:
+                    raise ValueError(f"El modelo '{self.initializer.model}' no tiene posiciones para la heurística euclidiana")
+                current = EuclideanHeuristic(self.graph, self.initializer.positions)
+            else:
+                raise ValueError(f"Heurística desconocida: {kind}")
+            self.path_heuristics[kind] = current
+        return current
 
     def find_nearest_recharge(self, node, roles):
-        """Busca el nodo de recarga más cercano desde 'node'."""
-        min_distance = float('inf')
-        closest_recharge = None
-        for v in self.graph.vertices():
-            if "Recarga" in roles[v]:
-                path, distance = self.graph.dijkstra_shortest_path(node, v)
-                if path and distance < min_distance:
-                    min_distance = distance
-                    closest_recharge = v
+        """Busca el nodo de recarga más cercano desde 'node' con un único Dijkstra multi-destino."""
+        if roles is self.vertex_roles:
+            return self.recharge_index.nearest(node)
+        # Etiquetas libres (p. ej. "🔋 Recarga rápida"): basta con que nombren el tipo de recarga
+        recharge = Role.RECHARGE.kind
+        closest_recharge, _, min_distance = self.graph.dijkstra_nearest(node, lambda v: recharge in roles.get(v, ""))
         return closest_recharge, min_distance
 
+    def is_recharge(self, v):
+        """Indica si el vértice v es una estación de recarga (O(1))."""
+        return self.role_of.get(v) is Role.RECHARGE
+
+    def has_role(self, v, role):
+        """Indica si el vértice v tiene el rol dado (Role)."""
+        return self.role_of.get(v) == role
+
+    def get_vertices_by_role(self, role):
+        """Vértices con el rol dado (precalculados, en el orden del grafo)."""
+        return self._role_vertices[role]
+
     def compute_total_cost(self, path):
         total = 0
         for u, v in zip(path[:-1], path[1:]):
@@ -107,49 +356,117 @@ class Simulation:
             total += edge.element()
         return total
 
-    def compute_mst(self):
-        """Calcula el Árbol de Expansión Mínima usando Kruskal y devuelve las aristas como pares (u, v)."""
-        edges = []
-        for edge in self.graph.edges():
-            u, v = edge.endpoints()
-            edges.append((edge.element(), u, v))
-
-        edges.sort(key=lambda x: x[0])  # ordenar solo por peso
-        parent = {}
-
-        def find(v):
-            while parent[v] != v:
-                parent[v] = parent[parent[v]]
-                v = parent[v]
-            return v
-
-        def union(u, v):
-            pu, pv = find(u), find(v)
-            if pu != pv:
-                parent[pu] = pv
-
-        for vertex in self.graph.vertices():
-            parent[vertex] = vertex
-
-        mst_edges = []
-        for weight, u, v in edges:
-            if find(u) != find(v):
-                union(u, v)
-                mst_edges.append((u, v))
-
-        return mst_edges
-    
+    def compute_mst(self, method="boruvka"):
+        """Calcula el Árbol de Expansión Mínima y devuelve las aristas como pares (u, v).
+        Trabaja sobre arreglos de ids (ver sim.graph_analytics): 'boruvka', 'kruskal' o 'prim'.
+        """
+        return GraphAnalytics(self.graph).minimum_spanning_tree(method)
+
+    def critical_recharge_links(self):
+        """Aristas puente que, si se cortan, dejan nodos sin ninguna recarga alcanzable: [(u, v, varados)]."""
+        return GraphAnalytics(self.graph).critical_recharge_links(self.is_recharge)
+
+    def save(self, path):
+        """Guarda la simulación como snapshot binario en el directorio 'path' (ver sim.snapshot)."""
+        from sim.snapshot import save_snapshot
+        return save_snapshot(self, path)
+
+    @classmethod
+    def load(cls, path, mmap=True):
+        """Carga una simulación guardada con save(); el grafo queda congelado (CSR)."""
+        from sim.snapshot import load_snapshot
+        return load_snapshot(path, mmap=mmap, cls=cls)
+
+    def freeze_graph(self):
+        """Reemplaza el grafo por su versión compacta (CSR). Los vértices y roles se conservan."""
+        with self.lock.write():
+            if not isinstance(self.graph, CSRGraph):
+                frozen = self.graph.freeze()
+                for component in (self.recharge_index, self.router, self.distance_cache, self.contraction_hierarchy,
+                                  *self.path_heuristics.values()):
+                    if component is not None:
+                        self.graph.remove_listener(component._on_graph_change)
+                        component.graph = frozen
+                self.graph = frozen
+            return self.graph
+
+    def enable_distance_cache(self, path=None):
+        """Precalcula distancias y predecesores desde cada almacenamiento y recarga.
+        Con 'path' las matrices se guardan en archivos .npy mapeados en memoria.
+        """
+        sources = [v for v in self.graph.vertices() if self.role_of[v] is not Role.CLIENT]
+        self.disable_distance_cache()
+        self.distance_cache = DistanceCache(self.graph, sources, path)
+        self.router.use_distance_cache(self.distance_cache)
+        return self.distance_cache
+
+    def enable_contraction_hierarchy(self, path=None):
+        """Activa el índice de jerarquías de contracción (ver sim.contraction_hierarchy):
+        find_route lo usa cuando la ruta directa cabe en la autonomía y shortest_path con
+        method="ch". Con 'path', si ahí hay un índice guardado para este mismo grafo se abre
+        (mmap, sin preprocesar); si no, se construye y se guarda en 'path'.
+        """
+        self.disable_contraction_hierarchy()
+        hierarchy = None
+        if path is not None and os.path.isdir(path):
+            try:
+                hierarchy = ContractionHierarchy.load(path, self.graph)
+            except ValueError:
+                hierarchy = None  # Índice de otra red (o de otra versión): se recalcula
+        if hierarchy is None:
+            hierarchy = ContractionHierarchy(self.graph)
+            if path is not None:
+                hierarchy.save(path)
+        self.contraction_hierarchy = hierarchy
+        self.router.use_contraction_hierarchy(hierarchy)
+        return hierarchy
+
+    def disable_contraction_hierarchy(self):
+        if self.contraction_hierarchy is not None and hasattr(self.graph, "remove_listener"):
+            self.graph.remove_listener(self.contraction_hierarchy._on_graph_change)
+        self.contraction_hierarchy = None
+        self.router.use_contraction_hierarchy(None)
+
+    def enable_order_store(self):
+        """Activa el almacén columnar de órdenes (filtros, agrupaciones e histogramas
+        vectorizados; ver sim.order_store). Se carga con las órdenes existentes y luego se
+        mantiene al crear, cancelar y completar órdenes.
+        """
+        with self.lock.write():
+            if self.order_store is None:
+                store = OrderStore(self.paths, capacity=max(1024, len(self.orders)))
+                for order in self.orders:
+                    store.append(order)
+                self.order_store = store
+            return self.order_store
+
+    def disable_order_store(self):
+        self.order_store = None
+
+    def get_orders_frame(self, decode=True):
+        """Órdenes como DataFrame de pandas. Con el almacén columnar activo las columnas
+        numéricas no se copian; si no, se arma uno temporal (O(órdenes)).
+        """
+        store = self.order_store
+        if store is None:
+            store = OrderStore(self.paths, capacity=max(1, len(self.orders)))
+            for order in self.orders:
+                store.append(order)
+        return store.to_dataframe(decode)
+
+    def disable_distance_cache(self):
+        if self.distance_cache is not None and hasattr(self.graph, "remove_listener"):
+            self.graph.remove_listener(self.distance_cache._on_graph_change)
+        self.distance_cache = None
+        self.router.use_distance_cache(None)
+
     def get_node_distribution(self):
         """Devuelve un dict con el conteo de nodos: {"Storage": x, "Recharge": y, "Clients": z}"""
-        distribution = {"Storage": 0, "Recharge": 0, "Clients": 0}
-        for v, roles in self.vertex_roles.items():
-            if "Almacenamiento" in roles:
-                distribution["Storage"] += 1
-            elif "Recarga" in roles:
-                distribution["Recharge"] += 1
-            elif "Cliente" in roles:
-                distribution["Clients"] += 1
-        return distribution
+        return {
+            "Storage": len(self._role_vertices[Role.STORAGE]),
+            "Recharge": len(self._role_vertices[Role.RECHARGE]),
+            "Clients": len(self._role_vertices[Role.CLIENT]),
+        }
 
     def get_top_visited_clients(self, top_n=6):
         """Devuelve lista [(client_id, total_orders)] de los clientes con más pedidos."""
@@ -162,23 +479,17 @@ class Simulation:
 
     def get_top_visited_recharges(self, top_n=4):
         """Devuelve lista [(recharge_node, visitas)] de las recargas más visitadas."""
-        visit_count = {}
-        for path in self.route_log:
-            for node in path:
-                if "Recarga" in self.vertex_roles.get(node, ""):
-                    visit_count[node] = visit_count.get(node, 0) + 1
-        sorted_visits = sorted(visit_count.items(), key=lambda x: x[1], reverse=True)
-        return [(str(node), count) for node, count in sorted_visits[:top_n]]
+        return self.get_visit_ranking("Recarga", top_n)
 
     def get_top_visited_storage_nodes(self, top_n=4):
         """Devuelve lista [(storage_node, visitas)] de los almacenamientos más visitados."""
-        visit_count = {}
-        for path in self.route_log:
-            for node in path:
-                if "Almacenamiento" in self.vertex_roles.get(node, ""):
-                    visit_count[node] = visit_count.get(node, 0) + 1
-        sorted_visits = sorted(visit_count.items(), key=lambda x: x[1], reverse=True)
-        return [(str(node), count) for node, count in sorted_visits[:top_n]]
+        return self.get_visit_ranking("Almacenamiento", top_n)
+
+    def get_visit_ranking(self, kind, top_n=None):
+        """Devuelve lista [(nodo, visitas)] para un tipo ("Almacenamiento", "Recarga", "Cliente"),
+        de mayor a menor; top_n=None devuelve todos.
+        """
+        return [(str(node), count) for node, count in self.visit_counts[kind].most_common(top_n)]
 
     # Métodos auxiliares para acceso a datos
     def get_roles(self):
@@ -192,3 +503,66 @@ class Simulation:
 
     def get_clients(self):
         return list(self.clients.values())
+
+    def iter_orders(self, offset=0, limit=None):
+        """Recorre las órdenes de forma perezosa desde 'offset' (máximo 'limit').
+        El rango se fija al llamar: órdenes agregadas después no aparecen en el recorrido.
+        """
+        end = len(self.orders) if limit is None else min(len(self.orders), offset + limit)
+        orders = self.orders
+        return (orders[i] for i in range(offset, end))
+
+    def iter_clients(self, offset=0, limit=None):
+        """Recorre los clientes en orden de registro de forma perezosa desde 'offset' (máximo 'limit').
+        Como en iter_orders, el rango se fija al llamar: clientes nuevos no aparecen en el recorrido.
+        """
+        clients = self._client_list
+        end = len(clients) if limit is None else min(len(clients), offset + limit)
+        return (clients[i] for i in range(offset, end))
+
+    def get_coordinates(self, center=(-38.7359, -72.5904), spread=0.02):
+        """Coordenadas [lat, lon] por etiqueta de vértice alrededor de 'center'.
+        Los modelos espaciales usan las posiciones del generador; el resto, posiciones
+        aleatorias reproducibles (misma semilla de la simulación => mismo mapa).
+        """
+        vertices = list(self.graph.vertices())
+        positions = self.initializer.positions
+        if positions is not None:
+            xy = np.array([positions[v] for v in vertices]) * 2 - 1  # [0, 1]² -> [-1, 1]²
+        else:
+            xy = np.random.default_rng(self.layout_seed).uniform(-1, 1, (len(vertices), 2))
+        lat = center[0] + spread * xy[:, 1]
+        lon = center[1] + spread * xy[:, 0]
+        return {str(v): [a, b] for v, a, b in zip(vertices, lat.tolist(), lon.tolist())}
+
+    def get_client(self, client_id):
+        """Devuelve el cliente con ese id (O(1)) o None."""
+        return self.clients.get(client_id)
+
+    def get_top_routes(self, k=10):
+        """Devuelve las k rutas más frecuentes (a igual frecuencia, las de mayor costo)."""
+        return self.route_ranking.top_k(k)
+
+
+### --- Procesos de cálculo de rutas (generate_orders con workers) --- ###
+_WORKER_ROUTER = None
+
+def _init_route_worker(graph, recharge_ids, autonomy):
+    """Inicializa en cada proceso un router sobre la copia de solo lectura del grafo."""
+    global _WORKER_ROUTER
+    recharge = {graph.vertex(i) for i in recharge_ids}
+    _WORKER_ROUTER = EnergyAwareRouter(graph, recharge.__contains__, autonomy)
+
+def _route_chunk(tasks):
+    """Calcula las rutas de un bloque de pares (id_origen, id_destino) y las devuelve como ids."""
+    graph = _WORKER_ROUTER.graph
+    results = []
+    for origin_id, destination_id in tasks:
+        start = time.perf_counter()
+        path, cost = _WORKER_ROUTER.route(graph.vertex(origin_id), graph.vertex(destination_id))
+        latency = time.perf_counter() - start
+        if path:
+            results.append(([graph.vertex_id(v) for v in path], cost, latency))
+        else:
+            results.append((None, None, latency))
+    return results
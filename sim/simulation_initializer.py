@@ -1,85 +1,285 @@
-import random
+import math
+from enum import IntEnum
+import numpy as np
 from model.graph import Graph
+from model.csr_graph import CSRGraph
 from model.vertex import Vertex
+from sim.graph_analytics import connected_components
 
 # Roles disponibles
 NODE_STORAGE = "📦 Almacenamiento"
 NODE_RECHARGE = "🔋 Recarga"
 NODE_CLIENT = "👤 Cliente"
 
+# Rol de un nodo como entero pequeño: las comparaciones son O(1) y los roles caben en un arreglo int8
+class Role(IntEnum):
+    STORAGE = 0
+    RECHARGE = 1
+    CLIENT = 2
+
+    @property
+    def label(self):
+        """Texto con emoji que se muestra en la interfaz (p. ej. "🔋 Recarga")."""
+        return ROLE_LABELS[self]
+
+    @property
+    def kind(self):
+        """Nombre del tipo de nodo ("Almacenamiento", "Recarga" o "Cliente")."""
+        return ROLE_KINDS[self]
+
+    @classmethod
+    def from_label(cls, label):
+        return cls(ROLE_LABELS.index(label))
+
+ROLE_LABELS = (NODE_STORAGE, NODE_RECHARGE, NODE_CLIENT)  # Índice = Role
+ROLE_KINDS = ("Almacenamiento", "Recarga", "Cliente")
+
+# Modelos de red disponibles
+MODEL_RANDOM = "random"        # Árbol aleatorio + aristas extra uniformes
+MODEL_GEOMETRIC = "geometric"  # Grafo geométrico aleatorio en el cuadrado unitario
+MODEL_GRID = "grid"            # Grilla con ruido en las posiciones
+MODELS = (MODEL_RANDOM, MODEL_GEOMETRIC, MODEL_GRID)
+
+MIN_WEIGHT, MAX_WEIGHT = 1, 20
+
 # Clase que inicializa la simulación y genera el grafo
 class SimulationInitializer:
-    def __init__(self, n_nodes, m_edges, directed=False):
+    def __init__(self, n_nodes, m_edges, directed=False, model=MODEL_RANDOM, seed=None):
         # Inicializa con nodos, aristas mínimas y tipo de grafo
+        if model not in MODELS:
+            raise ValueError(f"Modelo de red desconocido: {model}")
         self.n_nodes = n_nodes
-        self.m_edges = max(m_edges, n_nodes - 1)  # asegura conectividad
+        max_edges = n_nodes * (n_nodes - 1) // (1 if directed else 2)
+        self.m_edges = min(max(m_edges, n_nodes - 1), max_edges)  # asegura conectividad y que sea alcanzable
+        self.directed = directed
+        self.model = model
+        self.rng = np.random.default_rng(seed)  # Roles, topología, pesos y posiciones (seed: entero o Generator)
         self.graph = Graph(directed) # Grafo vacío
-        self.vertex_roles = {} # Diccionario de roles por nodo
+        self.vertex_roles = {} # Diccionario de roles por nodo (texto, para mostrar)
+        self.vertex_role = {}  # Vértice -> Role (consultas O(1))
+        self.vertices = []     # id -> Vértice, en el orden del grafo
+        self.vertex_ids = {}   # Vértice -> id (inverso de vertices)
+        self.role_codes = np.empty(0, dtype=np.int8)  # id -> Role (-1 si el vértice se quitó del grafo)
+        self.role_vertices = {}  # Role -> arreglo de ids de los vértices con ese rol
+        self.positions = None  # Vértice -> (x, y) en [0, 1]² para los modelos espaciales
 
     def generate_labels(self, n):
+        # A, B, ..., Z, AA, AB, ...: para cada largo, todas las combinaciones en orden
         from string import ascii_uppercase
-        labels = []
-        i = 0
-        while len(labels) < n:
-            label = ""
-            temp = i
-            while True:
-                label = ascii_uppercase[temp % 26] + label
-                temp = temp // 26 - 1
-                if temp < 0:
-                    break
-            labels.append(label)
-            i += 1
-        return labels
+        from itertools import chain, count, islice, product
+        combos = chain.from_iterable(product(ascii_uppercase, repeat=k) for k in count(1))
+        return ["".join(c) for c in islice(combos, n)]
 
 
     def generate_roles(self):
         # 20% almacenamiento, 20% recarga, 60% clientes
-        """Asigna roles según proporciones fijas"""
+        """Asigna roles según proporciones fijas. Devuelve un arreglo int8 de códigos Role por id."""
         n_storage = self.n_nodes * 20 // 100
         n_recharge = self.n_nodes * 20 // 100
         n_client = self.n_nodes - n_storage - n_recharge
 
-        roles = (
-            [NODE_STORAGE] * n_storage +
-            [NODE_RECHARGE] * n_recharge +
-            [NODE_CLIENT] * n_client
-        )
-        random.shuffle(roles) # Mezcla aleatoria de roles
-        return roles
+        roles = np.repeat(np.array([Role.STORAGE, Role.RECHARGE, Role.CLIENT], dtype=np.int8),
+                          [n_storage, n_recharge, n_client])
+        return roles[self.rng.permutation(len(roles))] # Mezcla aleatoria de roles
 
-    def generate_graph(self):
-        """Genera un grafo conexo con nodos y aristas aleatorias"""
-        roles = self.generate_roles()
-        vertices = []
+    def set_roles(self, vertices, codes):
+        """Registra los roles (códigos Role por id de 'vertices') y precalcula los índices:
+        vertex_role para consultas O(1), vertex_ids con el id de cada vértice,
+        role_vertices con los ids (ordenados) de cada rol y vertex_roles con el texto de cada rol.
+        """
+        self.vertices = list(vertices)
+        self.vertex_ids = {v: i for i, v in enumerate(self.vertices)}
+        self.role_codes = np.asarray(codes, dtype=np.int8)
+        roles = [Role(c) for c in range(len(Role))]
+        self.vertex_role = {v: roles[c] for v, c in zip(self.vertices, self.role_codes.tolist())}
+        self.vertex_roles = {v: role.label for v, role in self.vertex_role.items()}
+        self.role_vertices = {role: np.flatnonzero(self.role_codes == role) for role in Role}
+        return self.vertex_roles
+
+    def remove_vertex_role(self, v):
+        """Olvida el rol de un vértice quitado del grafo, manteniendo los índices de set_roles.
+        Devuelve (Role, posición del vértice en vertices_with_role(Role)), o (None, None) si no
+        tenía rol. Los ids de los demás vértices no cambian.
+        """
+        role = self.vertex_role.pop(v, None)
+        if role is None:
+            return None, None
+        del self.vertex_roles[v]
+        i = self.vertex_ids.pop(v)
+        self.role_codes[i] = -1
+        ids = self.role_vertices[role]
+        pos = int(np.searchsorted(ids, i))  # Los ids de cada rol están ordenados
+        self.role_vertices[role] = np.delete(ids, pos)
+        return role, pos
 
-        # Crear vértices con rol
+    def vertices_with_role(self, role):
+        """Lista de vértices con el rol dado (en el orden del grafo)."""
+        vertices = self.vertices
+        return [vertices[i] for i in self.role_vertices[role].tolist()]
+
+    def generate_graph(self, frozen=False):
+        """Genera un grafo conexo con nodos y aristas aleatorias según el modelo elegido.
+        Con frozen=True se construye directamente un CSRGraph (sin el Graph mutable), lo que
+        permite redes de millones de nodos en segundos.
+        """
+        roles = self.generate_roles()
         labels = self.generate_labels(self.n_nodes)
-        for i in range(self.n_nodes):
-            label = labels[i]  # A, B, ..., Z, N26...
-            v = self.graph.insert_vertex(label)
-            self.vertex_roles[v] = roles[i]
-            vertices.append(v)
-
-        # Conectividad mínima: árbol generador aleatorio
-        connected = [vertices[0]]
-        remaining = vertices[1:]
-        while remaining:
-            u = random.choice(connected)
-            v = random.choice(remaining)
-            weight = random.randint(1, 20)
-            self.graph.insert_edge(u, v, weight)
-            connected.append(v)
-            remaining.remove(v)
-
-        # Agregar aristas adicionales
-        added_edges = self.n_nodes - 1
-        while added_edges < self.m_edges:
-            u, v = random.sample(vertices, 2)
-            if not self.graph.get_edge(u, v) and u != v:
-                weight = random.randint(1, 20)
-                self.graph.insert_edge(u, v, weight)
-                added_edges += 1
+
+        # Topología como arreglos de ids (src, dst, peso) y posiciones opcionales
+        if self.model == MODEL_GEOMETRIC:
+            src, dst, weights, xy = self._geometric_edges()
+        elif self.model == MODEL_GRID:
+            src, dst, weights, xy = self._grid_edges()
+        else:
+            src, dst, weights, xy = self._random_edges()
+
+        if frozen:
+            vertices = [Vertex(label) for label in labels]
+            self.graph = CSRGraph.from_edges(vertices, src, dst, weights, self.directed)
+        else:
+            # Crear vértices y aristas en el grafo mutable
+            vertices = [self.graph.insert_vertex(label) for label in labels]  # A, B, ..., Z, AA...
+            insert_edge = self.graph.insert_edge
+            for u, v, w in zip(src.tolist(), dst.tolist(), weights.tolist()):
+                insert_edge(vertices[u], vertices[v], w)
+
+        self.set_roles(vertices, roles)
+        if xy is not None:
+            self.positions = dict(zip(vertices, map(tuple, xy.tolist())))
 
         # Devuelve el grafo completo y roles asignados
         return self.graph, self.vertex_roles
+
+    ### --- Modelo aleatorio uniforme --- ###
+    def _random_tree(self, n):
+        # Árbol aleatorio en O(n): cada vértice de una permutación se cuelga de uno anterior
+        perm = self.rng.permutation(n)
+        if n < 2:
+            return perm[:0], perm[:0]
+        pick = (self.rng.random(n - 1) * np.arange(1, n)).astype(np.int64)
+        return perm[pick], perm[1:]
+
+    def _random_edges(self):
+        n = self.n_nodes
+        src, dst = self._random_tree(n)
+        extra_src, extra_dst = self._sample_new_pairs(n, src, dst, self.m_edges - len(src))
+        src = np.concatenate([src, extra_src])
+        dst = np.concatenate([dst, extra_dst])
+        return src, dst, self._random_weights(len(src)), None
+
+    def _random_weights(self, k):
+        return self.rng.integers(MIN_WEIGHT, MAX_WEIGHT + 1, size=k)
+
+    def _pair_codes(self, n, src, dst):
+        # Código entero único por par (ordenado si el grafo es no dirigido)
+        if not self.directed:
+            src, dst = np.minimum(src, dst), np.maximum(src, dst)
+        return src.astype(np.int64) * n + dst
+
+    def _sample_new_pairs(self, n, src, dst, k):
+        """Muestrea k pares distintos (sin reemplazo) que no estén en las aristas existentes."""
+        if k <= 0:
+            return np.empty(0, dtype=np.int64), np.empty(0, dtype=np.int64)
+        total = n * (n - 1) // (1 if self.directed else 2)
+        existing = np.unique(self._pair_codes(n, src, dst))
+        # Se piden k + |existentes| índices distintos: aun descartando los existentes quedan k
+        draw = min(total, k + len(existing))
+        idx = self.rng.choice(total, size=draw, replace=False)
+        u, v = self._pair_from_index(n, idx)
+        fresh = ~np.isin(u * n + v, existing)
+        return u[fresh][:k], v[fresh][:k]
+
+    def _pair_from_index(self, n, idx):
+        # Índice en [0, total) -> par (u, v) con u != v (u < v si el grafo es no dirigido)
+        idx = np.asarray(idx, dtype=np.int64)
+        if self.directed:
+            u = idx // (n - 1)
+            v = idx % (n - 1)
+            return u, v + (v >= u)
+        # La fila u del triángulo superior empieza en u*(2n-u-1)/2; la raíz da u salvo redondeo
+        def row_start(u):
+            return u * (2 * n - u - 1) // 2
+        u = np.floor((2 * n - 1 - np.sqrt((2.0 * n - 1) ** 2 - 8.0 * idx)) / 2).astype(np.int64)
+        u -= row_start(u) > idx
+        u += row_start(u + 1) <= idx
+        return u, idx - row_start(u) + u + 1
+
+    ### --- Modelos espaciales --- ###
+    def _distance_weights(self, xy, src, dst, scale):
+        # Peso proporcional a la distancia euclidiana (MAX_WEIGHT a distancia 'scale')
+        d = np.hypot(*(xy[src] - xy[dst]).T)
+        return np.clip(np.ceil(MAX_WEIGHT * d / scale), MIN_WEIGHT, MAX_WEIGHT).astype(np.int64)
+
+    def _geometric_edges(self):
+        """Une los puntos a distancia <= r, con r elegido para obtener ~m_edges aristas.
+        Los pares se buscan solo en celdas vecinas de una grilla de lado r: O(n + m).
+        """
+        n = self.n_nodes
+        xy = self.rng.random((n, 2))
+        r = min(math.sqrt(self.m_edges / (math.pi * n * (n - 1) / 2)), 1.0) if n > 1 else 1.0
+        cells = max(1, min(int(1 / r), 2 * math.isqrt(n)))  # celdas de lado >= r
+        cx = np.minimum((xy[:, 0] * cells).astype(np.int64), cells - 1)
+        cy = np.minimum((xy[:, 1] * cells).astype(np.int64), cells - 1)
+        key = cx * cells + cy
+        order = np.argsort(key, kind="stable")
+        counts = np.bincount(key, minlength=cells * cells)
+        starts = np.concatenate([[0], np.cumsum(counts)[:-1]])
+
+        src_parts, dst_parts = [], []
+        for dx, dy in ((0, 0), (1, -1), (1, 0), (1, 1), (0, 1)):  # media vecindad: cada par una vez
+            nx, ny = cx + dx, cy + dy
+            ok = (nx >= 0) & (nx < cells) & (ny >= 0) & (ny < cells)
+            p = np.nonzero(ok)[0]
+            nkey = nx[p] * cells + ny[p]
+            c = counts[nkey]
+            rep = np.repeat(p, c)
+            offset = np.arange(c.sum()) - np.repeat(np.cumsum(c) - c, c)
+            q = order[np.repeat(starts[nkey], c) + offset]
+            keep = rep < q if (dx, dy) == (0, 0) else np.ones(len(q), dtype=bool)
+            keep &= np.hypot(*(xy[rep] - xy[q]).T) <= r
+            src_parts.append(rep[keep])
+            dst_parts.append(q[keep])
+        src = np.concatenate(src_parts)
+        dst = np.concatenate(dst_parts)
+
+        # Componentes aisladas: se enlazan en cadena siguiendo el orden espacial de las celdas
+        labels = connected_components(n, src, dst)
+        reps = np.unique(labels)
+        if len(reps) > 1:
+            reps = reps[np.argsort(key[reps], kind="stable")]
+            src = np.concatenate([src, reps[:-1]])
+            dst = np.concatenate([dst, reps[1:]])
+        # Escala 4r/3: peso medio parecido al del modelo aleatorio (~10)
+        return src, dst, self._distance_weights(xy, src, dst, 4 * r / 3), xy
+
+    def _grid_edges(self):
+        """Grilla de lado ceil(sqrt(n)) con posiciones perturbadas.
+        Se toma un árbol tipo peine (filas + primera columna) y se completan las
+        m_edges con otras aristas de la grilla, diagonales y, si faltan, pares aleatorios.
+        """
+        n = self.n_nodes
+        side = max(1, math.ceil(math.sqrt(n)))
+        ids = np.arange(n)
+        row, col = ids // side, ids % side
+        xy = (np.stack([col, row], axis=1) + self.rng.normal(0, 0.15, (n, 2)) + 0.5) / side
+
+        right = ids[(col + 1 < side) & (ids + 1 < n)]
+        down = ids[ids + side < n]
+        # Peine: horizontales de cada fila + verticales de la primera columna (n - 1 aristas)
+        spine = col[down] == 0
+        tree_src = np.concatenate([right, down[spine]])
+        tree_dst = tree_src + np.where(np.arange(len(tree_src)) < len(right), 1, side)
+        other_down = down[~spine]
+
+        diag = ids[(col + 1 < side) & (ids + side + 1 < n)]
+        cand_src = np.concatenate([other_down, diag])
+        cand_dst = np.concatenate([other_down + side, diag + side + 1])
+        extra = self.m_edges - len(tree_src)
+        pick = self.rng.permutation(len(cand_src))[:max(extra, 0)]
+        src = np.concatenate([tree_src, cand_src[pick]])
+        dst = np.concatenate([tree_dst, cand_dst[pick]])
+        if extra > len(cand_src):
+            more_src, more_dst = self._sample_new_pairs(n, src, dst, extra - len(cand_src))
+            src = np.concatenate([src, more_src])
+            dst = np.concatenate([dst, more_dst])
+        return src, dst, self._distance_weights(xy, src, dst, 2.0 / side), xy
@@ -0,0 +1,369 @@
+"""Snapshot binario de una simulación.
+
+Un snapshot es un directorio con un meta.json y un archivo .npy por columna:
+
+- Grafo en formato CSR (offsets / targets / weights, y los in_* si es dirigido)
+- Etiquetas, roles (códigos int8) y posiciones de los vértices. Los vértices que ya se
+  quitaron del grafo (remove_vertex) pero siguen en clientes u órdenes se guardan aparte
+  en detached_labels, con ids a partir de la cantidad de vértices del grafo
+- Índice de recarga más cercana (así la carga no repite el Dijkstra multi-origen)
+- Clientes y órdenes como columnas; las rutas se guardan aplanadas en path_vertices
+  (ids de vértice) con path_offsets: la ruta de la orden i es
+  path_vertices[path_offsets[i]:path_offsets[i + 1]]. route_log es la secuencia de
+  rutas de las órdenes, así que no se guarda aparte.
+
+Los arreglos se abren con np.load(mmap_mode="r"): abrir un snapshot de varios GB no
+lee los datos y varios procesos (p. ej. workers de la API) comparten las mismas páginas
+de solo lectura. SimulationSnapshot da acceso directo a las columnas sin crear objetos.
+to_simulation() crea en Python un objeto por Client y Order (los agregados y las rutas se
+cargan en bloque), así que para consultas sobre snapshots grandes conviene leer las
+columnas directamente. Los costos se guardan con su tipo (enteros siguen siendo enteros).
+"""
+import json
+import os
+import shutil
+import uuid
+from itertools import chain
+import numpy as np
+from model.csr_graph import CSRGraph
+from model.vertex import Vertex
+from domain.client import Client
+from domain.order import Order
+from sim.stats import QuantileSketch
+from tda.path_store import PathStore
+from domain.route import Route
+from sim.recharge_index import RechargeIndex
+from sim.simulation_initializer import SimulationInitializer, Role, ROLE_LABELS
+
+FORMAT_VERSION = 2
+META_FILE = "meta.json"
+STATUSES = ("Pendiente", "Entregado", "Cancelada")
+
+
+def _codes(values, names):
+    # Convierte valores a códigos enteros agregando a 'names' los que falten
+    index = {name: i for i, name in enumerate(names)}
+    for value in values:
+        if value not in index:
+            index[value] = len(names)
+            names.append(value)
+    return np.array([index[value] for value in values], dtype=np.int8)
+
+def _timestamps(values):
+    # datetime o None -> datetime64[us] (NaT para None)
+    return np.array(values, dtype="datetime64[us]") if values else np.empty(0, dtype="datetime64[us]")
+
+def _numbers(values):
+    # Conserva el tipo de los valores (enteros -> int64, si no float64): los costos vuelven igual
+    return np.array(values) if values else np.empty(0, dtype=np.float64)
+
+def _strings(values):
+    return np.array(values, dtype=str) if values else np.empty(0, dtype="<U1")
+
+
+### --- Guardado --- ###
+def save_snapshot(sim, directory):
+    """Guarda la simulación en 'directory' (se reemplaza si ya existe) y devuelve la ruta.
+    Se toma el lock de lectura: el snapshot corresponde exactamente a sim.version.
+    """
+    with sim.lock.read():
+        arrays, meta = _collect(sim)
+    return write_arrays(directory, arrays, meta)
+
+def write_arrays(directory, arrays, meta):
+    """Escribe un .npy por arreglo y META_FILE en 'directory' (se reemplaza si ya existe).
+    Se escribe en un directorio temporal y se publica con un rename: un lector nunca ve
+    el directorio a medias.
+    """
+    directory = os.path.abspath(directory)
+    parent = os.path.dirname(directory)
+    os.makedirs(parent, exist_ok=True)
+    temp = os.path.join(parent, f".{os.path.basename(directory)}.{uuid.uuid4().hex[:8]}.tmp")
+    os.makedirs(temp)
+    try:
+        for name, array in arrays.items():
+            np.save(os.path.join(temp, f"{name}.npy"), array, allow_pickle=False)
+        with open(os.path.join(temp, META_FILE), "w") as f:
+            json.dump(meta, f)
+        old = None
+        if os.path.exists(directory):
+            old = f"{temp}.old"
+            os.rename(directory, old)
+        os.rename(temp, directory)
+    except BaseException:
+        shutil.rmtree(temp, ignore_errors=True)
+        raise
+    if old is not None:
+        shutil.rmtree(old, ignore_errors=True)
+    return directory
+
+def _collect(sim):
+    # Arma las columnas y el meta.json de la simulación (llamar con el lock de lectura)
+    graph = sim.graph if isinstance(sim.graph, CSRGraph) else CSRGraph.from_graph(sim.graph)
+    vertices = list(graph.vertices())
+    index = {v: i for i, v in enumerate(vertices)}
+    offsets, targets, weights = graph.csr_arrays()
+    arrays = {
+        "labels": _strings([str(v.element()) for v in vertices]),
+        "offsets": offsets,
+        "targets": targets,
+        "weights": weights,
+    }
+    if graph.is_directed():
+        arrays["in_offsets"] = graph._in_offsets
+        arrays["in_targets"] = graph._in_targets
+        arrays["in_weights"] = graph._in_weights
+
+    clients = list(sim.clients.values())
+    orders = sim.orders
+    detached = _detached_vertices(index, chain((c.vertex for c in clients),
+                                               (o.origin for o in orders), (o.destination for o in orders),
+                                               sim.paths.vertices()))
+    arrays["detached_labels"] = _strings([str(v.element()) for v in detached])
+
+    role_of = sim.role_of
+    arrays["roles"] = np.array([role_of[v] for v in vertices], dtype=np.int8)
+    positions = sim.initializer.positions
+    if positions is not None:
+        arrays["positions"] = np.array([positions[v] for v in vertices], dtype=np.float64)
+
+    station, distance, next_hop = sim.recharge_index.to_arrays(vertices)
+    arrays.update({"recharge_station": station, "recharge_distance": distance, "recharge_next_hop": next_hop})
+
+    client_index = {c.id: i for i, c in enumerate(clients)}
+    arrays.update({
+        "client_ids": _strings([c.id for c in clients]),
+        "client_names": _strings([c.name for c in clients]),
+        "client_types": _strings([c.type for c in clients]),
+        "client_vertices": np.array([index[c.vertex] for c in clients], dtype=np.int64),
+        "client_total_orders": np.array([c.total_orders for c in clients], dtype=np.int64),
+    })
+
+    status_names = list(STATUSES)
+    # Las rutas ya están aplanadas en el PathStore: solo se traducen sus ids internados a ids del grafo
+    path_offsets, path_ids = sim.paths.to_arrays()
+    interned = np.array([index[v] for v in sim.paths.vertices()], dtype=np.int64)
+    arrays.update({
+        "order_ids": np.array([o.id for o in orders], dtype=np.int64),
+        "order_clients": np.array([client_index[o.client.id] for o in orders], dtype=np.int64),
+        "order_origins": np.array([index[o.origin] for o in orders], dtype=np.int64),
+        "order_destinations": np.array([index[o.destination] for o in orders], dtype=np.int64),
+        "order_costs": _numbers([o.cost for o in orders]),
+        "order_priorities": np.array([o.priority for o in orders], dtype=np.int64),
+        "order_status": _codes([o.status for o in orders], status_names),
+        "order_created": _timestamps([o.created_at for o in orders]),
+        "order_delivered": _timestamps([o.delivered_at for o in orders]),
+        "path_offsets": path_offsets,
+        "path_vertices": interned[path_ids] if len(path_ids) else path_ids,
+    })
+
+    latency = sim.stats.latency_sketch
+    initializer = sim.initializer
+    meta = {
+        "format": FORMAT_VERSION,
+        "n_nodes": initializer.n_nodes,
+        "m_edges": initializer.m_edges,
+        "model": initializer.model,
+        "directed": graph.is_directed(),
+        "uid": sim.uid,
+        "version": sim.version,
+        "layout_seed": sim.layout_seed,
+        "rng_state": sim.rng.bit_generator.state,
+        "role_names": list(ROLE_LABELS),
+        "status_names": status_names,
+        "latency": {
+            "relative_accuracy": latency.relative_accuracy,
+            "buckets": [[k, c] for k, c in latency._buckets.items()],
+            "zeros": latency._zeros,
+            "count": latency.count,
+        },
+    }
+    return arrays, meta
+
+def _detached_vertices(index, referenced):
+    # Agrega a 'index' (con ids a continuación de los del grafo) los vértices referenciados
+    # que ya no están en el grafo y los devuelve en ese orden
+    detached = []
+    for v in referenced:
+        if v not in index:
+            index[v] = len(index)
+            detached.append(v)
+    return detached
+
+
+### --- Carga --- ###
+class SimulationSnapshot:
+    def __init__(self, directory, mmap=True):
+        """
+        Snapshot abierto en modo lectura. Los arreglos se cargan recién al pedirlos con
+        array(nombre) y, con mmap=True, quedan mapeados en memoria (no se copian).
+        """
+        self.directory = directory
+        self.mmap = mmap
+        with open(os.path.join(directory, META_FILE)) as f:
+            self.meta = json.load(f)
+        if self.meta.get("format") != FORMAT_VERSION:
+            raise ValueError(f"Formato de snapshot no soportado: {self.meta.get('format')}")
+        self._arrays = {}
+
+    def array(self, name):
+        """Columna 'name' del snapshot (np.memmap de solo lectura si mmap=True)."""
+        if name not in self._arrays:
+            path = os.path.join(self.directory, f"{name}.npy")
+            self._arrays[name] = np.load(path, mmap_mode="r" if self.mmap else None, allow_pickle=False)
+        return self._arrays[name]
+
+    def has_array(self, name):
+        return name in self._arrays or os.path.exists(os.path.join(self.directory, f"{name}.npy"))
+
+    @property
+    def vertex_count(self):
+        return len(self.array("offsets")) - 1
+
+    @property
+    def order_count(self):
+        return len(self.array("path_offsets")) - 1
+
+    def vertex_label(self, i):
+        """Etiqueta del vértice i (los ids desde vertex_count son vértices ya quitados del grafo)."""
+        n = self.vertex_count
+        return str(self.array("labels")[i] if i < n else self.array("detached_labels")[i - n])
+
+    def order_path(self, i):
+        """Ids de vértice de la ruta de la orden i (vista sobre path_vertices, sin copiar)."""
+        offsets = self.array("path_offsets")
+        return self.array("path_vertices")[offsets[i]:offsets[i + 1]]
+
+    def order_record(self, i):
+        """Datos de la orden i como diccionario, leyendo solo sus celdas."""
+        label = self.vertex_label
+        delivered = self.array("order_delivered")[i]
+        return {
+            "id": int(self.array("order_ids")[i]),
+            "client_id": str(self.array("client_ids")[self.array("order_clients")[i]]),
+            "origin": label(self.array("order_origins")[i]),
+            "destination": label(self.array("order_destinations")[i]),
+            "cost": float(self.array("order_costs")[i]),
+            "priority": int(self.array("order_priorities")[i]),
+            "status": self.meta["status_names"][self.array("order_status")[i]],
+            "created_at": self.array("order_created")[i].astype(object),
+            "delivered_at": None if np.isnat(delivered) else delivered.astype(object),
+            "path": [label(v) for v in self.order_path(i).tolist()],
+        }
+
+    def to_simulation(self, cls=None):
+        """Reconstruye la Simulation (o la subclase 'cls'). El grafo queda como CSRGraph sobre
+        los arreglos del snapshot y las rutas pasan en bloque al PathStore. Estadísticas y
+        visitas se calculan vectorizadas sobre las columnas y el ranking con una Route por
+        ruta distinta; en Python solo queda crear cada Client y Order e indexarlos por id,
+        estado, cliente y destino: O(nodos + órdenes + rutas distintas).
+        """
+        if cls is None:
+            from sim.simulation import Simulation as cls
+        meta = self.meta
+        labels = self.array("labels").tolist()
+        if self.has_array("detached_labels"):
+            labels += self.array("detached_labels").tolist()
+        vertices = [Vertex(label) for label in labels]  # Grafo y luego vértices ya quitados
+        n = self.vertex_count
+        if meta["directed"]:
+            graph = CSRGraph(vertices[:n], self.array("offsets"), self.array("targets"), self.array("weights"), True,
+                             self.array("in_offsets"), self.array("in_targets"), self.array("in_weights"))
+        else:
+            graph = CSRGraph(vertices[:n], self.array("offsets"), self.array("targets"), self.array("weights"))
+        # Los códigos se traducen por etiqueta: el snapshot no depende del orden de Role
+        lookup = np.array([Role.from_label(name) for name in meta["role_names"]], dtype=np.int8)
+        roles = lookup[self.array("roles")]
+
+        sim = cls.__new__(cls)
+        sim.rng = np.random.default_rng()
+        sim.initializer = SimulationInitializer(meta["n_nodes"], meta["m_edges"], meta["directed"],
+                                                meta["model"], seed=sim.rng)
+        sim.initializer.graph = graph
+        vertex_roles = sim.initializer.set_roles(vertices[:n], roles)
+        if self.has_array("positions"):
+            sim.initializer.positions = dict(zip(vertices[:n], map(tuple, self.array("positions").tolist())))
+        sim.graph, sim.vertex_roles = graph, vertex_roles
+        recharge_index = RechargeIndex.from_arrays(graph, sim.is_recharge, self.array("recharge_station"),
+                                                   self.array("recharge_distance"), self.array("recharge_next_hop"))
+        sim._init_state(recharge_index)  # Nuevo uid: otra copia puede divergir desde la misma versión
+        sim.rng.bit_generator.state = meta["rng_state"]
+        sim.layout_seed = meta["layout_seed"]
+
+        for cid, name, ctype, vid, total in zip(self.array("client_ids").tolist(), self.array("client_names").tolist(),
+                                                self.array("client_types").tolist(), self.array("client_vertices").tolist(),
+                                                self.array("client_total_orders").tolist()):
+            client = Client(cid, name, vertices[vid], ctype)
+            client.total_orders = total
+            sim.clients[cid] = client
+            sim._client_list.append(client)
+        clients = sim._client_list
+
+        status_names = meta["status_names"]
+        path_offsets = self.array("path_offsets")
+        path_vertices = self.array("path_vertices")
+        # Rutas: el búfer del snapshot pasa entero al PathStore (ids = tabla de internado)
+        sim.paths = PathStore.from_arrays(vertices, path_offsets, path_vertices)
+        columns = zip(self.array("order_ids").tolist(), self.array("order_clients").tolist(),
+                      self.array("order_origins").tolist(), self.array("order_destinations").tolist(),
+                      self.array("order_costs").tolist(), self.array("order_priorities").tolist(),
+                      self.array("order_status").tolist(), self.array("order_created").astype(object).tolist(),
+                      self.array("order_delivered").astype(object).tolist())
+        for i, (oid, ci, origin, destination, cost, priority, status, created, delivered) in enumerate(columns):
+            order = Order(oid, clients[ci], vertices[origin], vertices[destination], None, cost, priority, sim.paths)
+            order._path = i  # Ruta i del PathStore (ya cargada)
+            order.status = status_names[status]
+            order.created_at = created
+            order.delivered_at = delivered
+            sim.orders.append(order)
+            sim._index_order(order)
+        if len(sim.orders):
+            sim._next_order_id = int(self.array("order_ids").max()) + 1
+        self._load_aggregates(sim, vertices)
+
+        latency = meta["latency"]
+        sketch = sim.stats.latency_sketch = QuantileSketch(latency["relative_accuracy"])
+        sketch._buckets.update({k: c for k, c in latency["buckets"]})
+        sketch._zeros = latency["zeros"]
+        sketch.count = latency["count"]
+        sim.version = meta["version"]
+        return sim
+
+
+    def _load_aggregates(self, sim, vertices):
+        # Estadísticas, visitas y ranking de rutas calculados sobre las columnas, con el mismo
+        # resultado que registrar las órdenes una por una: las canceladas no cuentan en
+        # estadísticas ni visitas pero sí en el ranking, y cada ruta guarda el costo de su
+        # primera orden
+        names = self.meta["status_names"]
+        status = np.asarray(self.array("order_status"))
+        active = status != names.index("Cancelada") if "Cancelada" in names else np.ones(len(status), dtype=bool)
+        offsets = np.asarray(self.array("path_offsets"))
+        ids = np.asarray(self.array("path_vertices"))
+        lengths = np.diff(offsets)
+        sim.stats.add_many(np.asarray(self.array("order_costs"))[active], lengths[active])
+
+        visits = np.bincount(ids[np.repeat(active, lengths)], minlength=len(vertices))
+        for i in np.flatnonzero(visits).tolist():
+            role = sim.role_of.get(vertices[i])
+            if role is not None:
+                sim._visit_counters[role][vertices[i]] = int(visits[i])
+
+        routes = {}  # bytes de la ruta -> Route (una por ruta distinta)
+        costs = self.array("order_costs").tolist()
+        buffer = ids.astype(np.int32)
+        for i, (start, end) in enumerate(zip(offsets[:-1].tolist(), offsets[1:].tolist())):
+            key = buffer[start:end].tobytes()
+            route = routes.get(key)
+            if route is None:
+                routes[key] = Route([vertices[v] for v in buffer[start:end].tolist()], costs[i])
+            else:
+                route.freq += 1
+        for route in routes.values():
+            sim.route_tree.insert(route, route)
+            sim.route_ranking.update(route)
+
+
+def load_snapshot(directory, mmap=True, cls=None):
+    """Carga un snapshot guardado con save_snapshot() como Simulation (o como 'cls')."""
+    return SimulationSnapshot(directory, mmap).to_simulation(cls)
@@ -0,0 +1,138 @@
+import math
+from collections import Counter
+import numpy as np
+
+# Sketch de cuantiles con error relativo acotado (estilo DDSketch) que admite altas y bajas
+class QuantileSketch:
+    def __init__(self, relative_accuracy=0.01):
+        """
+        Agrupa valores no negativos en cubetas logarítmicas: cada cubeta cubre
+        (gamma^(k-1), gamma^k], por lo que cualquier cuantil se estima con error
+        relativo <= relative_accuracy. La memoria depende del rango de valores, no
+        de la cantidad de muestras.
+        """
+        self.relative_accuracy = relative_accuracy
+        self._gamma = (1 + relative_accuracy) / (1 - relative_accuracy)
+        self._log_gamma = math.log(self._gamma)
+        self._buckets = Counter()  # índice de cubeta -> cantidad
+        self._zeros = 0            # valores <= 0
+        self.count = 0
+
+    def _key(self, value):
+        return math.ceil(math.log(value) / self._log_gamma)
+
+    def add(self, value, n=1):
+        if value <= 0:
+            self._zeros += n
+        else:
+            self._buckets[self._key(value)] += n
+        self.count += n
+
+    def remove(self, value, n=1):
+        if value <= 0:
+            self._zeros -= n
+        else:
+            key = self._key(value)
+            self._buckets[key] -= n
+            if self._buckets[key] <= 0:
+                del self._buckets[key]
+        self.count -= n
+
+    def quantile(self, q):
+        """Estimación del cuantil q (0..1), o None si no hay valores."""
+        if self.count <= 0:
+            return None
+        rank = q * (self.count - 1)
+        seen = self._zeros
+        if rank < seen:
+            return 0.0
+        for key in sorted(self._buckets):
+            seen += self._buckets[key]
+            if rank < seen:
+                return 2 * self._gamma ** key / (self._gamma + 1)
+        return 2 * self._gamma ** max(self._buckets) / (self._gamma + 1)
+
+    def quantiles(self, qs=(0.5, 0.9, 0.99)):
+        """Devuelve {"p50": x, "p90": y, ...} para los cuantiles pedidos."""
+        return {f"p{round(q * 100):g}": self.quantile(q) for q in qs}
+
+
+# Agregados de órdenes actualizados de forma incremental
+class OrderStats:
+    def __init__(self):
+        """
+        Mantiene conteo, suma, mínimo, máximo, histograma de largo de ruta y cuantiles de
+        costo de las órdenes activas (no canceladas), más cuantiles de latencia de cálculo
+        de rutas. Todas las consultas son O(1) respecto de la cantidad de órdenes.
+        """
+        self.count = 0
+        self.total_cost = 0
+        self.total_path_length = 0
+        self.path_length_histogram = Counter()  # largo de ruta (nodos) -> órdenes
+        self.cost_sketch = QuantileSketch()
+        self.latency_sketch = QuantileSketch()  # segundos de cálculo de cada ruta
+        self._costs = Counter()                 # costo exacto -> órdenes (para min/max con bajas)
+        self._min = None
+        self._max = None
+
+    def add(self, order):
+        length = order.path_length
+        self.count += 1
+        self.total_cost += order.cost
+        self.total_path_length += length
+        self.path_length_histogram[length] += 1
+        self.cost_sketch.add(order.cost)
+        self._costs[order.cost] += 1
+        if self._min is None or order.cost < self._min:
+            self._min = order.cost
+        if self._max is None or order.cost > self._max:
+            self._max = order.cost
+
+    def add_many(self, costs, lengths):
+        """Agrega en bloque las órdenes con esos costos y largos de ruta (arreglos de NumPy
+        alineados), con el mismo resultado que add() por cada una. Se usa al cargar snapshots.
+        """
+        if len(costs) == 0:
+            return
+        self.count += len(costs)
+        self.total_cost += costs.sum().item()
+        self.total_path_length += int(lengths.sum())
+        values, counts = np.unique(lengths, return_counts=True)
+        self.path_length_histogram.update(dict(zip(values.tolist(), counts.tolist())))
+        values, counts = np.unique(costs, return_counts=True)
+        for value, n in zip(values.tolist(), counts.tolist()):
+            self.cost_sketch.add(value, n)
+            self._costs[value] += n
+        low, high = values[0].item(), values[-1].item()
+        self._min = low if self._min is None else min(self._min, low)
+        self._max = high if self._max is None else max(self._max, high)
+
+    def remove(self, order):
+        length = order.path_length
+        self.count -= 1
+        self.total_cost -= order.cost
+        self.total_path_length -= length
+        self.path_length_histogram[length] -= 1
+        if self.path_length_histogram[length] <= 0:
+            del self.path_length_histogram[length]
+        self.cost_sketch.remove(order.cost)
+        self._costs[order.cost] -= 1
+        if self._costs[order.cost] <= 0:
+            del self._costs[order.cost]
+            # Solo se recalcula si se fue el mínimo o el máximo (sobre costos distintos)
+            if order.cost == self._min:
+                self._min = min(self._costs, default=None)
+            if order.cost == self._max:
+                self._max = max(self._costs, default=None)
+
+    def add_latency(self, seconds):
+        self.latency_sketch.add(seconds)
+
+    def min_cost(self):
+        return self._min if self._min is not None else 0
+
+    def max_cost(self):
+        return self._max if self._max is not None else 0
+
+    def avg_path_length(self):
+        return self.total_path_length / self.count if self.count else 0
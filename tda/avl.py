@@ -1,29 +1,151 @@
 # Nodo individual del árbol AVL
 class AVLNode:
-    def __init__(self, key, value):
+    __slots__ = 'key', 'value', 'sort_key', 'left', 'right', 'height', 'size'  # Optimiza el uso de memoria
+
+    def __init__(self, key, value, sort_key=None):
         self.key = key      # Generalmente una instancia de Route
         self.value = value  # Puede ser la misma instancia o frecuencia
+        self.sort_key = key if sort_key is None else sort_key  # Clave usada para comparar
         self.left = None # Hijo izquierdo
         self.right = None # Hijo derecho
         self.height = 1 # Altura inicial
+        self.size = 1 # Cantidad de nodos del subárbol (estadísticos de orden)
 
-# Árbol AVL con inserción balanceada
+# Árbol AVL iterativo con índice hash para rutas repetidas
 class AVLTree:
     def __init__(self):
         self.root = None # Raiz del árbol
+        self._index = {} # sort_key -> nodo (búsqueda O(1) de claves repetidas)
 
     ### --- API pública --- ###
     def insert(self, key, value=None):
-        # Inserta clave y valor en el árbol
-        self.root = self._insert(self.root, key, value)
+        """Inserta clave y valor. Si la clave ya existe aumenta la frecuencia sin descender el árbol.
+        Devuelve el valor almacenado para la clave.
+        """
+        sort_key = self._sort_key(key)
+        node = self._index.get(sort_key)
+        if node is not None:
+            node.value.freq += 1  # Aumenta frecuencia si es ruta repetida
+            return node.value
+
+        new_node = AVLNode(key, value, sort_key)
+        self._index[sort_key] = new_node
+        if self.root is None:
+            self.root = new_node
+            return value
+
+        # Descenso iterativo guardando el camino para rebalancear de abajo hacia arriba
+        path = []
+        node = self.root
+        while node:
+            path.append(node)
+            node = node.left if sort_key < node.sort_key else node.right
+
+        parent = path[-1]
+        if sort_key < parent.sort_key:
+            parent.left = new_node
+        else:
+            parent.right = new_node
+        self._rebalance_path(path)
+        return value
+
+    def search(self, key):
+        """Devuelve el valor asociado a la clave o None si no existe."""
+        node = self._index.get(self._sort_key(key))
+        return node.value if node else None
+
+    def delete(self, key):
+        """Elimina la clave del árbol. Devuelve True si existía."""
+        sort_key = self._sort_key(key)
+        if sort_key not in self._index:
+            return False
+
+        path = []
+        node = self.root
+        while node.sort_key != sort_key:
+            path.append(node)
+            node = node.left if sort_key < node.sort_key else node.right
+        del self._index[sort_key]
+
+        if node.left and node.right:
+            # Reemplaza por el sucesor in-order y elimina el sucesor
+            path.append(node)
+            successor = node.right
+            while successor.left:
+                path.append(successor)
+                successor = successor.left
+            node.key, node.value, node.sort_key = successor.key, successor.value, successor.sort_key
+            self._index[node.sort_key] = node
+            node = successor
+
+        child = node.left or node.right
+        if not path:
+            self.root = child
+            return True
+        parent = path[-1]
+        if parent.left is node:
+            parent.left = child
+        else:
+            parent.right = child
+        self._rebalance_path(path)
+        return True
+
+    def in_order(self, reverse=False):
+        """Generador del recorrido in-order (clave, valor) sin recursión; reverse=True de mayor a menor."""
+        first, second = ("right", "left") if reverse else ("left", "right")
+        stack = []
+        node = self.root
+        while stack or node:
+            while node:
+                stack.append(node)
+                node = getattr(node, first)
+            node = stack.pop()
+            yield node.key, node.value
+            node = getattr(node, second)
+
+    def rank(self, key):
+        """Cantidad de claves estrictamente menores que key (O(log n))."""
+        sort_key = self._sort_key(key)
+        count = 0
+        node = self.root
+        while node:
+            if sort_key <= node.sort_key:
+                node = node.left
+            else:
+                count += self._size(node.left) + 1
+                node = node.right
+        return count
+
+    def select(self, i):
+        """Devuelve (clave, valor) de la i-ésima clave en orden (0-indexado)."""
+        if not 0 <= i < len(self):
+            raise IndexError("Índice fuera de rango")
+        node = self.root
+        while node:
+            left = self._size(node.left)
+            if i < left:
+                node = node.left
+            elif i == left:
+                return node.key, node.value
+            else:
+                i -= left + 1
+                node = node.right
 
     def get_in_order(self):
         """Devuelve una lista ordenada (clave, valor)"""
-        result = []
-        self._in_order(self.root, result)
-        return result
+        return list(self.in_order())
+
+    def __len__(self):
+        return len(self._index)
+
+    def __contains__(self, key):
+        return self._sort_key(key) in self._index
 
     ### --- Métodos internos --- ###
+    def _sort_key(self, key):
+        # Las rutas traen su clave precalculada; otras claves se comparan directamente
+        return getattr(key, "sort_key", key)
+
     def _height(self, node):
         # Altura del nodo o 0 si es None
         return node.height if node else 0
@@ -32,9 +154,14 @@ class AVLTree:
         # Calcula el factor de balance
         return self._height(node.left) - self._height(node.right) if node else 0
 
+    def _size(self, node):
+        # Tamaño del subárbol o 0 si es None
+        return node.size if node else 0
+
     def _update_height(self, node):
-        # Actualiza altura del nodo según hijos
+        # Actualiza altura (y tamaño del subárbol) del nodo según hijos
         node.height = 1 + max(self._height(node.left), self._height(node.right))
+        node.size = 1 + self._size(node.left) + self._size(node.right)
 
     def _rotate_right(self, y):
         # Rotación simple a la derecha
@@ -74,23 +201,16 @@ class AVLTree:
 
         return node
 
-    def _insert(self, node, key, value):
-        if not node:
-            return AVLNode(key, value)
-
-        if key == node.key:
-            node.value.freq += 1  # Aumenta frecuencia si es ruta repetida
-        elif key < node.key:
-            node.left = self._insert(node.left, key, value)
-        else:
-            node.right = self._insert(node.right, key, value)
-
-        self._update_height(node)
-        return self._balance(node)
-
-    def _in_order(self, node, result):
-        # Recorrido in-order: izquierda -> nodo -> derecha
-        if node:
-            self._in_order(node.left, result)
-            result.append((node.key, node.value))
-            self._in_order(node.right, result)
+    def _rebalance_path(self, path):
+        # Recorre el camino de abajo hacia arriba actualizando alturas y rotando si hace falta
+        for i in range(len(path) - 1, -1, -1):
+            node = path[i]
+            self._update_height(node)
+            subtree = self._balance(node)
+            if subtree is not node:
+                if i == 0:
+                    self.root = subtree
+                elif path[i - 1].left is node:
+                    path[i - 1].left = subtree
+                else:
+                    path[i - 1].right = subtree
@@ -0,0 +1,87 @@
+from array import array
+import numpy as np
+
+# Almacén compartido de rutas: un único búfer plano de ids de vértice con offsets
+class PathStore:
+    def __init__(self):
+        """
+        Guarda cada ruta una sola vez: la ruta i ocupa _buffer[_offsets[i]:_offsets[i + 1]].
+        Los vértices se internan (Vertex <-> id entero), así cada paso de una ruta ocupa
+        4 bytes en lugar de una lista de referencias por orden.
+
+        Se comporta como una secuencia de solo lectura de rutas (listas de vértices):
+        len(), índices (también negativos y slices) e iteración.
+        """
+        self._vertices = []          # id -> Vertex
+        self._ids = {}               # Vertex -> id
+        self._labels = {}            # str(Vertex) -> id (consultas por etiqueta)
+        self._buffer = array("i")    # ids de vértice (int32) de todas las rutas, concatenadas
+        self._offsets = array("q", [0])
+
+    @classmethod
+    def from_arrays(cls, vertices, offsets, ids):
+        """Almacén con las rutas ya aplanadas (ver to_arrays): 'ids' indexa 'vertices', que
+        pasa a ser la tabla de internado. Copia los arreglos en bloque, sin recorrer rutas.
+        """
+        store = cls()
+        store._vertices = list(vertices)
+        store._ids = {v: i for i, v in enumerate(store._vertices)}
+        store._labels = {str(v): i for i, v in enumerate(store._vertices)}
+        store._buffer = array("i", np.asarray(ids, dtype=np.int32).tobytes())
+        store._offsets = array("q", np.asarray(offsets, dtype=np.int64).tobytes())
+        return store
+
+    ### --- Escritura --- ###
+    def intern(self, v):
+        """Id entero del vértice v (se asigna la primera vez que aparece)."""
+        i = self._ids.get(v)
+        if i is None:
+            i = self._ids[v] = self._labels[str(v)] = len(self._vertices)
+            self._vertices.append(v)
+        return i
+
+    def append(self, path):
+        """Agrega una ruta y devuelve su índice."""
+        self._buffer.extend(map(self.intern, path))
+        self._offsets.append(len(self._buffer))
+        return len(self._offsets) - 2
+
+    ### --- Lectura --- ###
+    def path(self, i):
+        """Ruta i como lista de vértices."""
+        vertices = self._vertices
+        return [vertices[j] for j in self._buffer[self._offsets[i]:self._offsets[i + 1]]]
+
+    def length(self, i):
+        """Cantidad de nodos de la ruta i (O(1))."""
+        return self._offsets[i + 1] - self._offsets[i]
+
+    def vertex_id(self, v):
+        """Id interno del vértice v o de su etiqueta (str); None si no aparece en ninguna ruta."""
+        return self._labels.get(v) if isinstance(v, str) else self._ids.get(v)
+
+    def vertices(self):
+        """Tabla de internado: lista id -> Vertex."""
+        return self._vertices
+
+    def to_arrays(self):
+        """Copia (offsets, ids de vértice) como arreglos de NumPy; los ids indexan vertices()."""
+        return np.array(self._offsets, dtype=np.int64), np.array(self._buffer, dtype=np.int64)
+
+    def __len__(self):
+        return len(self._offsets) - 1
+
+    def __getitem__(self, i):
+        if isinstance(i, slice):
+            return [self.path(j) for j in range(*i.indices(len(self)))]
+        if i < 0:
+            i += len(self)
+        if not 0 <= i < len(self):
+            raise IndexError("índice de ruta fuera de rango")
+        return self.path(i)
+
+    def __iter__(self):
+        return (self.path(i) for i in range(len(self)))
+
+    def __repr__(self):
+        return f"PathStore({len(self)} rutas, {len(self._buffer)} pasos, {len(self._vertices)} vértices)"
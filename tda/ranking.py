@@ -0,0 +1,68 @@
+from tda.avl import AVLTree
+
+# Ranking de rutas por (frecuencia, costo) sobre un AVL con estadísticos de orden
+class RouteRanking:
+    def __init__(self):
+        """
+        Mantiene las rutas ordenadas por (freq, cost) para consultas top-k, rank y percentil.
+
+        Cada ruta se guarda bajo la clave (freq, cost, sort_key); cuando su frecuencia
+        cambia, update(route) la reubica en O(log n).
+        """
+        self._tree = AVLTree()
+        self._keys = {}  # sort_key de la ruta -> clave actual en el árbol
+
+    ### --- Actualización --- ###
+    def update(self, route):
+        """Inserta la ruta o la reubica tras un cambio de frecuencia/costo."""
+        old_key = self._keys.get(route.sort_key)
+        new_key = (route.freq, route.cost, route.sort_key)
+        if old_key == new_key:
+            return
+        if old_key is not None:
+            self._tree.delete(old_key)
+        self._tree.insert(new_key, route)
+        self._keys[route.sort_key] = new_key
+
+    def remove(self, route):
+        """Quita la ruta del ranking. Devuelve True si estaba."""
+        key = self._keys.pop(route.sort_key, None)
+        return key is not None and self._tree.delete(key)
+
+    ### --- Consultas --- ###
+    def top_k(self, k):
+        """Devuelve las k rutas más frecuentes (a igual frecuencia, las de mayor costo)."""
+        result = []
+        for _, route in self._tree.in_order(reverse=True):
+            if len(result) >= k:
+                break
+            result.append(route)
+        return result
+
+    def rank(self, route):
+        """Posición de la ruta en el ranking (1 = más frecuente), o None si no está."""
+        key = self._keys.get(route.sort_key)
+        if key is None:
+            return None
+        return len(self._tree) - self._tree.rank(key)
+
+    def percentile(self, route):
+        """Porcentaje de rutas con (freq, cost) menor o igual al de la ruta, o None."""
+        key = self._keys.get(route.sort_key)
+        if key is None:
+            return None
+        return 100.0 * (self._tree.rank(key) + 1) / len(self._tree)
+
+    def at_percentile(self, p):
+        """Ruta ubicada en el percentil p (0-100) del ranking."""
+        if not len(self._tree):
+            return None
+        i = min(len(self._tree) - 1, max(0, int(round(p / 100.0 * (len(self._tree) - 1)))))
+        return self._tree.select(i)[1]
+
+    def __len__(self):
+        return len(self._tree)
+
+    def __iter__(self):
+        """Recorre las rutas de mayor a menor (freq, cost)."""
+        return (route for _, route in self._tree.in_order(reverse=True))
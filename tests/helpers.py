@@ -0,0 +1,58 @@
+"""Grafos de prueba y referencias por fuerza bruta para comparar los algoritmos."""
+import random
+from model.graph import Graph
+
+INF = float('inf')
+
+
+def random_graph(n, m, directed=False, seed=0, max_weight=20, connected=True):
+    """Graph con n vértices ("V0".."Vn-1") y ~m aristas de peso entero en [1, max_weight].
+    Con connected=True primero se arma un árbol (o un ciclo si es dirigido) que lo conecta.
+    """
+    rng = random.Random(seed)
+    graph = Graph(directed)
+    vertices = [graph.insert_vertex(f"V{i}") for i in range(n)]
+    pairs = set()
+    if connected and n > 1:
+        if directed:
+            pairs.update((i, (i + 1) % n) for i in range(n))
+        else:
+            pairs.update((rng.randrange(i), i) for i in range(1, n))
+    while len(pairs) < m and n > 1:
+        u, v = rng.sample(range(n), 2)
+        if directed or (v, u) not in pairs:
+            pairs.add((u, v))
+    for u, v in sorted(pairs):
+        graph.insert_edge(vertices[u], vertices[v], rng.randint(1, max_weight))
+    return graph, vertices
+
+
+def all_pairs(graph):
+    """Distancias mínimas entre todos los pares (Floyd-Warshall): {u: {v: d}}."""
+    vertices = list(graph.vertices())
+    dist = {u: {v: (0 if u is v else INF) for v in vertices} for u in vertices}
+    for u in vertices:
+        for e in graph.incident_edges(u):
+            v = e.opposite(u)
+            dist[u][v] = min(dist[u][v], e.element())
+    for k in vertices:
+        dk = dist[k]
+        for i in vertices:
+            dik = dist[i][k]
+            if dik == INF:
+                continue
+            di = dist[i]
+            for j in vertices:
+                if dik + dk[j] < di[j]:
+                    di[j] = dik + dk[j]
+    return dist
+
+
+def path_cost(graph, path):
+    """Costo de recorrer 'path' arista por arista (falla si falta alguna)."""
+    total = 0
+    for u, v in zip(path, path[1:]):
+        edge = graph.get_edge(u, v)
+        assert edge is not None, f"No hay arista {u} -> {v}"
+        total += edge.element()
+    return total
@@ -0,0 +1,103 @@
+import asyncio
+import json
+import threading
+import httpx
+import pytest
+from fastapi.testclient import TestClient
+from api import global_simulation, pagination
+from api.main import app
+from sim.simulation import Simulation
+
+
+@pytest.fixture
+def sim():
+    simulation = Simulation(50, 100, seed=121)
+    simulation.generate_orders(40)
+    global_simulation.set(simulation)
+    yield simulation
+    global_simulation.set(None)
+
+
+def test_lookups_and_pages(sim):
+    client = TestClient(app)
+    order = sim.orders[3]
+    assert client.get(f"/orders/orders/{order.id}").json()["cost"] == order.cost
+    assert client.get(f"/clients/{order.client.id}").json()["total_orders"] == order.client.total_orders
+    page = client.get("/orders/", params={"offset": 5, "limit": 10})
+    assert [o["id"] for o in page.json()] == [str(o.id) for o in sim.orders[5:15]]
+    assert page.headers["X-Total-Count"] == str(len(sim.orders))
+    assert page.headers["X-Next-Offset"] == "15"
+    summary = client.get("/info/reports/summary").json()
+    assert summary["total_orders"] == len(sim.orders)
+
+
+def test_summary_uses_one_population(sim):
+    client = TestClient(app)
+    for order in sim.orders[:5]:
+        sim.cancel_order(order)
+    active = [o for o in sim.orders if o.status != "Cancelada"]
+    summary = client.get("/info/reports/summary").json()
+    assert summary["total_orders"] == len(active)
+    assert summary["cancelled_orders"] == 5
+    assert summary["total_distance"] == pytest.approx(sum(o.cost for o in active))
+    assert summary["max_order_cost"] == max(o.cost for o in active)
+    assert summary["min_order_cost"] == min(o.cost for o in active)
+    assert summary["avg_route_length"] == pytest.approx(sum(o.path_length for o in active) / len(active))
+
+
+def test_ndjson_streams_every_record(sim, monkeypatch):
+    monkeypatch.setattr(pagination, "STREAM_CHUNK", 7)
+    client = TestClient(app)
+    lines = client.get("/orders/", params={"format": "ndjson", "fields": "id,cost"}).text.splitlines()
+    assert [json.loads(line) for line in lines] == [{"id": str(o.id), "cost": o.cost} for o in sim.orders]
+    lines = client.get("/clients/", params={"format": "ndjson", "offset": 2}).text.splitlines()
+    assert [json.loads(line)["id"] for line in lines] == [c.id for c in sim.get_clients()[2:]]
+
+
+def test_ndjson_is_consistent_under_concurrent_writes(sim, monkeypatch):
+    monkeypatch.setattr(pagination, "STREAM_CHUNK", 5)
+    client = TestClient(app)
+    stop = threading.Event()
+
+    def writer():
+        while not stop.is_set():
+            sim.generate_orders(5)
+            for order in sim.get_orders(status="Pendiente")[:2]:
+                sim.cancel_order(order)
+
+    thread = threading.Thread(target=writer, daemon=True)
+    thread.start()
+    try:
+        for _ in range(5):
+            response = client.get("/orders/", params={"format": "ndjson"})
+            records = [json.loads(line) for line in response.text.splitlines()]
+            assert len(records) == int(response.headers["X-Total-Count"])
+            assert [r["id"] for r in records] == [str(i) for i in range(1, len(records) + 1)]
+    finally:
+        stop.set()
+        thread.join(5)
+
+
+def test_handlers_do_not_block_the_event_loop_while_a_writer_holds_the_lock(sim):
+    holding, release = threading.Event(), threading.Event()
+
+    def writer():
+        with sim.lock.write():
+            holding.set()
+            release.wait(5)
+
+    async def main():
+        transport = httpx.ASGITransport(app=app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://test") as client:
+            request = asyncio.create_task(client.get(f"/orders/orders/{sim.orders[0].id}"))
+            ticks = 0
+            while ticks < 5:
+                await asyncio.sleep(0.02)
+                ticks += 1
+            assert not request.done()  # Espera al escritor sin frenar el loop
+            release.set()
+            return (await asyncio.wait_for(request, 5)).status_code
+
+    threading.Thread(target=writer, daemon=True).start()
+    holding.wait(5)
+    assert asyncio.run(main()) == 200
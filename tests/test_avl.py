@@ -0,0 +1,64 @@
+import bisect
+import random
+import pytest
+from tda.avl import AVLTree
+from domain.route import Route
+
+
+def check_invariants(tree):
+    # Devuelve (altura, tamaño) verificando orden, balance y tamaños de cada subárbol
+    def walk(node, low, high):
+        if node is None:
+            return 0, 0
+        assert (low is None or low < node.sort_key) and (high is None or node.sort_key < high)
+        lh, ls = walk(node.left, low, node.sort_key)
+        rh, rs = walk(node.right, node.sort_key, high)
+        assert abs(lh - rh) <= 1
+        assert node.height == 1 + max(lh, rh) and node.size == 1 + ls + rs
+        return node.height, node.size
+    _, size = walk(tree.root, None, None)
+    assert size == len(tree)
+
+
+def test_random_inserts_and_deletes_match_sorted_list():
+    rng = random.Random(51)
+    tree, reference = AVLTree(), []
+    for _ in range(2000):
+        key = rng.randrange(500)
+        if rng.random() < 0.6:
+            if key not in tree:
+                tree.insert(key, str(key))
+                bisect.insort(reference, key)
+        else:
+            assert tree.delete(key) == (key in reference)
+            if key in reference:
+                reference.remove(key)
+        assert len(tree) == len(reference)
+    check_invariants(tree)
+    assert [k for k, _ in tree.in_order()] == reference
+    assert [k for k, _ in tree.in_order(reverse=True)] == reference[::-1]
+    for key in range(-1, 501, 7):
+        assert tree.rank(key) == bisect.bisect_left(reference, key)
+        assert tree.search(key) == (str(key) if key in reference else None)
+    for i, key in enumerate(reference):
+        assert tree.select(i) == (key, str(key))
+    with pytest.raises(IndexError):
+        tree.select(len(reference))
+
+
+def test_sequential_inserts_stay_balanced():
+    tree = AVLTree()
+    for key in range(1024):
+        tree.insert(key, key)
+    check_invariants(tree)
+    assert tree.root.height == 11
+
+
+def test_repeated_route_increments_frequency():
+    tree = AVLTree()
+    first = Route(["A", "B", "C"], 7)
+    assert tree.insert(first, first) is first
+    again = Route(["A", "B", "C"], 7)
+    assert tree.insert(again, again) is first
+    assert first.freq == 2 and len(tree) == 1
+    assert tree.search(again) is first
@@ -0,0 +1,157 @@
+import asyncio
+import threading
+import time
+from sim.concurrency import RWLock
+from sim.simulation import Simulation
+
+WAIT = 0.2  # Segundos que se da a un hilo para (no) avanzar
+
+
+def start(target):
+    thread = threading.Thread(target=target, daemon=True)
+    thread.start()
+    return thread
+
+
+def test_readers_share_the_lock():
+    lock = RWLock()
+    inside = threading.Barrier(3, timeout=2)
+
+    def reader():
+        with lock.read():
+            inside.wait()  # Los tres lectores deben estar dentro a la vez
+    threads = [start(reader) for _ in range(2)]
+    with lock.read():
+        inside.wait()
+    for t in threads:
+        t.join(2)
+
+
+def test_writer_excludes_readers_and_writers():
+    lock = RWLock()
+    events = []
+    released = threading.Event()
+
+    def writer():
+        with lock.write():
+            events.append("write")
+            released.wait(2)
+            events.append("write done")
+
+    def reader():
+        with lock.read():
+            events.append("read")
+
+    w = start(writer)
+    time.sleep(WAIT)
+    threads = [start(reader), start(writer)]
+    time.sleep(WAIT)
+    assert events == ["write"]  # Lector y segundo escritor esperan
+    released.set()
+    for t in [w] + threads:
+        t.join(2)
+    assert events[:2] == ["write", "write done"] and events.count("read") == 1
+
+
+def test_waiting_writer_blocks_new_readers_but_not_queued_ones():
+    lock = RWLock()
+    order = []
+    first_reader_done = threading.Event()
+
+    def writer():
+        with lock.write():
+            order.append("write")
+
+    def late_reader():
+        with lock.read():
+            order.append("late read")
+
+    with lock.read():
+        start(writer)
+        time.sleep(WAIT)  # El escritor ya espera: un lector nuevo no debe adelantarse
+        late = start(late_reader)
+        time.sleep(WAIT)
+        assert order == []
+    late.join(2)
+    assert order == ["write", "late read"]
+
+
+def test_write_is_reentrant_and_can_read():
+    lock = RWLock()
+    with lock.write():
+        with lock.write():
+            with lock.read():
+                pass
+        blocked = threading.Event()
+        t = start(lambda: (lock.read().__enter__(), blocked.set()))
+        assert not blocked.wait(WAIT)  # Otro hilo sigue sin poder leer
+    assert blocked.wait(2)
+    t.join(2)
+
+
+def test_generate_orders_takes_the_write_lock_reentrantly():
+    sim = Simulation(30, 60, seed=111)
+    assert len(sim.generate_orders(10)) > 0  # write() del lote -> _register_order -> write()
+    done = threading.Event()
+    start(lambda: (sim.lock.write().__enter__(), done.set()))
+    assert done.wait(2)  # El lock quedó libre
+
+
+def test_read_async_does_not_block_the_event_loop():
+    lock = RWLock()
+    holding = threading.Event()
+    release = threading.Event()
+
+    def writer():
+        with lock.write():
+            holding.set()
+            release.wait(2)
+
+    async def main():
+        ticks = 0
+
+        async def reader():
+            async with lock.read_async():
+                return ticks
+
+        task = asyncio.create_task(reader())
+        while ticks < 5:  # El loop sigue corriendo mientras el lector espera
+            await asyncio.sleep(0.02)
+            ticks += 1
+        assert not task.done()
+        release.set()
+        return await asyncio.wait_for(task, 2)
+
+    start(writer)
+    holding.wait(2)
+    assert asyncio.run(main()) == 5
+
+
+def test_cancelled_read_async_releases_the_lock():
+    lock = RWLock()
+    holding = threading.Event()
+    release = threading.Event()
+
+    def writer():
+        with lock.write():
+            holding.set()
+            release.wait(2)
+
+    async def main():
+        task = asyncio.create_task(lock.read_async().__aenter__())
+        await asyncio.sleep(WAIT)
+        task.cancel()
+        release.set()
+        try:
+            await task
+        except asyncio.CancelledError:
+            pass
+        await asyncio.sleep(WAIT)  # El hilo obtiene el lock y lo suelta en el callback
+
+    w = start(writer)
+    holding.wait(2)
+    asyncio.run(main())
+    w.join(2)
+    acquired = threading.Event()
+    start(lambda: (lock.write().__enter__(), acquired.set()))
+    assert acquired.wait(2)
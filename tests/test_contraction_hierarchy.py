@@ -0,0 +1,109 @@
+import random
+import pytest
+from sim.contraction_hierarchy import ContractionHierarchy
+from sim.simulation import Simulation
+from helpers import random_graph, all_pairs, path_cost
+
+INF = float('inf')
+
+
+def check_against(hierarchy, graph, dist):
+    vertices = list(graph.vertices())
+    for u in vertices:
+        for v in vertices:
+            path, cost = hierarchy.shortest_path(u, v)
+            assert cost == dist[u][v] == hierarchy.distance(u, v), (u, v)
+            if cost == INF:
+                assert path is None
+            else:
+                assert path[0] is u and path[-1] is v and path_cost(graph, path) == cost
+
+
+@pytest.mark.parametrize("directed", [False, True])
+@pytest.mark.parametrize("connected", [True, False])
+@pytest.mark.parametrize("core_degree", [16, 4, 1])  # Sin núcleo, núcleo parcial (dirigido), todo núcleo
+def test_queries_match_floyd_warshall(directed, connected, core_degree):
+    graph, _ = random_graph(60, 200, directed, seed=251, connected=connected)
+    hierarchy = ContractionHierarchy(graph, core_degree=core_degree)
+    check_against(hierarchy, graph, all_pairs(graph))
+
+
+def test_core_sizes():
+    # Los casos de arriba cubren contracción completa, núcleo parcial y todo el grafo como núcleo
+    graph, _ = random_graph(60, 200, True, seed=251)
+    core = {}
+    for core_degree in (16, 4, 1):
+        hierarchy = ContractionHierarchy(graph, core_degree=core_degree)
+        top = hierarchy.rank.max()
+        core[core_degree] = int((hierarchy.rank == top).sum()) if hierarchy._core_rank is not None else 0
+    assert core[16] == 0 and 0 < core[4] < 60 and core[1] == 60
+
+
+@pytest.mark.parametrize("settle_limit", [1, 64])
+def test_frozen_graph_and_witness_limit(settle_limit):
+    graph, _ = random_graph(40, 90, seed=252)
+    hierarchy = ContractionHierarchy(graph.freeze(), settle_limit=settle_limit)
+    check_against(hierarchy, graph.freeze(), all_pairs(graph))
+
+
+def test_integer_weights_give_integer_costs():
+    graph, vertices = random_graph(30, 60, seed=253)
+    hierarchy = ContractionHierarchy(graph)
+    assert hierarchy.arc_weight.dtype.kind == "i"
+    assert all(type(hierarchy.distance(vertices[0], v)) is int for v in vertices)
+
+
+@pytest.mark.parametrize("directed", [False, True])
+@pytest.mark.parametrize("core_degree", [16, 2])
+def test_max_cost_cuts_longer_paths(directed, core_degree):
+    graph, vertices = random_graph(40, 90, directed, seed=254)
+    dist = all_pairs(graph)
+    hierarchy = ContractionHierarchy(graph, core_degree=core_degree)
+    rng = random.Random(254)
+    for _ in range(300):
+        u, v = rng.choice(vertices), rng.choice(vertices)
+        limit = rng.choice([dist[u][v], dist[u][v] - 1, rng.randint(0, 60)])
+        path, cost = hierarchy.shortest_path(u, v, max_cost=limit)
+        if dist[u][v] <= limit:
+            assert cost == dist[u][v] and path_cost(graph, path) == cost
+        else:
+            assert (path, cost) == (None, INF)
+            assert hierarchy.distance(u, v, max_cost=limit) == INF
+
+
+def test_save_load_and_fingerprint(tmp_path):
+    graph, vertices = random_graph(40, 90, seed=255)
+    hierarchy = ContractionHierarchy(graph)
+    hierarchy.save(tmp_path / "ch")
+    loaded = ContractionHierarchy.load(tmp_path / "ch", graph.freeze())
+    check_against(loaded, graph, all_pairs(graph))
+
+    other, _ = random_graph(40, 90, seed=256)
+    with pytest.raises(ValueError):
+        ContractionHierarchy.load(tmp_path / "ch", other)
+
+    graph.insert_edge(vertices[0], vertices[1], 99)  # Cambia un peso: otra huella
+    assert not hierarchy.valid
+    with pytest.raises(ValueError):
+        hierarchy.save(tmp_path / "ch2")
+    with pytest.raises(ValueError):
+        ContractionHierarchy.load(tmp_path / "ch", graph)
+
+
+def test_simulation_routes_do_not_change(tmp_path):
+    sim = Simulation(80, 160, model="geometric", seed=257)
+    rng = random.Random(257)
+    vertices = list(sim.graph.vertices())
+    pairs = [(rng.choice(vertices), rng.choice(vertices)) for _ in range(60)]
+    expected = [sim.find_route(u, v)[1] for u, v in pairs]
+    plain = [sim.shortest_path(u, v, "dijkstra")[1] for u, v in pairs]
+
+    sim.enable_contraction_hierarchy(tmp_path / "ch")
+    assert [sim.find_route(u, v)[1] for u, v in pairs] == expected
+    assert [sim.shortest_path(u, v, "ch")[1] for u, v in pairs] == plain
+
+    reopened = Simulation(80, 160, model="geometric", seed=257)
+    hierarchy = reopened.enable_contraction_hierarchy(tmp_path / "ch")  # Se abre sin recalcular
+    by_label = {str(v): v for v in reopened.graph.vertices()}
+    assert [reopened.shortest_path(by_label[str(u)], by_label[str(v)], "ch")[1] for u, v in pairs] == plain
+    assert hierarchy.arc_tail.__class__.__name__ == "memmap"
@@ -0,0 +1,56 @@
+import numpy as np
+import pytest
+from model.csr_graph import CSRGraph
+from helpers import random_graph, all_pairs, path_cost
+
+
+@pytest.mark.parametrize("directed", [False, True])
+def test_freeze_keeps_vertices_and_edges(directed):
+    graph, vertices = random_graph(30, 70, directed, seed=1)
+    frozen = graph.freeze()
+    assert list(frozen.vertices()) == vertices
+    for v in vertices:
+        assert sorted(frozen.neighbors(v)) == sorted(graph.neighbors(v))
+        assert frozen.degree(v) == graph.degree(v)
+        assert frozen.degree(v, outgoing=False) == graph.degree(v, outgoing=False)
+    for e in graph.edges():
+        u, v = e.endpoints()
+        assert frozen.get_edge(u, v).element() == e.element()
+    assert frozen.edge_count() == len(graph.edges())
+
+
+@pytest.mark.parametrize("directed", [False, True])
+def test_dijkstra_matches_floyd_warshall(directed):
+    graph, vertices = random_graph(25, 50, directed, seed=2)
+    frozen = graph.freeze()
+    dist = all_pairs(graph)
+    for u in vertices[:8]:
+        for v in vertices:
+            for g in (graph, frozen):
+                path, cost = g.dijkstra_shortest_path(u, v)
+                assert cost == dist[u][v]
+                assert path[0] is u and path[-1] is v
+                assert path_cost(graph, path) == cost
+
+
+def test_dijkstra_unreachable():
+    graph, vertices = random_graph(10, 0, seed=3, connected=False)
+    assert graph.freeze().dijkstra_shortest_path(vertices[0], vertices[1]) == (None, float('inf'))
+
+
+def test_integer_weights_stay_integer():
+    graph, vertices = random_graph(20, 40, seed=4)
+    frozen = graph.freeze()
+    assert np.issubdtype(frozen.csr_arrays()[2].dtype, np.integer)
+    assert isinstance(frozen.get_edge(*next(iter(graph.edges())).endpoints()).element(), int)
+    _, cost = frozen.dijkstra_shortest_path(vertices[0], vertices[-1])
+    assert isinstance(cost, int)
+
+
+def test_from_edges_matches_from_graph():
+    graph, vertices = random_graph(40, 90, seed=5)
+    frozen = graph.freeze()
+    src, dst, weights = frozen.edge_arrays()
+    rebuilt = CSRGraph.from_edges(vertices, src, dst, weights)
+    for a, b in zip(frozen.csr_arrays(), rebuilt.csr_arrays()):
+        assert np.array_equal(a, b)
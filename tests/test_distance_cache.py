@@ -0,0 +1,67 @@
+import random
+import numpy as np
+import pytest
+from sim.distance_cache import DistanceCache
+from sim.routing import EnergyAwareRouter
+from helpers import random_graph, all_pairs, path_cost
+
+AUTONOMY = 25
+
+
+@pytest.mark.parametrize("on_disk", [False, True])
+def test_distances_and_paths_match_brute_force(on_disk, tmp_path):
+    graph, vertices = random_graph(30, 60, seed=31)
+    dist = all_pairs(graph)
+    sources = vertices[:8]
+    cache = DistanceCache(graph, sources, str(tmp_path / "cache") if on_disk else None)
+    for s in sources:
+        for v in vertices:
+            assert cache.distance(s, v) == dist[s][v]
+            path = cache.path(s, v)
+            assert path[0] is s and path[-1] is v and path_cost(graph, path) == dist[s][v]
+    if on_disk:
+        assert np.array_equal(np.load(tmp_path / "cache_dist.npy"), cache.distances)
+
+
+@pytest.mark.parametrize("directed", [False, True])
+def test_cached_router_matches_uncached(directed):
+    graph, vertices = random_graph(35, 70, directed, seed=32)
+    stations = set(random.Random(32).sample(vertices, 7))
+    origins = [v for v in vertices if v not in stations][:5]
+    plain = EnergyAwareRouter(graph, stations.__contains__, AUTONOMY)
+    cached = EnergyAwareRouter(graph, stations.__contains__, AUTONOMY)
+    cached.use_distance_cache(DistanceCache(graph, origins + sorted(stations)))
+    for origin in origins:
+        for destination in vertices:
+            expected = plain.route(origin, destination)
+            path, cost = cached.route(origin, destination)
+            if expected[0] is None:
+                assert path is None
+                continue
+            assert cost == expected[1] and type(cost) is type(expected[1])
+            assert path_cost(graph, path) == cost
+
+
+@pytest.mark.parametrize("weight", [int, float])
+def test_cached_costs_keep_the_weight_type(weight):
+    graph, vertices = random_graph(30, 60, seed=34)
+    for e in list(graph.edges()):
+        u, v = e.endpoints()
+        graph.insert_edge(u, v, weight(e.element()))
+    for g in (graph, graph.freeze()):
+        cache = DistanceCache(g, vertices[:4])
+        assert all(type(cache.distance(vertices[0], v)) is weight for v in vertices)
+        router = EnergyAwareRouter(g, lambda v: False, 1000)
+        router.use_distance_cache(cache)
+        assert type(router.route(vertices[0], vertices[-1])[1]) is weight
+
+
+def test_cache_is_rebuilt_after_graph_change():
+    graph, vertices = random_graph(20, 40, seed=33)
+    cache = DistanceCache(graph, vertices[:3])
+    router = EnergyAwareRouter(graph, lambda v: False, 1000)
+    router.use_distance_cache(cache)
+    graph.insert_edge(vertices[0], vertices[-1], 1)
+    assert not cache.valid
+    assert router.route(vertices[0], vertices[-1]) == ([vertices[0], vertices[-1]], 1)
+    assert cache.valid
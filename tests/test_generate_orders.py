@@ -0,0 +1,31 @@
+from sim.simulation import Simulation
+from sim.simulation_initializer import Role
+
+
+def summary(orders):
+    return [(str(o.origin), str(o.destination), [str(v) for v in o.path], o.cost) for o in orders]
+
+
+def test_batch_is_deterministic_for_a_seed():
+    a = Simulation(40, 80, seed=41).generate_orders(25, seed=5)
+    b = Simulation(40, 80, seed=41).generate_orders(25, seed=5)
+    assert summary(a) == summary(b)
+
+
+def test_parallel_routes_match_serial():
+    serial = Simulation(40, 80, seed=42)
+    parallel = Simulation(40, 80, seed=42)
+    expected = serial.generate_orders(30, seed=6)
+    result = parallel.generate_orders(30, workers=2, seed=6)
+    assert summary(result) == summary(expected)
+    assert len(parallel.orders) == len(expected)
+
+
+def test_batch_registers_orders_and_routes():
+    sim = Simulation(40, 80, seed=43)
+    orders = sim.generate_orders(20)
+    assert [o.id for o in orders] == list(range(1, len(orders) + 1))
+    for order in orders:
+        assert sim.has_role(order.origin, Role.STORAGE) and sim.has_role(order.destination, Role.CLIENT)
+        assert sim.compute_total_cost(order.path) == order.cost
+    assert len(sim.route_log) == len(orders)
@@ -0,0 +1,68 @@
+import math
+import numpy as np
+import pytest
+from sim.simulation_initializer import SimulationInitializer, Role, MODELS
+from sim.graph_analytics import connected_components
+
+
+def edge_set(src, dst, directed=False):
+    pairs = zip(src.tolist(), dst.tolist())
+    return {(u, v) if directed else (min(u, v), max(u, v)) for u, v in pairs}
+
+
+@pytest.mark.parametrize("model", MODELS)
+@pytest.mark.parametrize("n, m", [(50, 80), (300, 600), (200, 199)])
+def test_networks_are_simple_and_connected(model, n, m):
+    init = SimulationInitializer(n, m, model=model, seed=141)
+    graph, _ = init.generate_graph(frozen=True)
+    src, dst, weights = graph.edge_arrays()
+    assert graph.vertex_count() == n
+    assert not np.any(src == dst)
+    assert len(edge_set(src, dst)) == len(src)  # Sin aristas repetidas
+    assert len(np.unique(connected_components(n, src, dst))) == 1
+    assert weights.min() >= 1 and weights.max() <= 20
+    if model != "geometric":
+        assert len(src) == init.m_edges
+
+
+@pytest.mark.parametrize("model", MODELS)
+def test_frozen_and_mutable_graphs_are_identical(model):
+    frozen, _ = SimulationInitializer(120, 240, model=model, seed=142).generate_graph(frozen=True)
+    mutable, roles = SimulationInitializer(120, 240, model=model, seed=142).generate_graph()
+    for a, b in zip(frozen.csr_arrays(), mutable.freeze().csr_arrays()):
+        assert np.array_equal(a, b)
+    assert [str(v) for v in frozen.vertices()] == [str(v) for v in mutable.vertices()]
+
+
+def test_roles_follow_fixed_proportions():
+    init = SimulationInitializer(100, 150, seed=143)
+    init.generate_graph()
+    counts = {role: len(init.vertices_with_role(role)) for role in Role}
+    assert counts == {Role.STORAGE: 20, Role.RECHARGE: 20, Role.CLIENT: 60}
+    assert all(init.vertex_roles[v] == role.label for v, role in init.vertex_role.items())
+
+
+def test_geometric_model_finds_every_close_pair():
+    init = SimulationInitializer(400, 1200, model="geometric", seed=144)
+    src, dst, _, xy = init._geometric_edges()
+    n = init.n_nodes
+    r = math.sqrt(init.m_edges / (math.pi * n * (n - 1) / 2))
+    d = np.hypot(xy[:, None, 0] - xy[None, :, 0], xy[:, None, 1] - xy[None, :, 1])
+    close = {(u, v) for u, v in zip(*np.nonzero(np.triu(d <= r, 1)))}
+    generated = edge_set(src, dst)
+    assert close <= generated
+    # El resto son los enlaces que unen componentes aisladas
+    labels = connected_components(n, *map(np.array, zip(*close)))
+    assert len(generated - close) == len(np.unique(labels)) - 1
+
+
+@pytest.mark.parametrize("directed", [False, True])
+def test_pair_index_is_a_bijection(directed):
+    n = 9
+    init = SimulationInitializer(n, n, directed=directed, seed=145)
+    total = n * (n - 1) // (1 if directed else 2)
+    u, v = init._pair_from_index(n, np.arange(total))
+    pairs = set(zip(u.tolist(), v.tolist()))
+    assert len(pairs) == total and all(a != b for a, b in pairs)
+    if not directed:
+        assert all(a < b for a, b in pairs)
@@ -0,0 +1,108 @@
+import random
+import pytest
+from sim.graph_analytics import GraphAnalytics
+from helpers import random_graph
+
+
+def undirected_pairs(graph):
+    # {frozenset(u, v): peso mínimo} sin lazos (referencia no dirigida)
+    pairs = {}
+    for e in graph.edges():
+        u, v = e.endpoints()
+        if u is not v:
+            key = frozenset((u, v))
+            pairs[key] = min(pairs.get(key, e.element()), e.element())
+    return pairs
+
+
+def components(vertices, pairs):
+    adjacency = {v: set() for v in vertices}
+    for key in pairs:
+        u, v = tuple(key)
+        adjacency[u].add(v)
+        adjacency[v].add(u)
+    seen, result = set(), []
+    for start in vertices:
+        if start in seen:
+            continue
+        group, stack = [], [start]
+        seen.add(start)
+        while stack:
+            x = stack.pop()
+            group.append(x)
+            for y in adjacency[x] - seen:
+                seen.add(y)
+                stack.append(y)
+        result.append(group)
+    return result
+
+
+def brute_force_mst_weight(vertices, pairs):
+    parent = {v: v for v in vertices}
+
+    def find(x):
+        while parent[x] is not x:
+            x = parent[x]
+        return x
+    total = 0
+    for key, w in sorted(pairs.items(), key=lambda item: item[1]):
+        u, v = (find(x) for x in key)
+        if u is not v:
+            parent[u] = v
+            total += w
+    return total
+
+
+GRAPHS = [(25, 30, False, 1), (40, 45, False, 2), (30, 60, True, 3), (30, 20, False, 4)]
+
+
+@pytest.mark.parametrize("n, m, directed, seed", GRAPHS)
+@pytest.mark.parametrize("method", ["boruvka", "kruskal", "prim"])
+def test_mst_matches_brute_force(n, m, directed, seed, method):
+    graph, vertices = random_graph(n, m, directed, seed=seed, connected=seed != 4)
+    pairs = undirected_pairs(graph)
+    analytics = GraphAnalytics(graph)
+    tree = analytics.minimum_spanning_tree(method)
+    assert analytics.mst_weight(method) == brute_force_mst_weight(vertices, pairs)
+    assert sum(pairs[frozenset(e)] for e in tree) == brute_force_mst_weight(vertices, pairs)
+    assert len(tree) == n - len(components(vertices, pairs))  # Bosque: sin ciclos
+    assert len(components(vertices, {frozenset(e): 0 for e in tree})) == len(components(vertices, pairs))
+
+
+@pytest.mark.parametrize("n, m, directed, seed", GRAPHS)
+def test_components_bridges_and_articulation_points(n, m, directed, seed):
+    graph, vertices = random_graph(n, m, directed, seed=seed, connected=seed != 4)
+    pairs = undirected_pairs(graph)
+    analytics = GraphAnalytics(graph)
+    base = len(components(vertices, pairs))
+    assert sorted(map(len, analytics.connected_components()), reverse=True) == \
+        sorted(map(len, components(vertices, pairs)), reverse=True)
+
+    bridges = {key for key in pairs if len(components(vertices, {k: 0 for k in pairs if k != key})) > base}
+    assert {frozenset(e) for e in analytics.bridges()} == bridges
+
+    articulation = set()
+    for v in vertices:
+        rest = [u for u in vertices if u is not v]
+        if len(components(rest, {k: 0 for k in pairs if v not in k})) > base - (not any(v in k for k in pairs)):
+            articulation.add(v)
+    assert set(analytics.articulation_points()) == articulation
+
+
+def test_critical_recharge_links_count_stranded_vertices():
+    graph, vertices = random_graph(40, 44, seed=5)
+    stations = set(random.Random(5).sample(vertices, 4))
+    pairs = undirected_pairs(graph)
+
+    def stranded(edge_pairs):
+        return sum(len(group) for group in components(vertices, edge_pairs) if not stations & set(group))
+
+    before = stranded(pairs)
+    expected = {}
+    for key in pairs:
+        cut = stranded({k: 0 for k in pairs if k != key}) - before
+        if cut > 0:
+            expected[key] = cut
+    result = GraphAnalytics(graph).critical_recharge_links(stations.__contains__)
+    assert {frozenset((u, v)): s for u, v, s in result} == expected
+    assert [s for _, _, s in result] == sorted(expected.values(), reverse=True)
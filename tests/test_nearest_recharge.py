@@ -0,0 +1,37 @@
+import random
+import pytest
+from sim.simulation import Simulation
+from helpers import random_graph, all_pairs, path_cost
+
+INF = float('inf')
+
+
+@pytest.mark.parametrize("directed", [False, True])
+@pytest.mark.parametrize("frozen", [False, True])
+def test_dijkstra_nearest_matches_brute_force(directed, frozen):
+    graph, vertices = random_graph(30, 60, directed, seed=7)
+    dist = all_pairs(graph)
+    stations = set(random.Random(7).sample(vertices, 5))
+    g = graph.freeze() if frozen else graph
+    for v in vertices:
+        station, path, cost = g.dijkstra_nearest(v, stations.__contains__)
+        assert cost == min(dist[v][s] for s in stations)
+        assert station in stations and path[0] is v and path[-1] is station
+        assert path_cost(graph, path) == cost
+
+
+def test_dijkstra_nearest_without_targets():
+    graph, vertices = random_graph(10, 15, seed=8)
+    assert graph.dijkstra_nearest(vertices[0], lambda v: False) == (None, None, INF)
+
+
+def test_find_nearest_recharge_with_role_labels():
+    sim = Simulation(40, 80, seed=9)
+    dist = all_pairs(sim.graph)
+    stations = [v for v in sim.graph.vertices() if sim.is_recharge(v)]
+    roles = dict(sim.get_roles())  # Copia: fuerza la búsqueda por etiquetas en lugar del índice
+    for v in sim.graph.vertices():
+        expected = min(dist[v][s] for s in stations)
+        for labels in (sim.get_roles(), roles):
+            station, cost = sim.find_nearest_recharge(v, labels)
+            assert cost == expected and dist[v][station] == expected
@@ -0,0 +1,38 @@
+import random
+from sim.simulation import Simulation
+
+
+def test_filters_match_linear_scan():
+    rng = random.Random(81)
+    sim = Simulation(50, 100, seed=81)
+    sim.generate_orders(60)
+    for order in sim.orders[::4]:
+        sim.cancel_order(order)
+    for order in sim.orders[1::5]:
+        sim.complete_order(order)
+
+    clients = [c.id for c in sim.get_clients()]
+    for _ in range(50):
+        status = rng.choice([None, "Pendiente", "Cancelada", "Entregado"])
+        client_id = rng.choice([None] + clients)
+        destination = rng.choice([None] + clients)
+        expected = [o for o in sim.orders
+                    if (status is None or o.status == status)
+                    and (client_id is None or o.client.id == client_id)
+                    and (destination is None or str(o.destination) == destination)]
+        result = sim.get_orders(status=status, client_id=client_id, destination=destination)
+        assert sorted(o.id for o in result) == sorted(o.id for o in expected)
+
+
+def test_lookups_by_id():
+    sim = Simulation(50, 100, seed=82)
+    sim.generate_orders(20)
+    for order in sim.orders:
+        assert sim.get_order(order.id) is order
+        assert sim.get_order(str(order.id)) is order
+        assert sim.get_client(order.client.id) is order.client
+    assert sim.get_order(10_000) is None and sim.get_order("x") is None
+    counts = {}
+    for order in sim.orders:
+        counts[order.status] = counts.get(order.status, 0) + 1
+    assert sim.get_status_counts() == counts
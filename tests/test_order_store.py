@@ -0,0 +1,129 @@
+from collections import Counter, defaultdict
+import numpy as np
+import pytest
+from sim.simulation import Simulation
+from sim.order_store import OrderStore
+
+KEYS = {
+    "origin": lambda o: str(o.origin),
+    "destination": lambda o: str(o.destination),
+    "client": lambda o: o.client.id,
+    "status": lambda o: o.status,
+    "priority": lambda o: o.priority,
+}
+
+
+@pytest.fixture(scope="module")
+def sim():
+    sim = Simulation(60, 120, seed=221)
+    sim.generate_orders(80)
+    store = sim.enable_order_store()  # Se carga con las órdenes existentes...
+    sim.generate_orders(120)          # ...y se mantiene con las nuevas
+    for i, order in enumerate(sim.orders):
+        order.priority = i % 3 + 1 if order.id > 150 else order.priority
+        if i % 7 == 0:
+            sim.cancel_order(order)
+        elif i % 5 == 0:
+            sim.complete_order(order)
+    # Las prioridades se cambiaron a mano: se rearma el almacén para que coincida
+    sim.disable_order_store()
+    sim.enable_order_store()
+    assert store is not sim.order_store
+    return sim
+
+
+def test_columns_match_orders(sim):
+    store = sim.order_store
+    assert len(store) == len(sim.orders)
+    assert store.column("order_id").tolist() == [o.id for o in sim.orders]
+    assert store.column("cost").tolist() == [o.cost for o in sim.orders]
+    assert store.column("path_length").tolist() == [o.path_length for o in sim.orders]
+    delivered = store.column("delivered_at")
+    assert [not np.isnan(t) for t in delivered] == [o.delivered_at is not None for o in sim.orders]
+
+
+def test_growth_keeps_rows():
+    sim = Simulation(40, 80, seed=222)
+    sim.generate_orders(50)
+    store = OrderStore(sim.paths, capacity=1)
+    for order in sim.orders:
+        store.append(order)
+    assert store.column("order_id").tolist() == [o.id for o in sim.orders]
+    assert [store.row(o.id) for o in sim.orders] == list(range(len(sim.orders)))
+    with pytest.raises(KeyError):
+        store.row(10_000)
+
+
+@pytest.mark.parametrize("filters", [
+    {"status": "Pendiente"}, {"status": "Entregado", "max_cost": 30}, {"status": "Desconocido"},
+    {"min_cost": 10, "max_cost": 40}, {"destination": True}, {"client_id": True}, {"client_id": "nadie"},
+])
+def test_rows_match_a_python_filter(sim, filters):
+    sample = sim.orders[3]
+    if filters.get("destination") is True:
+        filters = {"destination": str(sample.destination)}
+    if filters.get("client_id") is True:
+        filters = {"client_id": sample.client.id}
+    checks = {
+        "status": lambda o, value: o.status == value,
+        "min_cost": lambda o, value: o.cost >= value,
+        "max_cost": lambda o, value: o.cost <= value,
+        "destination": lambda o, value: str(o.destination) == value,
+        "client_id": lambda o, value: o.client.id == value,
+    }
+    expected = [i for i, o in enumerate(sim.orders) if all(checks[k](o, v) for k, v in filters.items())]
+    assert sim.order_store.rows(**filters).tolist() == expected
+
+
+def test_destination_filter_accepts_vertices(sim):
+    vertex = sim.orders[5].destination
+    assert sim.order_store.rows(destination=vertex).tolist() == \
+           [i for i, o in enumerate(sim.orders) if o.destination is vertex]
+
+
+def test_label_filter_does_not_scan_vertices(sim, monkeypatch):
+    label = str(sim.orders[5].destination)
+    expected = [i for i, o in enumerate(sim.orders) if str(o.destination) == label]
+    monkeypatch.setattr(sim.paths, "vertices", lambda: pytest.fail("recorrió la tabla de vértices"))
+    assert sim.order_store.rows(destination=label).tolist() == expected
+    assert sim.order_store.rows(destination="nadie").tolist() == []
+
+
+@pytest.mark.parametrize("key", KEYS)
+def test_grouping_matches_python(sim, key):
+    store = sim.order_store
+    pending = store.mask(status="Pendiente")
+    counts = Counter(KEYS[key](o) for o in sim.orders)
+    totals = defaultdict(float)
+    pending_totals = defaultdict(float)
+    for o in sim.orders:
+        totals[KEYS[key](o)] += o.cost
+        if o.status == "Pendiente":
+            pending_totals[KEYS[key](o)] += o.cost
+    assert store.count_by(key) == dict(counts)
+    assert store.sum_by(key) == pytest.approx(dict(totals))
+    assert store.sum_by(key, mask=pending) == pytest.approx(dict(pending_totals))
+    assert [count for _, count in store.top_by(key, k=3)] == [count for _, count in counts.most_common(3)]
+
+
+def test_grouping_rejects_unknown_keys(sim):
+    with pytest.raises(ValueError):
+        sim.order_store.count_by("cost")
+    assert sim.order_store.count_by("status", mask=np.zeros(len(sim.orders), dtype=bool)) == {}
+
+
+def test_histogram_matches_numpy(sim):
+    counts, edges = sim.order_store.histogram(bins=7)
+    expected_counts, expected_edges = np.histogram([o.cost for o in sim.orders], bins=7)
+    assert counts.tolist() == expected_counts.tolist()
+    assert np.allclose(edges, expected_edges)
+
+
+def test_dataframe_decodes_labels(sim):
+    frame = sim.get_orders_frame()
+    assert frame["order_id"].tolist() == [o.id for o in sim.orders]
+    assert frame["status"].astype(str).tolist() == [o.status for o in sim.orders]
+    assert frame["destination"].astype(str).tolist() == [str(o.destination) for o in sim.orders]
+    assert frame["client"].astype(str).tolist() == [o.client.id for o in sim.orders]
+    created = frame["created_at"].dt.floor("s").dt.to_pydatetime().tolist()
+    assert created == [o.created_at.replace(microsecond=0) for o in sim.orders]
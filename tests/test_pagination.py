@@ -0,0 +1,31 @@
+from sim.simulation import Simulation
+
+
+def test_iter_orders_pages():
+    sim = Simulation(50, 100, seed=91)
+    sim.generate_orders(30)
+    assert list(sim.iter_orders()) == sim.orders
+    assert list(sim.iter_orders(5, 10)) == sim.orders[5:15]
+    assert list(sim.iter_orders(25, 10)) == sim.orders[25:]
+    assert list(sim.iter_orders(100)) == []
+
+
+def test_iter_clients_pages_in_registration_order():
+    sim = Simulation(50, 100, seed=92)
+    sim.generate_orders(30)
+    clients = list(sim.clients.values())
+    assert list(sim.iter_clients()) == clients
+    assert list(sim.iter_clients(3, 4)) == clients[3:7]
+    assert list(sim.iter_clients(len(clients) - 1, 10)) == clients[-1:]
+
+
+def test_iterators_are_lazy_and_ignore_later_additions():
+    sim = Simulation(50, 100, seed=93)
+    sim.generate_orders(10)
+    n_orders, n_clients = len(sim.orders), len(sim.clients)
+    orders, clients = sim.iter_orders(), sim.iter_clients()
+    next(orders), next(clients)
+    sim.generate_orders(40)  # Agrega órdenes y clientes mientras se recorre
+    assert len(list(orders)) == n_orders - 1
+    assert len(list(clients)) == n_clients - 1
+    assert len(sim.clients) > n_clients
@@ -0,0 +1,94 @@
+import random
+from datetime import datetime
+import numpy as np
+import pytest
+from model.vertex import Vertex
+from tda.path_store import PathStore
+from domain.client import Client
+from domain.order import Order
+from sim.simulation import Simulation
+
+
+@pytest.fixture
+def paths():
+    vertices = [Vertex(f"V{i}") for i in range(12)]
+    rng = random.Random(211)
+    return [[rng.choice(vertices) for _ in range(rng.randint(0, 8))] for _ in range(50)]
+
+
+def test_store_behaves_like_a_list_of_paths(paths):
+    store = PathStore()
+    assert [store.append(p) for p in paths] == list(range(len(paths)))
+    assert len(store) == len(paths)
+    assert list(store) == paths
+    assert store[-1] == paths[-1] and store[3:40:7] == paths[3:40:7]
+    assert [store.length(i) for i in range(len(store))] == [len(p) for p in paths]
+    with pytest.raises(IndexError):
+        store[len(paths)]
+
+
+def test_vertices_are_interned_once(paths):
+    store = PathStore()
+    for p in paths:
+        store.append(p)
+    vertices = store.vertices()
+    assert len(vertices) == len({v for p in paths for v in p})
+    offsets, ids = store.to_arrays()
+    assert offsets.dtype == ids.dtype == np.int64
+    for i, p in enumerate(paths):
+        assert [vertices[j] for j in ids[offsets[i]:offsets[i + 1]]] == p
+
+
+def test_order_reads_its_path_from_the_store(paths):
+    store = PathStore()
+    client = Client("C1", "Cliente", paths[0][-1] if paths[0] else None)
+    orders = [Order(None, client, p[0] if p else None, p[-1] if p else None, p, store=store) for p in paths]
+    assert [o.path for o in orders] == paths
+    assert [o.path_length for o in orders] == [len(p) for p in paths]
+    assert [o.path_id for o in orders] == list(range(len(paths)))
+    ids = [o.id for o in orders]
+    assert ids == sorted(set(ids))  # Correlativos y únicos fuera de una simulación
+
+    own = Order(7, client, path=paths[1])
+    assert own.path is paths[1] and own.path_id is None and own.path_length == len(paths[1])
+
+
+def test_order_and_client_are_slotted():
+    order = Order(1, Client("C1", "Cliente", None))
+    for obj in (order, order.client):
+        assert not hasattr(obj, "__dict__")
+        with pytest.raises(AttributeError):
+            obj.extra = 1
+
+
+def test_timestamps_round_trip():
+    order = Order(1, Client("C1", "Cliente", None))
+    assert order.delivered_at is None
+    moment = datetime(2024, 5, 1, 12, 30, 15, 250000)
+    order.created_at = moment
+    order.delivered_at = moment
+    assert order.created_at == moment and order.delivered_at == moment
+    order.delivered_at = None
+    assert order.delivered_at is None
+
+
+def test_route_log_is_the_shared_store():
+    sim = Simulation(40, 80, seed=212)
+    orders = sim.generate_orders(20)
+    assert sim.route_log is sim.paths
+    assert list(sim.route_log) == [o.path for o in orders]
+    assert sim.get_order(str(orders[3].id)) is orders[3]
+
+
+def test_vertex_ids_by_vertex_and_label(paths):
+    store = PathStore()
+    for p in paths:
+        store.append(p)
+    for i, v in enumerate(store.vertices()):
+        assert store.vertex_id(v) == store.vertex_id(str(v)) == i
+    assert store.vertex_id("nadie") is None and store.vertex_id(Vertex("nadie")) is None
+
+    offsets, ids = store.to_arrays()
+    copy = PathStore.from_arrays(store.vertices(), offsets, ids)
+    assert list(copy) == paths
+    assert all(copy.vertex_id(str(v)) == i for i, v in enumerate(store.vertices()))
@@ -0,0 +1,32 @@
+import random
+from tda.ranking import RouteRanking
+from domain.route import Route
+
+
+def test_ranking_matches_sorted_reference():
+    rng = random.Random(61)
+    ranking = RouteRanking()
+    routes = [Route([f"N{i}", f"N{i + 1}"], rng.randint(1, 30)) for i in range(60)]
+    for _ in range(400):
+        route = rng.choice(routes)
+        route.freq += rng.randint(0, 2)
+        ranking.update(route)
+
+    present = {r.sort_key: r for r in routes if r.sort_key in ranking._keys}
+    expected = sorted(present.values(), key=lambda r: (r.freq, r.cost, r.sort_key), reverse=True)
+    assert list(ranking) == expected
+    assert ranking.top_k(5) == expected[:5]
+    for position, route in enumerate(expected, start=1):
+        assert ranking.rank(route) == position
+        assert ranking.percentile(route) == 100.0 * (len(expected) - position + 1) / len(expected)
+    assert ranking.at_percentile(100) is expected[0]
+    assert ranking.at_percentile(0) is expected[-1]
+
+
+def test_remove_route():
+    ranking = RouteRanking()
+    a, b = Route(["A", "B"], 3), Route(["B", "C"], 5)
+    ranking.update(a)
+    ranking.update(b)
+    assert ranking.remove(a) and not ranking.remove(a)
+    assert list(ranking) == [b] and ranking.rank(a) is None
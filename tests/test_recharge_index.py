@@ -0,0 +1,76 @@
+import random
+import pytest
+from sim.recharge_index import RechargeIndex
+from helpers import random_graph, all_pairs
+
+INF = float('inf')
+
+
+def assert_matches_brute_force(index, graph, stations):
+    dist = all_pairs(graph)
+    for v in graph.vertices():
+        expected = min((dist[v][s] for s in stations if s in dist), default=INF)
+        station, distance = index.nearest(v)
+        assert distance == expected
+        if expected == INF:
+            assert station is None
+            continue
+        assert dist[v][station] == expected
+        path = index.path_to_station(v)
+        assert path[0] is v and path[-1] is station
+        assert sum(graph.get_edge(a, b).element() for a, b in zip(path, path[1:])) == expected
+
+
+@pytest.mark.parametrize("directed", [False, True])
+def test_initial_index(directed):
+    graph, vertices = random_graph(40, 80, directed, seed=11)
+    stations = set(random.Random(11).sample(vertices, 6))
+    index = RechargeIndex(graph, stations.__contains__)
+    assert_matches_brute_force(index, graph, stations)
+
+
+@pytest.mark.parametrize("directed", [False, True])
+def test_incremental_updates_match_brute_force(directed):
+    rng = random.Random(12)
+    graph, vertices = random_graph(30, 50, directed, seed=12)
+    stations = set(rng.sample(vertices, 4))
+    index = RechargeIndex(graph, stations.__contains__)
+    alive = list(vertices)
+    for step in range(60):
+        action = rng.random()
+        u, v = rng.sample(alive, 2)
+        if action < 0.4:
+            graph.insert_edge(u, v, rng.randint(1, 20))  # Alta o cambio de peso
+        elif action < 0.8:
+            edges = list(graph.edges())
+            if edges:
+                graph.remove_edge(*rng.choice(edges).endpoints())
+        elif action < 0.9 and len(alive) > 10:
+            alive.remove(u)
+            stations.discard(u)
+            graph.remove_vertex(u)
+        else:
+            w = graph.insert_vertex(f"N{step}")
+            alive.append(w)
+            graph.insert_edge(w, rng.choice(alive[:-1]), rng.randint(1, 20))
+        assert_matches_brute_force(index, graph, stations)
+
+
+def test_weight_change_is_a_single_replace_event():
+    graph, (a, b, c) = random_graph(3, 0, seed=13, connected=False)
+    events = []
+    graph.add_listener(lambda event, *args: events.append(event))
+    graph.insert_edge(a, b, 5)
+    graph.insert_edge(a, b, 2)
+    assert events == ["insert_edge", "replace_edge"]
+    assert graph.get_edge(a, b).element() == 2 and graph.get_edge(b, a).element() == 2
+
+
+def test_weight_increase_reroutes_through_another_station():
+    graph, (a, s1, s2) = random_graph(3, 0, seed=14, connected=False)
+    graph.insert_edge(a, s1, 1)
+    graph.insert_edge(a, s2, 5)
+    index = RechargeIndex(graph, {s1, s2}.__contains__)
+    assert index.nearest(a) == (s1, 1)
+    graph.insert_edge(a, s1, 9)
+    assert index.nearest(a) == (s2, 5)
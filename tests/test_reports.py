@@ -0,0 +1,72 @@
+import asyncio
+import os
+import pickle
+import pytest
+from fastapi import HTTPException
+from api import executor, global_simulation
+from api.report_jobs import ReportCache, ReportJobQueue, DONE
+from sim.simulation import Simulation
+from visual.report_generator import ReportData, generate_report_pdf
+
+
+@pytest.fixture
+def sim():
+    simulation = Simulation(60, 120, seed=131)
+    simulation.generate_orders(300)
+    global_simulation.set(simulation)
+    yield simulation
+    global_simulation.set(None)
+
+
+def test_report_data_is_bounded_by_the_row_limits(sim):
+    small = ReportData(sim, max_order_rows=10, max_client_rows=10)
+    assert len(small.order_rows) == 10 and small.total_orders == len(sim.orders)
+    assert len(small.client_rows) == min(10, len(sim.clients))
+    assert small.top_routes[0][0] == 1
+    more = Simulation(60, 120, seed=131)
+    more.generate_orders(3000)
+    # El payload del pool no crece con la cantidad de órdenes (solo con los límites)
+    assert len(pickle.dumps(ReportData(more, 10, 10))) < 2 * len(pickle.dumps(small))
+    assert len(pickle.dumps(small)) < len(pickle.dumps(sim)) / 10
+
+
+def test_client_and_order_limits_are_independent(sim):
+    data = ReportData(sim, max_order_rows=0, max_client_rows=5)
+    assert data.order_rows == [] and len(data.client_rows) == 5
+    data = ReportData(sim, max_order_rows=40, max_client_rows=0)
+    assert len(data.order_rows) == 40 and data.client_rows == []
+    assert [row[0] for row in ReportData(sim).client_rows] == [c.id for c in sim.get_clients()]
+
+
+def test_pdf_from_report_data_matches_pdf_from_simulation(sim, tmp_path):
+    for source in (sim, ReportData(sim, 50)):
+        filename = str(tmp_path / f"{type(source).__name__}.pdf")
+        assert generate_report_pdf(source, filename=filename, max_order_rows=50) == filename
+        with open(filename, "rb") as f:
+            assert f.read(5) == b"%PDF-"
+
+
+def test_job_queue_renders_once_and_serves_from_cache(sim, tmp_path):
+    queue = ReportJobQueue(ReportCache(str(tmp_path)))
+
+    async def run():
+        job = await queue.wait(queue.submit(sim, {"max_order_rows": 20, "time_budget": None}))
+        again = queue.submit(sim, {"max_order_rows": 20, "time_budget": None})
+        return job, again
+
+    try:
+        job, again = asyncio.run(run())
+    finally:
+        executor.shutdown()
+    assert job.status == DONE and os.path.exists(job.path)
+    assert again.status == DONE and again.path == job.path and again.task is None
+
+
+def test_submit_rejects_with_503_when_the_pool_is_saturated(sim, tmp_path, monkeypatch):
+    monkeypatch.setattr(executor, "MAX_WORKERS", 1)
+    monkeypatch.setattr(executor, "MAX_QUEUED", 0)
+    queue = ReportJobQueue(ReportCache(str(tmp_path)))
+    queue._running["otro"] = object()  # Un trabajo aceptado que todavía no llegó al pool
+    with pytest.raises(HTTPException) as error:
+        queue.submit(sim, {})
+    assert error.value.status_code == 503
@@ -0,0 +1,65 @@
+from collections import Counter
+import pytest
+from sim.simulation import Simulation
+from sim.simulation_initializer import Role
+from helpers import all_pairs
+
+
+def check_role_indexes(sim):
+    # Cada índice de roles coincide con recorrer el grafo
+    vertices = list(sim.graph.vertices())
+    expected = Counter(sim.role_of[v] for v in vertices)
+    assert set(sim.role_of) == set(vertices) == set(sim.get_roles())
+    ids = sim.initializer.vertex_ids
+    assert set(ids) == set(vertices) and all(sim.initializer.vertices[ids[v]] == v for v in vertices)
+    for role in Role:
+        assert sim.get_vertices_by_role(role) == [v for v in vertices if sim.role_of[v] is role]
+        assert sim.initializer.vertices_with_role(role) == sim.get_vertices_by_role(role)
+    assert sim.get_node_distribution() == {"Storage": expected[Role.STORAGE],
+                                           "Recharge": expected[Role.RECHARGE],
+                                           "Clients": expected[Role.CLIENT]}
+
+
+def test_indexes_match_the_graph():
+    check_role_indexes(Simulation(50, 100, seed=231))
+
+
+@pytest.mark.parametrize("role", list(Role))
+def test_orders_after_removing_vertices(role):
+    sim = Simulation(50, 100, seed=232)
+    sim.generate_orders(10)
+    removed = sim.get_vertices_by_role(role)[:3]
+    for v in removed:
+        sim.graph.remove_vertex(v)
+    check_role_indexes(sim)
+    assert not any(sim.is_recharge(v) or sim.has_role(v, role) for v in removed)
+
+    new = [sim.generate_order() for _ in range(30)] + sim.generate_orders(30)
+    assert any(new)
+    for order in filter(None, new):
+        assert not set(order.path) & set(removed)
+    assert len(sim.orders) == 10 + sum(o is not None for o in new)
+
+
+def test_nearest_recharge_by_labels_after_removal():
+    sim = Simulation(50, 100, seed=233)
+    sim.graph.remove_vertex(sim.get_vertices_by_role(Role.RECHARGE)[0])
+    dist = all_pairs(sim.graph)
+    stations = sim.get_vertices_by_role(Role.RECHARGE)
+    roles = dict(sim.get_roles())
+    for v in sim.graph.vertices():
+        reachable = [dist[v][s] for s in stations if s in dist[v]]
+        station, cost = sim.find_nearest_recharge(v, roles)
+        assert cost == min(reachable, default=float('inf'))
+        assert sim.find_nearest_recharge(v, sim.get_roles())[1] == cost  # Índice de recarga
+
+
+def test_nearest_recharge_accepts_custom_labels():
+    sim = Simulation(50, 100, seed=234)
+    dist = all_pairs(sim.graph)
+    stations = sim.get_vertices_by_role(Role.RECHARGE)[:4]
+    roles = {v: "📍 Otro" for v in sim.graph.vertices()}
+    roles.update({s: "🔋 Recarga rápida" for s in stations})
+    for v in sim.graph.vertices():
+        station, cost = sim.find_nearest_recharge(v, roles)
+        assert station in stations and cost == min(dist[v][s] for s in stations)
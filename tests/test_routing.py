@@ -0,0 +1,88 @@
+import random
+import pytest
+from sim.routing import EnergyAwareRouter
+from sim.recharge_index import RechargeIndex
+from helpers import random_graph, all_pairs, path_cost
+
+INF = float('inf')
+AUTONOMY = 25
+
+
+def brute_force_route_cost(dist, stations, origin, destination, autonomy):
+    # Floyd-Warshall sobre el grafo reducido {origen, estaciones, destino} con tramos <= autonomía
+    stops = [origin, destination] + [s for s in stations if s is not origin and s is not destination]
+    best = {a: {b: (0 if a is b else dist[a][b] if dist[a][b] <= autonomy else INF) for b in stops} for a in stops}
+    for k in stops:
+        for i in stops:
+            for j in stops:
+                if best[i][k] + best[k][j] < best[i][j]:
+                    best[i][j] = best[i][k] + best[k][j]
+    return best[origin][destination]
+
+
+def assert_feasible(graph, path, stations, autonomy):
+    charge = 0
+    for u, v in zip(path, path[1:]):
+        charge += graph.get_edge(u, v).element()
+        assert charge <= autonomy
+        if v in stations:
+            charge = 0
+
+
+@pytest.mark.parametrize("directed", [False, True])
+@pytest.mark.parametrize("frozen", [False, True])
+@pytest.mark.parametrize("with_index", [False, True])
+def test_route_matches_brute_force(directed, frozen, with_index):
+    graph, vertices = random_graph(35, 70, directed, seed=21)
+    stations = set(random.Random(21).sample(vertices, 7))
+    dist = all_pairs(graph)
+    g = graph.freeze() if frozen else graph
+    index = RechargeIndex(g, stations.__contains__) if with_index else None
+    router = EnergyAwareRouter(g, stations.__contains__, AUTONOMY, index)
+    for origin in vertices[:6]:
+        for destination in vertices:
+            expected = brute_force_route_cost(dist, stations, origin, destination, AUTONOMY)
+            path, cost = router.route(origin, destination)
+            if expected == INF:
+                assert (path, cost) == (None, None)
+                continue
+            assert cost == expected
+            assert path[0] is origin and path[-1] is destination
+            assert path_cost(graph, path) == cost
+            assert_feasible(graph, path, stations, AUTONOMY)
+
+
+def test_route_without_stations_needs_direct_reach():
+    graph, vertices = random_graph(20, 30, seed=22)
+    dist = all_pairs(graph)
+    router = EnergyAwareRouter(graph, lambda v: False, AUTONOMY)
+    for destination in vertices:
+        path, cost = router.route(vertices[0], destination)
+        if dist[vertices[0]][destination] <= AUTONOMY:
+            assert cost == dist[vertices[0]][destination]
+        else:
+            assert path is None
+
+
+def test_cached_legs_are_dropped_on_graph_change():
+    graph, (a, s, b) = random_graph(3, 0, seed=23, connected=False)
+    graph.insert_edge(a, s, 20)
+    graph.insert_edge(s, b, 20)
+    router = EnergyAwareRouter(graph, {s}.__contains__, AUTONOMY)
+    assert router.route(a, b) == ([a, s, b], 40)
+    graph.insert_edge(s, b, 30)  # El tramo desde la estación ya no cabe en la autonomía
+    assert router.route(a, b) == (None, None)
+
+
+def test_index_answers_impossible_pairs_without_searching(monkeypatch):
+    # a - s1 - b - c: c está a más de la autonomía de cualquier estación
+    graph, (a, s, b, c) = random_graph(4, 0, seed=24, connected=False)
+    graph.insert_edge(a, s, 20)
+    graph.insert_edge(s, b, 20)
+    graph.insert_edge(b, c, 20)
+    index = RechargeIndex(graph, {s}.__contains__)
+    router = EnergyAwareRouter(graph, {s}.__contains__, AUTONOMY, index)
+    monkeypatch.setattr(router, "legs_from", lambda v: pytest.fail("no debía buscar tramos"))
+    assert router.route(a, c) == (None, None)
+    monkeypatch.undo()
+    assert router.route(a, b) == ([a, s, b], 40)  # Primer tramo tomado del índice
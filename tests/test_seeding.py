@@ -0,0 +1,65 @@
+import numpy as np
+import pytest
+from sim.simulation import Simulation
+from benchmarks.run_benchmarks import compare, run_benchmarks, MIN_DELTA
+
+
+def fingerprint(sim):
+    graph = sorted((str(e.endpoints()[0]), str(e.endpoints()[1]), e.element()) for e in sim.graph.edges())
+    roles = sorted((str(v), label) for v, label in sim.vertex_roles.items())
+    return graph, roles
+
+
+def orders(sim):
+    return [(str(o.origin), str(o.destination), [str(v) for v in o.path], o.cost) for o in sim.orders]
+
+
+@pytest.mark.parametrize("model", ["random", "geometric", "grid"])
+def test_same_seed_gives_the_same_run(model):
+    runs = []
+    for _ in range(2):
+        sim = Simulation(60, 120, model=model, seed=191)
+        for _ in range(5):
+            sim.generate_order()
+        sim.generate_orders(20)
+        runs.append((fingerprint(sim), orders(sim), sim.get_coordinates()))
+    assert runs[0] == runs[1]
+
+
+def test_different_seeds_give_different_runs():
+    a = Simulation(60, 120, seed=192)
+    b = Simulation(60, 120, seed=193)
+    assert fingerprint(a) != fingerprint(b)
+    assert a.get_coordinates() != b.get_coordinates()
+
+
+def test_generator_instance_is_shared():
+    a = Simulation(60, 120, seed=np.random.default_rng(194))
+    b = Simulation(60, 120, seed=194)
+    assert fingerprint(a) == fingerprint(b)
+    a.generate_orders(10)
+    b.generate_orders(10)
+    assert orders(a) == orders(b)
+
+
+def test_coordinates_cover_every_vertex_within_spread():
+    sim = Simulation(80, 160, model="geometric", seed=195)
+    coords = sim.get_coordinates(center=(0.0, 0.0), spread=0.5)
+    assert set(coords) == {str(v) for v in sim.graph.vertices()}
+    assert all(abs(lat) <= 0.5 and abs(lon) <= 0.5 for lat, lon in coords.values())
+
+
+def test_compare_reports_only_real_regressions():
+    baseline = {"small/mst": 0.100, "small/routing": 0.010, "small/avl_build": 0.001}
+    results = {"small/mst": 0.150, "small/routing": 0.0125, "small/avl_build": 0.004, "new/case": 9.0}
+    regressions = compare(results, baseline, tolerance=0.2)
+    # routing sube 25% pero menos que MIN_DELTA; avl_build sube 300% pero también es ruido
+    assert [key for key, *_ in regressions] == ["small/mst"]
+    assert regressions[0][3] == pytest.approx(0.5)
+    assert compare({"small/mst": 0.100 + MIN_DELTA / 2}, baseline, 0.0) == []
+
+
+def test_run_benchmarks_times_every_case():
+    results = run_benchmarks(["small"], ["graph_build", "mst"], repeat=1, log=lambda line: None)
+    assert set(results) == {"small/graph_build", "small/mst"}
+    assert all(seconds > 0 for seconds in results.values())
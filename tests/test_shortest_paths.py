@@ -0,0 +1,101 @@
+import random
+import pytest
+from model import shortest_paths
+from model.shortest_paths import EuclideanHeuristic, LandmarkHeuristic
+from sim.simulation import Simulation
+from helpers import random_graph, all_pairs, path_cost
+
+INF = float('inf')
+
+
+def heuristics(graph, vertices, seed):
+    rng = random.Random(seed)
+    positions = {v: (rng.random(), rng.random()) for v in vertices}
+    return {
+        "euclidean": EuclideanHeuristic(graph, positions),
+        "landmarks": LandmarkHeuristic(graph, k=4, seed=seed),
+        "landmarks-fijos": LandmarkHeuristic(graph, landmarks=vertices[:2]),
+    }
+
+
+def queries(graph, directed):
+    # Todos los métodos de Graph/CSRGraph: (nombre, función (u, v) -> (ruta, costo))
+    methods = [("dijkstra_shortest_path", graph.dijkstra_shortest_path)]
+    for method in ("dijkstra", "bidirectional"):
+        methods.append((method, lambda u, v, method=method: graph.shortest_path(u, v, method)))
+    vertices = list(graph.vertices())
+    for name, heuristic in heuristics(graph, vertices, seed=24 + directed).items():
+        methods.append((f"astar-{name}", lambda u, v, h=heuristic: graph.shortest_path(u, v, "astar", h)))
+    return methods
+
+
+@pytest.mark.parametrize("directed", [False, True])
+@pytest.mark.parametrize("frozen", [False, True])
+@pytest.mark.parametrize("connected", [True, False])
+def test_point_to_point_matches_floyd_warshall(directed, frozen, connected):
+    graph, vertices = random_graph(25, 45, directed, seed=241, connected=connected)
+    dist = all_pairs(graph)
+    g = graph.freeze() if frozen else graph
+    for name, query in queries(g, directed):
+        for u in vertices:
+            for v in vertices:
+                path, cost = query(u, v)
+                assert cost == dist[u][v], (name, u, v)
+                if cost == INF:
+                    assert path is None
+                else:
+                    assert path[0] is u and path[-1] is v and path_cost(graph, path) == cost
+
+
+@pytest.mark.parametrize("directed", [False, True])
+def test_heuristics_are_admissible(directed):
+    graph, vertices = random_graph(25, 45, directed, seed=242)
+    dist = all_pairs(graph)
+    for heuristic in heuristics(graph, vertices, seed=242).values():
+        for t in vertices:
+            h = heuristic.bind(t)
+            assert all(h(v) <= dist[v][t] + 1e-9 for v in vertices)
+
+
+@pytest.mark.parametrize("frozen", [False, True])
+def test_nearest_delegates_to_the_shared_search(frozen):
+    graph, vertices = random_graph(30, 50, True, seed=243)
+    dist = all_pairs(graph)
+    targets = set(vertices[::7])
+    g = graph.freeze() if frozen else graph
+    for v in vertices:
+        found, path, cost = g.dijkstra_nearest(v, targets.__contains__)
+        assert cost == min(dist[v][t] for t in targets) and found in targets
+        assert path[0] is v and path[-1] is found and path_cost(graph, path) == cost
+    assert g.dijkstra_nearest(vertices[0], lambda v: False) == (None, None, INF)
+
+
+def test_nearest_on_plain_adjacency():
+    adjacency = {0: [(1, 4), (2, 1)], 1: [(3, 1)], 2: [(1, 1)], 3: []}
+    assert shortest_paths.nearest(adjacency.__getitem__, 0, lambda x: x == 3) == (3, [0, 2, 1, 3], 3)
+    assert shortest_paths.nearest(adjacency.__getitem__, 0, lambda x: x == 0) == (0, [0], 0)
+
+
+def test_unknown_method_and_missing_heuristic():
+    graph, vertices = random_graph(5, 6, seed=244)
+    for g in (graph, graph.freeze()):
+        with pytest.raises(ValueError):
+            g.shortest_path(vertices[0], vertices[1], "bfs")
+        with pytest.raises(ValueError):
+            g.shortest_path(vertices[0], vertices[1], "astar")
+
+
+@pytest.mark.parametrize("model, heuristic", [("geometric", "euclidean"), ("grid", "euclidean"),
+                                              ("random", "landmarks")])
+def test_simulation_methods_agree(model, heuristic):
+    sim = Simulation(60, 120, model=model, seed=245)
+    rng = random.Random(245)
+    vertices = list(sim.graph.vertices())
+    for _ in range(40):
+        u, v = rng.choice(vertices), rng.choice(vertices)
+        expected = sim.shortest_path(u, v, "dijkstra")[1]
+        assert sim.shortest_path(u, v)[1] == expected
+        assert sim.shortest_path(u, v, "astar", heuristic)[1] == expected
+    if model == "random":
+        with pytest.raises(ValueError):
+            sim.shortest_path(vertices[0], vertices[1], "astar", "euclidean")
@@ -0,0 +1,115 @@
+import pytest
+from sim.simulation import Simulation
+from sim.snapshot import SimulationSnapshot
+
+
+def order_rows(sim):
+    return [(o.id, o.client.id, str(o.origin), str(o.destination), [str(v) for v in o.path],
+             o.cost, o.priority, o.status, o.created_at, o.delivered_at) for o in sim.orders]
+
+
+def client_rows(sim):
+    return [(c.id, c.name, c.type, str(c.vertex), c.total_orders) for c in sim.iter_clients()]
+
+
+def graph_rows(sim):
+    return sorted((str(u), str(v), e.element()) for u in sim.graph.vertices()
+                  for e in sim.graph.incident_edges(u) for v in [e.opposite(u)])
+
+
+def recharge_rows(sim):
+    index = sim.recharge_index
+    return {str(v): (str(index.station.get(v)), index.distance.get(v)) for v in sim.graph.vertices()}
+
+
+def stats_row(sim):
+    s = sim.stats
+    return (s.count, s.total_cost, s.min_cost(), s.max_cost(), s.avg_path_length(),
+            s.cost_sketch.quantiles(), s.latency_sketch.quantiles())
+
+
+@pytest.fixture
+def simulation():
+    sim = Simulation(60, 120, seed=201)
+    sim.generate_orders(40)
+    sim.cancel_order(sim.orders[0])
+    sim.complete_order(sim.orders[1])
+    return sim
+
+
+def test_round_trip_keeps_every_view(simulation, tmp_path):
+    simulation.save(tmp_path / "snap")
+    loaded = Simulation.load(tmp_path / "snap")
+    assert order_rows(loaded) == order_rows(simulation)
+    assert client_rows(loaded) == client_rows(simulation)
+    assert graph_rows(loaded) == graph_rows(simulation)
+    assert recharge_rows(loaded) == recharge_rows(simulation)
+    assert stats_row(loaded) == stats_row(simulation)
+    assert loaded.get_status_counts() == simulation.get_status_counts()
+    assert loaded.get_node_distribution() == simulation.get_node_distribution()
+    for kind in ("Almacenamiento", "Recarga", "Cliente"):  # A igual cantidad el orden no importa
+        assert dict(loaded.get_visit_ranking(kind)) == dict(simulation.get_visit_ranking(kind))
+    assert [(r.sort_key, r.cost, r.freq) for r in loaded.get_top_routes(100)] == \
+           [(r.sort_key, r.cost, r.freq) for r in simulation.get_top_routes(100)]
+    assert loaded.version == simulation.version
+
+
+def test_costs_keep_their_type(simulation, tmp_path):
+    simulation.save(tmp_path / "snap")
+    loaded = Simulation.load(tmp_path / "snap")
+    for before, after in zip(simulation.orders, loaded.orders):
+        assert type(after.cost) is type(before.cost) is int
+    assert type(loaded.stats.total_cost) is type(simulation.stats.total_cost)
+    assert type(loaded.stats.max_cost()) is type(simulation.stats.max_cost())
+    for v in loaded.graph.vertices():
+        assert type(loaded.recharge_index.nearest(v)[1]) is int
+    assert [r.cost for r in loaded.get_top_routes(5)] == [r.cost for r in simulation.get_top_routes(5)]
+
+
+def test_load_builds_the_calling_class(simulation, tmp_path):
+    class Subclass(Simulation):
+        pass
+
+    simulation.save(tmp_path / "snap")
+    assert type(Subclass.load(tmp_path / "snap")) is Subclass
+    assert type(Simulation.load(tmp_path / "snap")) is Simulation
+
+
+def test_loaded_simulation_continues_the_same_stream(simulation, tmp_path):
+    simulation.save(tmp_path / "snap")
+    loaded = Simulation.load(tmp_path / "snap")
+    new = loaded.generate_orders(10)
+    expected = simulation.generate_orders(10)
+    assert [(o.id, str(o.origin), str(o.destination), o.cost) for o in new] == \
+           [(o.id, str(o.origin), str(o.destination), o.cost) for o in expected]
+
+
+def test_columns_are_readable_without_loading(simulation, tmp_path):
+    simulation.save(tmp_path / "snap")
+    snapshot = SimulationSnapshot(tmp_path / "snap")
+    assert snapshot.vertex_count == len(simulation.graph.vertices())
+    assert snapshot.order_count == len(simulation.orders)
+    for i, order in enumerate(simulation.orders):
+        record = snapshot.order_record(i)
+        assert (record["id"], record["client_id"], record["origin"], record["destination"]) == \
+               (order.id, order.client.id, str(order.origin), str(order.destination))
+        assert record["path"] == [str(v) for v in order.path]
+        assert (record["cost"], record["status"], record["delivered_at"]) == \
+               (order.cost, order.status, order.delivered_at)
+
+
+def test_save_keeps_orders_whose_vertices_were_removed(tmp_path):
+    sim = Simulation(60, 120, seed=202)
+    orders = sim.generate_orders(30)
+    removed = orders[0].path[len(orders[0].path) // 2]
+    sim.graph.remove_vertex(removed)
+    sim.save(tmp_path / "snap")
+
+    snapshot = SimulationSnapshot(tmp_path / "snap")
+    assert snapshot.vertex_count == len(sim.graph.vertices())
+    assert snapshot.order_record(0)["path"] == [str(v) for v in orders[0].path]
+
+    loaded = Simulation.load(tmp_path / "snap")
+    assert order_rows(loaded) == order_rows(sim)
+    assert client_rows(loaded) == client_rows(sim)
+    assert str(removed) not in {str(v) for v in loaded.graph.vertices()}
@@ -0,0 +1,69 @@
+import random
+from types import SimpleNamespace
+import pytest
+from sim.stats import QuantileSketch, OrderStats
+
+QS = (0.0, 0.1, 0.25, 0.5, 0.75, 0.9, 0.99, 1.0)
+
+
+def assert_within_accuracy(sketch, values):
+    values = sorted(values)
+    for q in QS:
+        exact = values[int(q * (len(values) - 1))]
+        estimate = sketch.quantile(q)
+        assert abs(estimate - exact) <= sketch.relative_accuracy * exact * (1 + 1e-9)
+
+
+@pytest.mark.parametrize("accuracy", [0.01, 0.05])
+def test_quantiles_have_bounded_relative_error(accuracy):
+    rng = random.Random(101)
+    sketch = QuantileSketch(accuracy)
+    values = [rng.lognormvariate(0, 2) for _ in range(5000)] + [0.0] * 50 + [rng.randint(1, 400) for _ in range(2000)]
+    for v in values:
+        sketch.add(v)
+    assert sketch.count == len(values)
+    assert_within_accuracy(sketch, values)
+
+
+def test_removals_keep_the_error_bound():
+    rng = random.Random(102)
+    sketch = QuantileSketch()
+    values = [rng.uniform(0.001, 1000) for _ in range(3000)]
+    for v in values:
+        sketch.add(v)
+    rng.shuffle(values)
+    removed, values = values[:2000], values[2000:]
+    for v in removed:
+        sketch.remove(v)
+    assert sketch.count == len(values)
+    assert_within_accuracy(sketch, values)
+
+
+def test_empty_sketch():
+    sketch = QuantileSketch()
+    assert sketch.quantile(0.5) is None
+    sketch.add(3)
+    sketch.remove(3)
+    assert sketch.quantiles() == {"p50": None, "p90": None, "p99": None}
+
+
+def test_order_stats_match_recomputation():
+    rng = random.Random(103)
+    stats = OrderStats()
+    active = []
+    for _ in range(1500):
+        if active and rng.random() < 0.4:
+            stats.remove(active.pop(rng.randrange(len(active))))
+        else:
+            order = SimpleNamespace(cost=rng.randint(1, 200), path_length=rng.randint(2, 12))
+            stats.add(order)
+            active.append(order)
+        assert stats.count == len(active)
+        assert stats.total_cost == sum(o.cost for o in active)
+        assert stats.min_cost() == min((o.cost for o in active), default=0)
+        assert stats.max_cost() == max((o.cost for o in active), default=0)
+    lengths = {}
+    for o in active:
+        lengths[o.path_length] = lengths.get(o.path_length, 0) + 1
+    assert dict(stats.path_length_histogram) == lengths
+    assert stats.avg_path_length() == pytest.approx(sum(o.path_length for o in active) / len(active))
@@ -0,0 +1,34 @@
+from collections import Counter
+from sim.simulation import Simulation
+
+
+def recount(sim):
+    # Referencia: recorre las rutas de todas las órdenes no canceladas
+    counts = {kind: Counter() for kind in sim.visit_counts}
+    for order in sim.orders:
+        if order.status == "Cancelada":
+            continue
+        for node in order.path:
+            counts[sim.role_of[node].kind][node] += 1
+    return counts
+
+
+def test_counters_follow_creation_and_cancellation():
+    sim = Simulation(50, 100, seed=71)
+    sim.generate_orders(40)
+    assert sim.visit_counts == recount(sim)
+    for order in sim.orders[::3]:
+        sim.cancel_order(order)
+    sim.complete_order(sim.orders[1])
+    assert sim.visit_counts == recount(sim)
+
+
+def test_visit_ranking_is_sorted():
+    sim = Simulation(50, 100, seed=72)
+    sim.generate_orders(40)
+    for kind in ("Almacenamiento", "Recarga", "Cliente"):
+        ranking = sim.get_visit_ranking(kind)
+        visits = [count for _, count in ranking]
+        assert visits == sorted(visits, reverse=True)
+        assert sum(visits) == sum(recount(sim)[kind].values())
+        assert sim.get_visit_ranking(kind, 2) == ranking[:2]
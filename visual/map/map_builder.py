@@ -1,44 +1,36 @@
 import folium
 from streamlit_folium import st_folium
-import numpy as np
 import streamlit as st
+from sim.simulation_initializer import Role
+
+ROLE_COLORS = {Role.CLIENT: "blue", Role.STORAGE: "orange", Role.RECHARGE: "green"}
 
 def draw_folium_map(sim, path=None, mst=None):
     # Centra el mapa en Temuco (o donde prefieras)
     m = folium.Map(location=[-38.7359, -72.5904], zoom_start=13)
     
     graph = sim.get_graph()
-    roles = sim.get_roles()
     vertices = list(graph.vertices())
 
     if "coords" not in st.session_state:
-        coords = {}
-        for v in vertices:
-            lat = -38.7359 + np.random.uniform(-0.02, 0.02)
-            lon = -72.5904 + np.random.uniform(-0.02, 0.02)
-            coords[str(v)] = [lat, lon]
+        # Reproducibles: dependen de la semilla de la simulación (o de las posiciones del modelo espacial)
+        coords = sim.get_coordinates(center=(-38.7359, -72.5904), spread=0.02)
         st.session_state.coords = coords
     else:
         coords = st.session_state.coords
 
     # Agrega nodos al mapa con colores según rol
     for v in vertices:
-        role = roles[v]
-        color = "gray"
-        if "Cliente" in role:
-            color = "blue"
-        elif "Almacenamiento" in role:
-            color = "orange"
-        elif "Recarga" in role:
-            color = "green"
-        
+        role = sim.role_of.get(v)
+        color = ROLE_COLORS.get(role, "gray")
+
         folium.CircleMarker(
             location=coords[str(v)],
             radius=7,
             color=color,
             fill=True,
             fill_color=color,
-            popup=f"🟢 Nodo: {v}<br>Rol: {role}"
+            popup=f"🟢 Nodo: {v}<br>Rol: {role.label if role is not None else '-'}"
         ).add_to(m)
     
     # Agrega aristas del grafo
@@ -1,104 +1,66 @@
 import datetime
+import io
+import time
 from reportlab.lib.pagesizes import letter
 from reportlab.platypus import SimpleDocTemplate, Table, TableStyle, Paragraph, Spacer, Image, HRFlowable
 from reportlab.lib import colors
 from reportlab.lib.styles import getSampleStyleSheet, ParagraphStyle
+import matplotlib
+matplotlib.use("Agg")  # Render sin ventana (también dentro de procesos del pool de la API)
 import matplotlib.pyplot as plt
 
-def generate_report_pdf(sim):
-    timestamp = datetime.datetime.now().strftime("%Y%m%d_%H%M%S")
-    filename = f"Informe_{timestamp}.pdf"
+MAX_ORDER_ROWS = 500  # Filas de órdenes por defecto; el resto se resume en agregados
+MAX_CLIENT_ROWS = 500 # Filas de clientes por defecto
+TABLE_CHUNK = 100     # Filas por tabla: reportlab parte tablas chicas mucho más rápido que una enorme
 
-    doc = SimpleDocTemplate(filename, pagesize=letter)
-    doc.title = f"Reporte de Simulación - {timestamp}"
+HEADER_STYLE = [
+    ("BACKGROUND", (0,0), (-1,0), colors.HexColor("#b6b0b0")),
+    ("TEXTCOLOR", (0,0), (-1,0), colors.whitesmoke),
+    ("GRID", (0,0), (-1,-1), 0.5, colors.grey),
+    ("FONTNAME", (0,0), (-1,0), "Helvetica-Bold"),
+    ("ALIGN", (0,0), (-1,-1), "CENTER"),
+    ("VALIGN", (0,0), (-1,-1), "MIDDLE"),
+    ("ROWBACKGROUNDS", (0,1), (-1,-1), [colors.whitesmoke, colors.lightgrey]),
+    ("FONTSIZE", (0,0), (-1,-1), 9),
+]
 
-    elements = []
-    styles = getSampleStyleSheet()
+def _figure_image(fig, width, height):
+    # Gráfico renderizado a un buffer en memoria (sin archivos temporales)
+    buffer = io.BytesIO()
+    fig.savefig(buffer, format="png", bbox_inches='tight')
+    plt.close(fig)
+    buffer.seek(0)
+    return Image(buffer, width=width, height=height)
 
-    # Estilo personalizado para el título principal
-    title_style = ParagraphStyle(
-        'CustomTitle',
-        parent=styles['Title'],
-        fontSize=20,
-        textColor=colors.black,
-        alignment=1,
-        spaceAfter=20,
-    )
-
-    # Título principal
-    elements.append(Paragraph("Reporte de Simulación", title_style))
-    elements.append(HRFlowable(width="100%", color=colors.grey, thickness=1))
-    elements.append(Spacer(1, 12))
-
-    # Tabla de Clientes
-    elements.append(Paragraph("Clientes Registrados:", styles['Heading2']))
-    clients_data = [["Client ID", "Nombre", "Tipo", "Total Órdenes"]]
-    for client in sim.get_clients():
-        clients_data.append([client.id, client.name, client.type, client.total_orders])
-    t_clients = Table(clients_data, repeatRows=1)
-    t_clients.setStyle(TableStyle([
-        ("BACKGROUND", (0,0), (-1,0), colors.HexColor("#b6b0b0")),
-        ("TEXTCOLOR", (0,0), (-1,0), colors.whitesmoke),
-        ("GRID", (0,0), (-1,-1), 0.5, colors.grey),
-        ("FONTNAME", (0,0), (-1,0), "Helvetica-Bold"),
-        ("ALIGN", (0,0), (-1,-1), "CENTER"),
-        ("BACKGROUND", (0,1), (-1,-1), colors.whitesmoke),
-        ("ROWBACKGROUNDS", (0,1), (-1,-1), [colors.whitesmoke, colors.lightgrey]),
-        ("FONTSIZE", (0,0), (-1,-1), 9),
-    ]))
-    elements.append(t_clients)
-    elements.append(Spacer(1, 20))
-
-    # Tabla de Órdenes
-    elements.append(Paragraph("Órdenes Registradas:", styles['Heading2']))
-    for i, order in enumerate(sim.get_all_orders(), start=1):
-        elements.append(Paragraph(f"Orden #{i}", styles['Heading3']))
-        details = [
-            ["Order ID:", order.id],
-            ["Cliente:", order.client.name],
-            ["Client ID:", order.client.id],
-            ["Origen:", order.origin],
-            ["Destino:", order.destination],
-            ["Estado:", order.status],
-            ["Prioridad:", order.priority],
-            ["Creada:", str(order.created_at)],
-            ["Entregada:", str(order.delivered_at)],
-            ["Costo de Ruta:", order.cost],
-        ]
-        t_order = Table(details, hAlign='LEFT', colWidths=[100, 300])
-        t_order.setStyle(TableStyle([
-            ("BACKGROUND", (0,0), (-1,0), colors.HexColor("#C7C7C7")),
-            ("GRID", (0,0), (-1,-1), 0.3, colors.grey),
-            ("FONTNAME", (0,0), (-1,-1), "Helvetica"),
-            ("FONTSIZE", (0,0), (-1,-1), 9),
-        ]))
-        elements.append(t_order)
-        elements.append(Spacer(1, 15))
-        elements.append(HRFlowable(width="80%", color=colors.lightgrey, thickness=0.5))
-        elements.append(Spacer(1, 10))
+def _chunked_tables(header, rows, col_widths=None, font_size=9):
+    """Divide las filas en tablas de TABLE_CHUNK filas (con encabezado repetido)."""
+    style = TableStyle(HEADER_STYLE + [("FONTSIZE", (0,0), (-1,-1), font_size)])
+    tables = []
+    for start in range(0, len(rows), TABLE_CHUNK):
+        table = Table([header] + rows[start:start + TABLE_CHUNK], repeatRows=1, colWidths=col_widths)
+        table.setStyle(style)
+        tables.append(table)
+    return tables
 
+def _chart_images(data):
+    """Renderiza en memoria el gráfico de distribución de nodos y el de visitas."""
     # Gráfico de Distribución de Nodos (Pie chart)
-    node_distribution = sim.get_node_distribution()
+    node_distribution = data.node_distribution
     node_labels = list(node_distribution.keys())
     node_sizes = list(node_distribution.values())
     colors_pie = ["#5DADE2", "#F5B041", "#58D68D"]
 
-    plt.figure(figsize=(5,5))
+    fig = plt.figure(figsize=(5,5))
     plt.pie(node_sizes, labels=node_labels, autopct='%1.1f%%', startangle=90, colors=colors_pie)
     plt.axis('equal')
     plt.title("Distribución de Nodos", fontsize=12, fontweight="bold")
-    pie_img = f"node_distribution_{timestamp}.png"
-    plt.savefig(pie_img, bbox_inches='tight')
-    plt.close()
-    elements.append(Image(pie_img, width=300, height=300))
-    elements.append(Spacer(1, 20))
+    pie = _figure_image(fig, width=300, height=300)
 
     # Gráfico combinado de Top Visited
-    elements.append(Paragraph("Gráficos de Visitas:", styles['Heading2']))
     fig, axes = plt.subplots(1, 3, figsize=(12,4))
 
     # Clientes más visitados
-    top_clients = sim.get_top_visited_clients()
+    top_clients = data.top_clients
     if top_clients:
         clients_x = [str(c[0]) for c in top_clients]
         clients_y = [c[1] for c in top_clients]
@@ -108,7 +70,7 @@ def generate_report_pdf(sim):
     axes[0].set_xlabel("Nodo")
 
     # Recargas más visitadas
-    top_recharges = sim.get_top_visited_recharges()
+    top_recharges = data.top_recharges
     if top_recharges:
         recharges_x = [str(r[0]) for r in top_recharges]
         recharges_y = [r[1] for r in top_recharges]
@@ -117,7 +79,7 @@ def generate_report_pdf(sim):
     axes[1].set_xlabel("Nodo")
 
     # Almacenes más visitados
-    top_storages = sim.get_top_visited_storage_nodes()
+    top_storages = data.top_storages
     if top_storages:
         storages_x = [str(n[0]) for n in top_storages]
         storages_y = [n[1] for n in top_storages]
@@ -125,11 +87,148 @@ def generate_report_pdf(sim):
     axes[2].set_title("Almacenamientos Más Visitados", fontsize=10, fontweight="bold")
     axes[2].set_xlabel("Nodo")
 
-    plt.tight_layout()
-    combined_img = f"top_visited_combined_{timestamp}.png"
-    plt.savefig(combined_img, bbox_inches='tight')
-    plt.close()
-    elements.append(Image(combined_img, width=500, height=200))
+    fig.tight_layout()
+    combined = _figure_image(fig, width=500, height=200)
+    return pie, combined
+
+def _order_row(i, order):
+    return [i, str(order.id)[:8], order.client.name, str(order.origin), str(order.destination),
+            order.status, order.priority, order.cost]
+
+ORDER_HEADER = ["#", "Order ID", "Cliente", "Origen", "Destino", "Estado", "Prioridad", "Costo"]
+ORDER_COL_WIDTHS = [35, 55, 95, 50, 50, 70, 50, 45]
+
+
+# Datos que dibuja el informe, extraídos de la simulación (es lo que viaja al proceso del pool)
+class ReportData:
+    def __init__(self, sim, max_order_rows=MAX_ORDER_ROWS, max_client_rows=MAX_CLIENT_ROWS):
+        """
+        Copia compacta del contenido del informe: agregados, rankings, las primeras
+        max_order_rows filas de órdenes y las primeras max_client_rows de clientes. Su tamaño depende de esos límites y
+        no de la simulación, así que enviarla a otro proceso es barato. Construirla con el
+        lock de lectura tomado para que todo corresponda a una misma versión.
+        """
+        self.node_distribution = sim.get_node_distribution()
+        self.top_clients = sim.get_top_visited_clients()
+        self.top_recharges = sim.get_top_visited_recharges()
+        self.top_storages = sim.get_top_visited_storage_nodes()
+
+        self.total_clients = len(sim.clients)
+        self.client_rows = [[c.id, c.name, c.type, c.total_orders] for c in sim.iter_clients(0, max_client_rows)]
+        self.total_orders = len(sim.orders)
+        self.order_rows = [_order_row(i, order) for i, order in enumerate(sim.iter_orders(0, max_order_rows), start=1)]
+        self.status_counts = sim.get_status_counts()
+
+        stats = sim.stats
+        self.active_orders = stats.count
+        self.total_cost = stats.total_cost
+        self.min_cost, self.max_cost = stats.min_cost(), stats.max_cost()
+        self.avg_path_length = stats.avg_path_length()
+        self.cost_quantiles = stats.cost_sketch.quantiles()
+
+        ranking = sim.route_ranking
+        self.top_routes = [(ranking.rank(route), [str(v) for v in route.path], route.freq, route.cost,
+                            ranking.percentile(route)) for route in sim.get_top_routes(10)]
+
+def _seconds_per_order_row(sample_rows):
+    # Mide el costo real (maquetado + dibujo) de una tabla de muestra en un PDF descartable
+    tables = _chunked_tables(ORDER_HEADER, sample_rows, col_widths=ORDER_COL_WIDTHS, font_size=8)
+    begin = time.perf_counter()
+    SimpleDocTemplate(io.BytesIO(), pagesize=letter).build(tables)
+    return (time.perf_counter() - begin) / len(sample_rows)
+
+def generate_report_pdf(sim, filename=None, max_order_rows=MAX_ORDER_ROWS, time_budget=None,
+                        max_client_rows=MAX_CLIENT_ROWS):
+    """
+    Genera el informe PDF de la simulación y devuelve el nombre del archivo.
+
+    - sim: Simulation o ReportData ya extraído (p. ej. en un proceso del pool de la API)
+    - max_order_rows: máximo de órdenes listadas en la tabla compacta (0 = solo agregados)
+    - max_client_rows: máximo de clientes listados (0 = solo el total)
+    - time_budget: segundos objetivo para el informe completo. Se mide el costo por fila
+      dibujando una tabla de muestra y se listan solo las órdenes que caben en el tiempo
+      restante; agregados y gráficos se incluyen siempre
+    """
+    start = time.perf_counter()
+    data = sim if isinstance(sim, ReportData) else ReportData(sim, max_order_rows, max_client_rows)
+    pie_chart, combined_chart = _chart_images(data)
+    timestamp = datetime.datetime.now().strftime("%Y%m%d_%H%M%S")
+    if filename is None:
+        filename = f"Informe_{timestamp}.pdf"
+
+    doc = SimpleDocTemplate(filename, pagesize=letter)
+    doc.title = f"Reporte de Simulación - {timestamp}"
+
+    elements = []
+    styles = getSampleStyleSheet()
+
+    # Estilo personalizado para el título principal
+    title_style = ParagraphStyle(
+        'CustomTitle',
+        parent=styles['Title'],
+        fontSize=20,
+        textColor=colors.black,
+        alignment=1,
+        spaceAfter=20,
+    )
+
+    # Título principal
+    elements.append(Paragraph("Reporte de Simulación", title_style))
+    elements.append(HRFlowable(width="100%", color=colors.grey, thickness=1))
+    elements.append(Spacer(1, 12))
+
+    # Tabla de Clientes
+    elements.append(Paragraph("Clientes Registrados:", styles['Heading2']))
+    clients_rows = data.client_rows[:max_client_rows]
+    elements.extend(_chunked_tables(["Client ID", "Nombre", "Tipo", "Total Órdenes"], clients_rows))
+    if len(clients_rows) < data.total_clients:
+        elements.append(Paragraph(f"Se muestran {len(clients_rows)} de {data.total_clients} clientes.", styles['Italic']))
+    elements.append(Spacer(1, 20))
+
+    # Resumen de Órdenes (agregados mantenidos por la simulación, O(1) respecto de las órdenes)
+    elements.append(Paragraph("Resumen de Órdenes:", styles['Heading2']))
+    summary_data = [["Indicador", "Valor"], ["Total de órdenes", data.total_orders]]
+    for status, n in sorted(data.status_counts.items()):
+        summary_data.append([f"Órdenes '{status}'", n])
+    summary_data += [
+        ["Costo promedio (activas)", f"{data.total_cost / data.active_orders:.2f}" if data.active_orders else "-"],
+        ["Costo mínimo / máximo", f"{data.min_cost} / {data.max_cost}"],
+        ["Costo p50 / p90 / p99", " / ".join(f"{v:.1f}" if v is not None else "-" for v in data.cost_quantiles.values())],
+        ["Largo promedio de ruta (nodos)", f"{data.avg_path_length:.2f}"],
+    ]
+    elements.extend(_chunked_tables(summary_data[0], summary_data[1:], col_widths=[200, 200]))
+    elements.append(Spacer(1, 20))
+
+    # Tabla compacta de Órdenes (una fila por orden, paginada)
+    elements.append(Paragraph("Órdenes Registradas:", styles['Heading2']))
+    limit = min(max_order_rows, len(data.order_rows))
+    if time_budget is not None and limit > TABLE_CHUNK:
+        remaining = time_budget - (time.perf_counter() - start)
+        limit = min(limit, max(0, int(0.8 * remaining / _seconds_per_order_row(data.order_rows[:TABLE_CHUNK]))))  # 20% de margen
+    order_rows = data.order_rows[:limit]
+    if order_rows:
+        elements.extend(_chunked_tables(ORDER_HEADER, order_rows, col_widths=ORDER_COL_WIDTHS, font_size=8))
+    if len(order_rows) < data.total_orders:
+        elements.append(Paragraph(
+            f"Se muestran {len(order_rows)} de {data.total_orders} órdenes (ver el resumen para el total).",
+            styles['Italic'],
+        ))
+    elements.append(Spacer(1, 20))
+
+    # Tabla de Rutas más frecuentes (ranking por frecuencia/costo)
+    elements.append(Paragraph("Rutas Más Frecuentes:", styles['Heading2']))
+    routes_rows = []
+    for rank, path, freq, cost, percentile in data.top_routes:
+        routes_rows.append([rank, Paragraph(" → ".join(path), styles['BodyText']), freq, cost, f"{percentile:.1f}"])
+    elements.extend(_chunked_tables(["#", "Ruta", "Frecuencia", "Costo", "Percentil"], routes_rows,
+                                    col_widths=[25, 290, 65, 50, 55]))
+    elements.append(Spacer(1, 20))
+
+    # Gráficos (renderizados al inicio para que cuenten en el presupuesto de tiempo)
+    elements.append(pie_chart)
+    elements.append(Spacer(1, 20))
+    elements.append(Paragraph("Gráficos de Visitas:", styles['Heading2']))
+    elements.append(combined_chart)
 
     doc.build(elements)
-    return filename
\ No newline at end of file
+    return filename